@@ -0,0 +1,40 @@
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_lookups = Counter()
+
+
+def record_cache_lookup(name: str, hit: bool) -> None:
+    """
+    Counts one lookup of the named payload cache in this process.
+
+    Args:
+        name (str): The cache, e.g. "categories" or "notes".
+        hit (bool): Whether the payload was served from the cache.
+    """
+    with _lock:
+        _lookups[name, hit] += 1
+
+
+def get_cache_hit_rates() -> dict[str, dict]:
+    """
+    Returns the hits, misses and hit rate of every payload cache looked
+    up in this process since it started (or since reset_cache_stats).
+    """
+    with _lock:
+        names = sorted({name for name, _ in _lookups})
+        stats = {}
+        for name in names:
+            hits, misses = _lookups[name, True], _lookups[name, False]
+            stats[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses),
+            }
+        return stats
+
+
+def reset_cache_stats() -> None:
+    with _lock:
+        _lookups.clear()
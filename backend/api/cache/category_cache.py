@@ -1,35 +1,143 @@
 from django.core.cache import cache
 
+from api.cache.payload_cache import (
+    aclaim_rebuild,
+    claim_rebuild,
+    is_stale_for_shared_change,
+    payload_for_versions,
+    versioned_key,
+)
+from api.cache.versioning import (
+    aversion_or_init,
+    bump_version,
+    version_or_init,
+)
+
 CATEGORY_CACHE_TTL_SECONDS = 60 * 60 * 24
-CATEGORY_CACHE_VERSION_KEY = "categories_cache_version"
+SHARED_CATEGORY_CACHE_VERSION_KEY = "categories_cache_shared_version"
 
 
-def get_category_cache_version() -> int:
-    version = cache.get(CATEGORY_CACHE_VERSION_KEY)
-    if version is None:
-        cache.add(CATEGORY_CACHE_VERSION_KEY, 1, CATEGORY_CACHE_TTL_SECONDS)
-        return 1
-    return int(version)
+def get_user_category_cache_version_key(user_id: int) -> str:
+    return f"categories_cache_version:user:{user_id}"
 
 
 def get_categories_payload_cache_key(*, user_id: int) -> str:
-    version = get_category_cache_version()
-    return f"categories:user:{user_id}:v:{version}"
+    # Not versioned: the payload is stored together with the versions it
+    # was built for, so it can be fetched along with the current ones.
+    return f"categories:user:{user_id}"
+
+
+def get_cached_categories(
+    *, user_id: int
+) -> tuple[tuple[int, int], dict | None]:
+    """
+    Returns the user's and the shared category cache versions and the
+    user's cached categories payload, fetched in a single round trip.
+
+    After a shared category change every user's payload is stale at
+    once. One request per user then rebuilds it while the others keep
+    getting the stale payload, along with the versions it was built for.
+
+    Args:
+        user_id (int): The ID of the user whose categories are listed.
+    Returns:
+        tuple[tuple[int, int], dict | None]: The (user, shared) versions
+        of the returned payload, and the payload, or the current versions
+        and None when the caller should build and cache the payload.
+    """
+    user_key = get_user_category_cache_version_key(user_id)
+    payload_key = get_categories_payload_cache_key(user_id=user_id)
+    values = cache.get_many(
+        [user_key, SHARED_CATEGORY_CACHE_VERSION_KEY, payload_key]
+    )
+    versions = (
+        version_or_init(
+            user_key, values.get(user_key), CATEGORY_CACHE_TTL_SECONDS
+        ),
+        version_or_init(
+            SHARED_CATEGORY_CACHE_VERSION_KEY,
+            values.get(SHARED_CATEGORY_CACHE_VERSION_KEY),
+            CATEGORY_CACHE_TTL_SECONDS,
+        ),
+    )
+    entry = values.get(payload_key)
+    if is_stale_for_shared_change(entry, versions) and not claim_rebuild(
+        versioned_key(payload_key, versions)
+    ):
+        return tuple(entry["versions"]), entry["payload"]
+    return versions, payload_for_versions(entry, versions)
+
 
+async def aget_cached_categories(
+    *, user_id: int
+) -> tuple[tuple[int, int], dict | None]:
+    """
+    Async variant of get_cached_categories.
+    """
+    user_key = get_user_category_cache_version_key(user_id)
+    payload_key = get_categories_payload_cache_key(user_id=user_id)
+    values = await cache.aget_many(
+        [user_key, SHARED_CATEGORY_CACHE_VERSION_KEY, payload_key]
+    )
+    versions = (
+        await aversion_or_init(
+            user_key, values.get(user_key), CATEGORY_CACHE_TTL_SECONDS
+        ),
+        await aversion_or_init(
+            SHARED_CATEGORY_CACHE_VERSION_KEY,
+            values.get(SHARED_CATEGORY_CACHE_VERSION_KEY),
+            CATEGORY_CACHE_TTL_SECONDS,
+        ),
+    )
+    entry = values.get(payload_key)
+    if is_stale_for_shared_change(
+        entry, versions
+    ) and not await aclaim_rebuild(versioned_key(payload_key, versions)):
+        return tuple(entry["versions"]), entry["payload"]
+    return versions, payload_for_versions(entry, versions)
 
-def bump_category_cache_version() -> None:
-    try:
-        cache.incr(CATEGORY_CACHE_VERSION_KEY)
-        return
-    except ValueError:
-        cache.set(CATEGORY_CACHE_VERSION_KEY, 2, CATEGORY_CACHE_TTL_SECONDS)
-        return
-    except NotImplementedError:
-        pass
 
-    current = get_category_cache_version()
+def set_cached_categories(
+    *, user_id: int, versions: tuple[int, int], payload
+) -> None:
+    """
+    Caches the user's categories payload, built while the category cache
+    versions were the given ones.
+    """
     cache.set(
-        CATEGORY_CACHE_VERSION_KEY,
-        current + 1,
+        get_categories_payload_cache_key(user_id=user_id),
+        {"versions": list(versions), "payload": payload},
         CATEGORY_CACHE_TTL_SECONDS,
     )
+
+
+async def aset_cached_categories(
+    *, user_id: int, versions: tuple[int, int], payload
+) -> None:
+    """
+    Async variant of set_cached_categories.
+    """
+    await cache.aset(
+        get_categories_payload_cache_key(user_id=user_id),
+        {"versions": list(versions), "payload": payload},
+        CATEGORY_CACHE_TTL_SECONDS,
+    )
+
+
+def bump_user_category_cache_version(user_id: int) -> None:
+    """
+    Invalidates the cached categories of one user, after a change to a
+    category they own.
+    """
+    bump_version(
+        get_user_category_cache_version_key(user_id),
+        CATEGORY_CACHE_TTL_SECONDS,
+    )
+
+
+def bump_shared_category_cache_version() -> None:
+    """
+    Invalidates the cached categories of every user, after a change to
+    a shared category.
+    """
+    bump_version(SHARED_CATEGORY_CACHE_VERSION_KEY, CATEGORY_CACHE_TTL_SECONDS)
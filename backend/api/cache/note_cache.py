@@ -0,0 +1,97 @@
+import hashlib
+
+from django.core.cache import cache
+
+from api.cache.versioning import (
+    abump_version,
+    aversion_or_init,
+    bump_version,
+    version_or_init,
+)
+
+NOTE_CACHE_TTL_SECONDS = 60 * 60
+# Longer lists are rebuilt per request: their JSON can exceed the 1 MiB
+# default item size of memcached.
+NOTE_CACHE_MAX_NOTES = 1000
+NOTE_CACHE_VERSION_TTL_SECONDS = 60 * 60 * 24 * 7
+SHARED_NOTE_CACHE_VERSION_KEY = "notes_cache_shared_version"
+
+
+def get_user_note_cache_version_key(user_id: int) -> str:
+    return f"notes_cache_version:user:{user_id}"
+
+
+def get_note_cache_versions(*, user_id: int) -> tuple[int, int]:
+    user_key = get_user_note_cache_version_key(user_id)
+    versions = cache.get_many([user_key, SHARED_NOTE_CACHE_VERSION_KEY])
+    return (
+        _version_or_init(user_key, versions.get(user_key)),
+        _version_or_init(
+            SHARED_NOTE_CACHE_VERSION_KEY,
+            versions.get(SHARED_NOTE_CACHE_VERSION_KEY),
+        ),
+    )
+
+
+async def aget_note_cache_versions(*, user_id: int) -> tuple[int, int]:
+    user_key = get_user_note_cache_version_key(user_id)
+    versions = await cache.aget_many([user_key, SHARED_NOTE_CACHE_VERSION_KEY])
+    return (
+        await _aversion_or_init(user_key, versions.get(user_key)),
+        await _aversion_or_init(
+            SHARED_NOTE_CACHE_VERSION_KEY,
+            versions.get(SHARED_NOTE_CACHE_VERSION_KEY),
+        ),
+    )
+
+
+def get_notes_payload_cache_key(
+    *, user_id: int, limit: int | None, cursor: str | None, summary: bool
+) -> str:
+    """
+    Returns the cache key of a notes list payload. The key is not
+    versioned: get_payload stores the payload with the note cache
+    versions it was built for (see get_note_cache_versions).
+    """
+    cursor_digest = (
+        hashlib.sha1(cursor.encode("utf-8")).hexdigest() if cursor else "-"
+    )
+    fields = "summary" if summary else "full"
+    return f"notes:user:{user_id}:{fields}:{limit or '-'}:{cursor_digest}"
+
+
+def cache_notes_payload_locally(limit: int | None) -> bool:
+    """
+    Returns whether a notes list payload may be kept in the per-process
+    cache tier. Only pages are: an unpaginated list can hold megabytes of
+    JSON for heavy users, and every worker would keep its own copy.
+    """
+    return limit is not None
+
+
+def bump_user_note_cache_version(user_id: int) -> None:
+    _bump_version(get_user_note_cache_version_key(user_id))
+
+
+async def abump_user_note_cache_version(user_id: int) -> None:
+    await _abump_version(get_user_note_cache_version_key(user_id))
+
+
+def bump_shared_note_cache_version() -> None:
+    _bump_version(SHARED_NOTE_CACHE_VERSION_KEY)
+
+
+def _version_or_init(key: str, version) -> int:
+    return version_or_init(key, version, NOTE_CACHE_VERSION_TTL_SECONDS)
+
+
+def _bump_version(key: str) -> None:
+    bump_version(key, NOTE_CACHE_VERSION_TTL_SECONDS)
+
+
+async def _aversion_or_init(key: str, version) -> int:
+    return await aversion_or_init(key, version, NOTE_CACHE_VERSION_TTL_SECONDS)
+
+
+async def _abump_version(key: str) -> None:
+    await abump_version(key, NOTE_CACHE_VERSION_TTL_SECONDS)
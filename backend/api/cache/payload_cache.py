@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class LocalCache:
+    """
+    A small thread-safe in-process cache. Entries expire after a TTL and
+    the least recently used one is evicted beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl_seconds: float | None = None) -> None:
+        ttl_seconds = min(ttl_seconds or self.ttl_seconds, self.ttl_seconds)
+        now = time.monotonic()
+        with self._lock:
+            # Expired entries are dropped here too, not only when their
+            # key is read again, so they do not pin memory until evicted.
+            expired = [
+                entry_key
+                for entry_key, (expires_at, _) in self._entries.items()
+                if expires_at <= now
+            ]
+            for entry_key in expired:
+                del self._entries[entry_key]
+            self._entries[key] = (now + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+local_payloads = LocalCache(
+    settings.API_LOCAL_CACHE_MAX_ENTRIES,
+    settings.API_LOCAL_CACHE_TTL_SECONDS,
+)
+
+
+def versioned_key(key: str, versions: tuple[int, int]) -> str:
+    return f"{key}:v:{versions[0]}:s:{versions[1]}"
+
+
+def is_stale_for_shared_change(entry, versions: tuple[int, int]) -> bool:
+    """
+    Returns whether a cached {"versions", "payload"} entry was only
+    invalidated by a shared change, the case where every user's entries
+    go stale at once and serving the previous payload avoids a stampede.
+    Entries made stale by the user's own changes are never served, so
+    users always see their own writes.
+    """
+    return (
+        entry is not None
+        and entry["versions"][0] == versions[0]
+        and entry["versions"][1] != versions[1]
+    )
+
+
+def payload_for_versions(entry, versions: tuple[int, int]):
+    # A payload built for other versions is stale.
+    if entry is None or entry["versions"] != list(versions):
+        return None
+    return entry["payload"]
+
+
+def get_payload(
+    key: str, versions: tuple[int, int], local: bool = True
+) -> tuple[tuple[int, int], object]:
+    """
+    Returns the payload cached under the given key for the given (user,
+    shared) cache versions, checking this process's local tier before
+    the shared cache.
+
+    The shared cache keeps the payload together with the versions it was
+    built for. After a shared version bump, one caller per key rebuilds
+    the payload while the others get the previous one (see
+    is_stale_for_shared_change and claim_rebuild).
+
+    The local tier never hears about invalidations, so its entries are
+    keyed by the versions read from the shared cache for this request: a
+    version bump by any worker then leads to a new key and a miss.
+
+    Args:
+        key (str): The payload cache key, without versions.
+        versions (tuple[int, int]): The current cache versions.
+        local (bool, optional): Whether the payload may be kept in the
+            local tier. Large payloads should only live in the shared
+            cache.
+    Returns:
+        tuple[tuple[int, int], object]: The versions of the returned
+        payload and the payload, or the given versions and None when the
+        caller should build the payload and store it with set_payload.
+    """
+    local_key = versioned_key(key, versions)
+    payload = local_payloads.get(local_key) if local else None
+    if payload is not None:
+        return versions, payload
+
+    entry = cache.get(key)
+    payload = payload_for_versions(entry, versions)
+    if payload is not None:
+        if local:
+            local_payloads.set(local_key, payload)
+        return versions, payload
+    if is_stale_for_shared_change(entry, versions) and not claim_rebuild(
+        local_key
+    ):
+        return tuple(entry["versions"]), entry["payload"]
+    return versions, None
+
+
+async def aget_payload(
+    key: str, versions: tuple[int, int], local: bool = True
+) -> tuple[tuple[int, int], object]:
+    """
+    Async variant of get_payload.
+    """
+    local_key = versioned_key(key, versions)
+    payload = local_payloads.get(local_key) if local else None
+    if payload is not None:
+        return versions, payload
+
+    entry = await cache.aget(key)
+    payload = payload_for_versions(entry, versions)
+    if payload is not None:
+        if local:
+            local_payloads.set(local_key, payload)
+        return versions, payload
+    if is_stale_for_shared_change(
+        entry, versions
+    ) and not await aclaim_rebuild(local_key):
+        return tuple(entry["versions"]), entry["payload"]
+    return versions, None
+
+
+def set_payload(
+    key: str,
+    versions: tuple[int, int],
+    payload,
+    timeout: int,
+    local: bool = True,
+) -> None:
+    """
+    Stores the payload built for the given cache versions in the shared
+    cache and in this process's local tier.
+
+    Args:
+        key (str): The payload cache key, without versions.
+        versions (tuple[int, int]): The versions the payload was built
+            for, as returned by get_payload.
+        payload: The payload to cache.
+        timeout (int): The shared cache timeout in seconds. Local entries
+            also expire after API_LOCAL_CACHE_TTL_SECONDS.
+        local (bool, optional): Whether to also keep the payload in the
+            local tier.
+    """
+    cache.set(key, {"versions": list(versions), "payload": payload}, timeout)
+    if local:
+        local_payloads.set(versioned_key(key, versions), payload, timeout)
+
+
+async def aset_payload(
+    key: str,
+    versions: tuple[int, int],
+    payload,
+    timeout: int,
+    local: bool = True,
+) -> None:
+    """
+    Async variant of set_payload.
+    """
+    await cache.aset(
+        key, {"versions": list(versions), "payload": payload}, timeout
+    )
+    if local:
+        local_payloads.set(versioned_key(key, versions), payload, timeout)
+
+
+def get_rebuild_lock_key(key: str) -> str:
+    return f"rebuild_lock:{key}"
+
+
+def claim_rebuild(key: str) -> bool:
+    """
+    Single-flight guard for rebuilding a cached payload: returns True to
+    exactly one caller per key until API_CACHE_REBUILD_LOCK_SECONDS pass.
+
+    The lock is never released. Keys should embed the cache versions the
+    rebuild is for, so that the rebuilt payload, not the lock, ends the
+    stale period, and a rebuild that failed is retried once it expires.
+
+    Args:
+        key (str): Identifies the payload and the versions being built.
+    Returns:
+        bool: Whether the caller should rebuild the payload. Others can
+        keep serving the previous payload meanwhile.
+    """
+    return cache.add(
+        get_rebuild_lock_key(key),
+        True,
+        settings.API_CACHE_REBUILD_LOCK_SECONDS,
+    )
+
+
+async def aclaim_rebuild(key: str) -> bool:
+    """
+    Async variant of claim_rebuild.
+    """
+    return await cache.aadd(
+        get_rebuild_lock_key(key),
+        True,
+        settings.API_CACHE_REBUILD_LOCK_SECONDS,
+    )
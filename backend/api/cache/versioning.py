@@ -0,0 +1,67 @@
+import time
+
+from django.core.cache import cache
+
+
+def new_cache_version() -> int:
+    """
+    Returns a fresh starting value for a cache version counter.
+
+    Counters are seeded from the clock rather than from 1 so that a
+    counter which was evicted and recreated never repeats a version that
+    was already handed out (cache keys and ETags are derived from it).
+    """
+    return time.time_ns() // 1000
+
+
+def version_or_init(key: str, version, timeout: int) -> int:
+    """
+    Returns the given version read from the cache, or seeds the counter
+    under key when it was missing. If another process seeded it first,
+    its value wins.
+    """
+    if version is None:
+        version = new_cache_version()
+        if not cache.add(key, version, timeout):
+            version = cache.get(key, version)
+    return int(version)
+
+
+async def aversion_or_init(key: str, version, timeout: int) -> int:
+    if version is None:
+        version = new_cache_version()
+        if not await cache.aadd(key, version, timeout):
+            version = await cache.aget(key, version)
+    return int(version)
+
+
+def bump_version(key: str, timeout: int) -> None:
+    """
+    Increments the version counter under key, invalidating every cache
+    key derived from it.
+    """
+    try:
+        cache.incr(key)
+        return
+    except ValueError:
+        cache.set(key, new_cache_version(), timeout)
+        return
+    except NotImplementedError:
+        pass
+
+    current = version_or_init(key, cache.get(key), timeout)
+    cache.set(key, current + 1, timeout)
+
+
+async def abump_version(key: str, timeout: int) -> None:
+    try:
+        await cache.aincr(key)
+        return
+    except ValueError:
+        await cache.aset(key, new_cache_version(), timeout)
+        return
+    except NotImplementedError:
+        pass
+
+    current = await aversion_or_init(key, await cache.aget(key), timeout)
+    await cache.aset(key, current + 1, timeout)
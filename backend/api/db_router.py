@@ -0,0 +1,97 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_primary_pinned = ContextVar("primary_pinned", default=False)
+
+
+def get_user_primary_pin_key(user_id: int) -> str:
+    return f"db_primary_pin:user:{user_id}"
+
+
+@contextmanager
+def replica_reads():
+    """
+    Lets the queries run inside the block read from a replica. Services
+    opt in for reads that tolerate replication lag; every other query
+    keeps reading from the primary.
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def primary_pinned(pinned: bool = True):
+    """
+    Sends every read inside the block to the primary when pinned, even
+    inside replica_reads(). Used for requests that write or follow a
+    recent write of the same user.
+    """
+    token = _primary_pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _primary_pinned.reset(token)
+
+
+def pin_user_to_primary(user_id: int) -> None:
+    """
+    Keeps the user's reads on the primary for
+    DATABASE_REPLICA_PIN_SECONDS, so they see their own writes before
+    the replicas catch up.
+    """
+    cache.set(
+        get_user_primary_pin_key(user_id),
+        True,
+        settings.DATABASE_REPLICA_PIN_SECONDS,
+    )
+
+
+async def apin_user_to_primary(user_id: int) -> None:
+    await cache.aset(
+        get_user_primary_pin_key(user_id),
+        True,
+        settings.DATABASE_REPLICA_PIN_SECONDS,
+    )
+
+
+def is_user_pinned_to_primary(user_id: int) -> bool:
+    return cache.get(get_user_primary_pin_key(user_id), False)
+
+
+async def ais_user_pinned_to_primary(user_id: int) -> bool:
+    return await cache.aget(get_user_primary_pin_key(user_id), False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Routes reads made inside replica_reads() to a random replica from
+    DATABASE_REPLICAS, unless the primary is pinned. Everything else,
+    including all writes and migrations, goes to the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            settings.DATABASE_REPLICAS
+            and _replica_reads.get()
+            and not _primary_pinned.get()
+        ):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -0,0 +1,117 @@
+import json
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+)
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def dumps(data) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, with orjson when installed
+    (the `fast-json` extra) and the stdlib encoder otherwise."""
+    if orjson is not None:
+        # Datetimes go through DjangoJSONEncoder so both backends produce
+        # the same output.
+        return orjson.dumps(
+            data,
+            default=DjangoJSONEncoder().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+def loads(data: bytes):
+    """Parse JSON directly from the request body bytes.
+
+    Raises:
+        ValueError: If the body is not valid UTF-8 JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JsonResponse(HttpResponse):
+    """Drop-in replacement for django.http.JsonResponse that serializes
+    with dumps()."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+def iter_ndjson(items: Iterable) -> Iterator[bytes]:
+    """Serialize items as newline-delimited JSON, yielding buffers of
+    about STREAM_BUFFER_SIZE bytes instead of one chunk per item."""
+    return _buffered(dumps(item) + b"\n" for item in items)
+
+
+def iter_json_array(items: Iterable) -> Iterator[bytes]:
+    """Serialize items as a single JSON array without holding more than
+    one buffer in memory."""
+
+    def chunks():
+        yield b"["
+        separator = b""
+        for item in items:
+            yield separator + dumps(item)
+            separator = b","
+        yield b"]"
+
+    return _buffered(chunks())
+
+
+async def aiter_ndjson(items: AsyncIterable) -> AsyncIterator[bytes]:
+    """Async variant of iter_ndjson. Async views must stream from an
+    async iterator: Django consumes a sync one entirely in memory."""
+    async for chunk in _abuffered(dumps(item) + b"\n" async for item in items):
+        yield chunk
+
+
+async def aiter_json_array(items: AsyncIterable) -> AsyncIterator[bytes]:
+    """Async variant of iter_json_array."""
+
+    async def chunks():
+        yield b"["
+        separator = b""
+        async for item in items:
+            yield separator + dumps(item)
+            separator = b","
+        yield b"]"
+
+    async for chunk in _abuffered(chunks()):
+        yield chunk
+
+
+def _buffered(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= STREAM_BUFFER_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _abuffered(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= STREAM_BUFFER_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
@@ -0,0 +1,170 @@
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.http import fast_json
+from api.models import Note
+from api.services.note_import_service import (
+    NOTE_IMPORT_BATCH_SIZE,
+    create_import_category,
+    get_import_progress,
+    import_notes_batch,
+    load_category_ids,
+)
+from api.validators.note_payload import validate_note_import_record
+
+
+class Command(BaseCommand):
+    help = (
+        "Import notes from an NDJSON file in the export format, in batches. "
+        "Progress is saved with every committed batch, so an interrupted "
+        "import resumes where it stopped when run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file with one note per line.")
+        parser.add_argument(
+            "--user",
+            help="Owner of records without a username field.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=NOTE_IMPORT_BATCH_SIZE,
+            help="Notes inserted per transaction.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "Name the progress is saved under (defaults to the absolute "
+                "path of the file)."
+            ),
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Discard saved progress and import from the start.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"File not found: {path}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        self.users = {}
+        self.category_ids = {None: load_category_ids(None)}
+        if options["user"]:
+            self.default_user = self._get_user(options["user"])
+            if self.default_user is None:
+                raise CommandError(f"User not found: {options['user']}")
+        else:
+            self.default_user = None
+
+        progress = get_import_progress(
+            options["checkpoint"] or str(path.resolve()),
+            restart=options["restart"],
+        )
+        if progress.pk is not None:
+            self.stdout.write(f"Resuming after line {progress.line}.")
+
+        started = time.monotonic()
+        imported_before = progress.imported
+        batch = []
+        with path.open("rb") as source:
+            source.seek(progress.offset)
+            for raw_line in source:
+                progress.offset += len(raw_line)
+                progress.line += 1
+                note = self._build_note(raw_line, progress.line)
+                if note is None:
+                    progress.skipped += raw_line.strip() != b""
+                    continue
+                batch.append(note)
+                if len(batch) >= options["batch_size"]:
+                    import_notes_batch(batch, progress)
+                    imported = progress.imported - imported_before
+                    self.stdout.write(
+                        f"Imported {progress.imported} notes "
+                        f"({imported / _elapsed(started):.0f} rows/s)."
+                    )
+                    batch = []
+        if batch:
+            import_notes_batch(batch, progress)
+        if progress.pk is not None:
+            progress.delete()
+
+        elapsed = _elapsed(started)
+        imported = progress.imported - imported_before
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {progress.imported} notes, skipped "
+                f"{progress.skipped} records in {elapsed:.1f}s "
+                f"({imported / elapsed:.0f} rows/s)."
+            )
+        )
+
+    def _build_note(self, raw_line: bytes, line: int) -> Note | None:
+        if not raw_line.strip():
+            return None
+        try:
+            data = fast_json.loads(raw_line)
+        except ValueError:
+            self._report(line, {"non_field_errors": ["Invalid JSON."]})
+            return None
+
+        record, errors = validate_note_import_record(data)
+        if errors:
+            self._report(line, errors)
+            return None
+
+        user = self.default_user
+        if record["username"] is not None:
+            user = self._get_user(record["username"])
+        if user is None:
+            self._report(line, {"username": ["User not found."]})
+            return None
+
+        return Note(
+            title=record["title"],
+            content=record["content"],
+            category_id=self._get_category_id(user, record),
+            user_id=user.id,
+            created_at=record["created_at"],
+            edited_at=record["edited_at"],
+        )
+
+    def _get_user(self, username: str):
+        if username not in self.users:
+            self.users[username] = (
+                get_user_model().objects.filter(username=username).first()
+            )
+        return self.users[username]
+
+    def _get_category_id(self, user, record: dict) -> int:
+        if user.id not in self.category_ids:
+            self.category_ids[user.id] = load_category_ids(user)
+        owned = self.category_ids[user.id]
+        name = record["category_name"]
+        if name in owned:
+            return owned[name]
+        if name in self.category_ids[None]:
+            return self.category_ids[None][name]
+
+        category = create_import_category(user, name, record["category_color"])
+        owned[name] = category.id
+        return category.id
+
+    def _report(self, line: int, errors: dict) -> None:
+        messages = "; ".join(
+            f"{field}: {' '.join(field_errors)}"
+            for field, field_errors in errors.items()
+        )
+        self.stderr.write(f"Line {line} skipped ({messages})")
+
+
+def _elapsed(started: float) -> float:
+    return max(time.monotonic() - started, 1e-6)
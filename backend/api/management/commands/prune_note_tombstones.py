@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.services.note_sync_service import prune_note_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the note tombstones older than "
+        "NOTE_TOMBSTONE_RETENTION_DAYS. Clients that last synced before "
+        "then get a full resync."
+    )
+
+    def handle(self, *args, **options):
+        deleted = prune_note_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Pruned {deleted} note tombstones older than "
+                f"{settings.NOTE_TOMBSTONE_RETENTION_DAYS} days."
+            )
+        )
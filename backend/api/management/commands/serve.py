@@ -0,0 +1,103 @@
+import os
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.cache_warming_service import shared_cache_configured
+
+APP_SERVERS = ("gunicorn", "uvicorn", "runserver")
+GUNICORN_MAX_REQUESTS = 1000
+
+
+def default_worker_count(server: str) -> int:
+    """
+    Returns the number of worker processes for the given server: the
+    usual 2 * CPUs + 1 for blocking gunicorn workers, one per CPU for
+    uvicorn's event loops.
+    """
+    cpus = os.cpu_count() or 1
+    return cpus * 2 + 1 if server == "gunicorn" else cpus
+
+
+def build_server_command(
+    server: str, host: str, port: int, workers: int
+) -> list[str]:
+    """
+    Returns the argv that starts the API under the given server, using
+    the current interpreter so the server comes from the same virtualenv.
+    """
+    if server == "gunicorn":
+        return [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "app.wsgi:application",
+            f"--bind={host}:{port}",
+            f"--workers={workers}",
+            f"--max-requests={GUNICORN_MAX_REQUESTS}",
+            f"--max-requests-jitter={GUNICORN_MAX_REQUESTS // 10}",
+            "--access-logfile=-",
+        ]
+    if server == "uvicorn":
+        return [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.asgi:application",
+            f"--host={host}",
+            f"--port={port}",
+            f"--workers={workers}",
+        ]
+    return [
+        sys.executable,
+        str(settings.BASE_DIR / "manage.py"),
+        "runserver",
+        f"{host}:{port}",
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the API with gunicorn (WSGI), uvicorn (ASGI) or the "
+        "development runserver, as selected by APP_SERVER. The worker "
+        "count comes from WEB_CONCURRENCY or the number of CPUs, and is "
+        "one while the cache is local to each process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--server", choices=APP_SERVERS, default=settings.APP_SERVER
+        )
+        parser.add_argument("--host", default="0.0.0.0")
+        parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+        parser.add_argument(
+            "--workers", type=int, default=settings.WEB_CONCURRENCY
+        )
+
+    def handle(self, *args, **options):
+        server = options["server"]
+        if server not in APP_SERVERS:
+            raise CommandError(
+                f"APP_SERVER must be one of: {', '.join(APP_SERVERS)}."
+            )
+        workers = options["workers"] or default_worker_count(server)
+        if workers > 1 and not shared_cache_configured():
+            # Workers would keep their own cache versions, so one would
+            # keep serving payloads and ETags another has invalidated.
+            self.stderr.write(
+                "The cache is local to each process; starting 1 worker "
+                f"instead of {workers}. Set CACHE_URL to a shared cache to "
+                "run more."
+            )
+            workers = 1
+        command = build_server_command(
+            server, options["host"], options["port"], workers
+        )
+        self.stdout.write(f"Starting {server} with {workers} workers.")
+        self.stdout.flush()
+        # Settings derived from APP_SERVER (API_ASYNC_VIEWS) must match the
+        # server actually started.
+        os.environ["APP_SERVER"] = server
+        # Replace this process so the server receives container signals.
+        os.execvp(command[0], command)
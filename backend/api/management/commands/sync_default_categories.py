@@ -1,22 +1,60 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 
 from api.models import Category
+from api.services.cache_warming_service import shared_cache_configured
 
 
 class Command(BaseCommand):
     help = "Synchronize shared default categories from Category.DEFAULTS."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--warm-caches",
+            action="store_true",
+            help=(
+                "Run warm_caches afterwards, when the cache is shared with "
+                "the web workers."
+            ),
+        )
+
     def handle(self, *args, **options):
+        existing = {
+            category.name: category
+            for category in Category.objects.filter(owner__isnull=True)
+        }
         for item in Category.DEFAULTS:
-            Category.objects.update_or_create(
-                owner=None,
-                name=item["name"],
-                defaults={
-                    "color": item["color"],
-                    "is_default": item.get("is_default", True),
-                },
-            )
+            fields = {
+                "color": item["color"],
+                "is_default": item.get("is_default", True),
+            }
+            category = existing.get(item["name"])
+            if category is None:
+                Category.objects.create(
+                    owner=None, name=item["name"], **fields
+                )
+                continue
+            # Every save bumps the shared cache versions, so unchanged
+            # rows are left alone and a no-op deploy keeps caches warm.
+            changed = [
+                field
+                for field, value in fields.items()
+                if getattr(category, field) != value
+            ]
+            if changed:
+                for field in changed:
+                    setattr(category, field, fields[field])
+                category.save(update_fields=changed)
 
         self.stdout.write(
             self.style.SUCCESS("Default categories synchronized.")
         )
+
+        if options["warm_caches"]:
+            if shared_cache_configured():
+                call_command("warm_caches", stdout=self.stdout)
+            else:
+                self.stdout.write(
+                    "Skipped cache warming: the cache is local to this "
+                    "process."
+                )
@@ -0,0 +1,80 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from api.services.cache_warming_service import (
+    list_recently_active_users,
+    shared_cache_configured,
+    warm_user_caches,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompute the categories and recent notes payloads of the most "
+        "recently active users, so their first requests after a deploy "
+        "are served from the cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=500,
+            help="How many of the most recently logged-in users to warm.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Threads building payloads in parallel.",
+        )
+        parser.add_argument(
+            "--db-concurrency",
+            type=int,
+            default=2,
+            help="Maximum number of workers querying the database at once.",
+        )
+
+    def handle(self, *args, **options):
+        for option in ("users", "workers", "db_concurrency"):
+            if options[option] < 1:
+                flag = option.replace("_", "-")
+                raise CommandError(f"--{flag} must be a positive integer.")
+        if not shared_cache_configured():
+            self.stderr.write(
+                "The cache is local to this process; warmed payloads will "
+                "not be seen by the web workers. Set CACHE_URL."
+            )
+
+        started = time.monotonic()
+        users = list_recently_active_users(options["users"])
+        # Serialization and cache writes run outside the slots, so the
+        # workers overlap them with the queries of others.
+        db_slots = threading.BoundedSemaphore(options["db_concurrency"])
+        if options["workers"] == 1:
+            built = sum(warm_user_caches(user, db_slots) for user in users)
+        else:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                built = sum(
+                    pool.map(lambda user: _warm(user, db_slots), users)
+                )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {built} payloads for {len(users)} users in "
+                f"{elapsed:.1f}s."
+            )
+        )
+
+
+def _warm(user, db_slots) -> int:
+    try:
+        return warm_user_caches(user, db_slots)
+    finally:
+        # Each pool thread opens its own connections.
+        connections.close_all()
@@ -0,0 +1,60 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from api.db_router import (
+    ais_user_pinned_to_primary,
+    apin_user_to_primary,
+    is_user_pinned_to_primary,
+    pin_user_to_primary,
+    primary_pinned,
+)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class PrimaryPinningMiddleware:
+    """
+    Gives users read-your-writes consistency with read replicas: requests
+    that write, and every request of a user for a short window after a
+    successful write, read from the primary database.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        user = request.user
+        writes = request.method not in SAFE_METHODS
+        pinned = writes or (
+            user.is_authenticated and is_user_pinned_to_primary(user.id)
+        )
+        with primary_pinned(pinned):
+            response = self.get_response(request)
+        if writes and user.is_authenticated and response.status_code < 400:
+            pin_user_to_primary(user.id)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        user = await request.auser()
+        writes = request.method not in SAFE_METHODS
+        pinned = writes or (
+            user.is_authenticated and await ais_user_pinned_to_primary(user.id)
+        )
+        with primary_pinned(pinned):
+            response = await self.get_response(request)
+        if writes and user.is_authenticated and response.status_code < 400:
+            await apin_user_to_primary(user.id)
+        return response
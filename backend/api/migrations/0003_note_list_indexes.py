@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_category_defaults_and_ownership'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', '-edited_at', '-created_at', '-id'], name='note_user_edited_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', 'category'], name='note_user_category_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.11 on 2026-10-18
+
+from django.db import migrations
+
+CREATE_NOTE_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS api_note_fts USING fts5(
+    title,
+    content,
+    user_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+BACKFILL_NOTE_FTS_TABLE = """
+INSERT INTO api_note_fts (rowid, title, content, user_id)
+SELECT id, title, content, user_id FROM api_note
+"""
+
+
+def create_note_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(CREATE_NOTE_FTS_TABLE)
+    schema_editor.execute(BACKFILL_NOTE_FTS_TABLE)
+
+
+def drop_note_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS api_note_fts")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0003_note_list_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_note_search_index,
+            reverse_code=drop_note_search_index,
+        ),
+    ]
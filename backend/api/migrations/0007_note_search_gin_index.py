@@ -0,0 +1,43 @@
+# Generated by Django 5.2.11 on 2026-10-18
+
+from django.db import migrations
+
+# Must match note_search_vector() in api/services/note_search_service.py,
+# or PostgreSQL will not use the index.
+CREATE_NOTE_SEARCH_GIN_INDEX = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS api_note_search_gin_idx
+ON api_note USING gin ((
+    setweight(to_tsvector('simple'::regconfig, COALESCE(title, '')), 'A')
+    || setweight(to_tsvector('simple'::regconfig, COALESCE(content, '')), 'B')
+))
+"""
+
+
+def create_note_search_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(CREATE_NOTE_SEARCH_GIN_INDEX)
+
+
+def drop_note_search_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "DROP INDEX CONCURRENTLY IF EXISTS api_note_search_gin_idx"
+    )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("api", "0006_note_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_note_search_gin_index,
+            reverse_code=drop_note_search_gin_index,
+        ),
+    ]
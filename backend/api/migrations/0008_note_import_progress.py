@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0007_note_search_gin_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NoteImportProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=1024, unique=True)),
+                ("offset", models.PositiveBigIntegerField(default=0)),
+                ("line", models.PositiveBigIntegerField(default=0)),
+                ("imported", models.PositiveBigIntegerField(default=0)),
+                ("skipped", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Note import progress",
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.11 on 2026-10-18
+
+from django.db import migrations
+
+# The owner column holds a u<user id> token (see note_search_owner() in
+# api/services/note_search_index.py), so that MATCH itself restricts the
+# search to one user's notes. It is left out of the ranking.
+CREATE_NOTE_FTS_TABLE = """
+CREATE VIRTUAL TABLE api_note_fts USING fts5(
+    title,
+    content,
+    owner,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+CONFIGURE_NOTE_FTS_RANK = """
+INSERT INTO api_note_fts (api_note_fts, rank)
+VALUES ('rank', 'bm25(1.0, 1.0, 0.0)')
+"""
+
+BACKFILL_NOTE_FTS_TABLE = """
+INSERT INTO api_note_fts (rowid, title, content, owner)
+SELECT id, title, content, 'u' || user_id FROM api_note
+"""
+
+CREATE_PREVIOUS_NOTE_FTS_TABLE = """
+CREATE VIRTUAL TABLE api_note_fts USING fts5(
+    title,
+    content,
+    user_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+BACKFILL_PREVIOUS_NOTE_FTS_TABLE = """
+INSERT INTO api_note_fts (rowid, title, content, user_id)
+SELECT id, title, content, user_id FROM api_note
+"""
+
+
+def add_owner_to_note_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS api_note_fts")
+    schema_editor.execute(CREATE_NOTE_FTS_TABLE)
+    schema_editor.execute(CONFIGURE_NOTE_FTS_RANK)
+    schema_editor.execute(BACKFILL_NOTE_FTS_TABLE)
+
+
+def remove_owner_from_note_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS api_note_fts")
+    schema_editor.execute(CREATE_PREVIOUS_NOTE_FTS_TABLE)
+    schema_editor.execute(BACKFILL_PREVIOUS_NOTE_FTS_TABLE)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0008_note_import_progress"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            add_owner_to_note_search_index,
+            reverse_code=remove_owner_from_note_search_index,
+        ),
+    ]
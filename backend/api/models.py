@@ -45,6 +45,7 @@ class Note(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     edited_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
     category = models.ForeignKey(
         Category,
         on_delete=models.PROTECT,
@@ -58,6 +59,68 @@ class Note(models.Model):
 
     class Meta:
         ordering = ["-edited_at", "-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-edited_at", "-created_at", "-id"],
+                name="note_user_edited_idx",
+            ),
+            models.Index(
+                fields=["user", "category"],
+                name="note_user_category_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        # Every write of an existing note is a new version, including
+        # edits made outside the API such as the admin, so ETags and
+        # expected_version checks notice them.
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        self.version = models.F("version") + 1
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "version" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "version"]
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=["version"])
+
+
+class NoteTombstone(models.Model):
+    note_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="note_tombstones",
+    )
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["deleted_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "deleted_at"],
+                name="tombstone_user_deleted_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Deleted note {self.note_id}"
+
+
+class NoteImportProgress(models.Model):
+    # Saved in the transaction of every imported batch, so a resumed
+    # import never inserts a batch twice or skips one.
+    source = models.CharField(max_length=1024, unique=True)
+    offset = models.PositiveBigIntegerField(default=0)
+    line = models.PositiveBigIntegerField(default=0)
+    imported = models.PositiveBigIntegerField(default=0)
+    skipped = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Note import progress"
+
+    def __str__(self):
+        return f"Import of {self.source}"
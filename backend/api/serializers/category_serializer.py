@@ -9,3 +9,9 @@ def serialize_category(category: Category) -> dict:
         "is_default": category.is_default,
         "owner_id": category.owner_id,
     }
+
+
+def serialize_categories_list(categories) -> dict:
+    return {
+        "categories": [serialize_category(category) for category in categories]
+    }
@@ -16,6 +16,7 @@ def serialize_note(note: Note) -> dict:
         "content": note.content,
         "created_at": note.created_at.isoformat(),
         "edited_at": note.edited_at.isoformat(),
+        "version": note.version,
         "category": {
             "id": note.category.id,
             "name": note.category.name,
@@ -23,3 +24,71 @@ def serialize_note(note: Note) -> dict:
         },
         "user_id": note.user_id,
     }
+
+
+def serialize_note_summary(note: Note) -> dict:
+    """Convert a Note instance loaded in summary mode into a dictionary
+    with a truncated content preview instead of the full content.
+
+    Args:
+        note (Note): The Note instance to serialize. Must carry the
+            content_preview annotation.
+    Returns:
+        dict: A summary representation of the Note instance.
+    """
+    return {
+        "id": note.id,
+        "title": note.title,
+        "content_preview": note.content_preview,
+        "created_at": note.created_at.isoformat(),
+        "edited_at": note.edited_at.isoformat(),
+        "version": note.version,
+        "category": {
+            "id": note.category.id,
+            "name": note.category.name,
+            "color": note.category.color,
+        },
+        "user_id": note.user_id,
+    }
+
+
+def serialize_notes_list(notes, next_cursor, summary: bool) -> dict:
+    """Convert a list or page of notes into the notes collection payload.
+
+    Args:
+        notes: The Note instances of the list or page.
+        next_cursor (str | None): The cursor of the next page, if any.
+        summary (bool): Whether the notes were loaded in summary mode.
+    Returns:
+        dict: The serialized notes and the next cursor.
+    """
+    serialize = serialize_note_summary if summary else serialize_note
+    return {
+        "notes": [serialize(note) for note in notes],
+        "next_cursor": next_cursor,
+    }
+
+
+def serialize_note_search_result(note: Note, snippet: str) -> dict:
+    """Convert a search hit into a note summary with its highlighted
+    snippet.
+
+    Args:
+        note (Note): The matching Note, loaded in summary mode.
+        snippet (str): The matching text with <mark> highlights.
+    Returns:
+        dict: A summary representation of the Note plus the snippet.
+    """
+    return {**serialize_note_summary(note), "snippet": snippet}
+
+
+def serialize_note_export(note: Note) -> dict:
+    """Convert a Note instance into an export record that import_notes
+    can load back, with the owner's username.
+
+    Args:
+        note (Note): The Note instance to serialize, with its user loaded.
+    Returns:
+        dict: The full representation of the Note plus the username.
+    """
+    return {**serialize_note(note), "username": note.user.username}
@@ -0,0 +1,112 @@
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import User
+
+from api.cache.category_cache import (
+    get_cached_categories,
+    set_cached_categories,
+)
+from api.cache.note_cache import (
+    NOTE_CACHE_MAX_NOTES,
+    NOTE_CACHE_TTL_SECONDS,
+    cache_notes_payload_locally,
+    get_note_cache_versions,
+    get_notes_payload_cache_key,
+)
+from api.cache.payload_cache import get_payload, set_payload
+from api.serializers.category_serializer import serialize_categories_list
+from api.serializers.note_serializer import serialize_notes_list
+from api.services.category_service import list_categories_for_user
+from api.services.note_service import (
+    list_notes_for_user,
+    list_notes_page_for_user,
+)
+from api.validators.note_query import NOTES_PAGE_DEFAULT_LIMIT
+
+# The notes list as the frontend loads it, and the first keyset page.
+WARMED_NOTE_LIST_LIMITS = (None, NOTES_PAGE_DEFAULT_LIMIT)
+
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def shared_cache_configured() -> bool:
+    """
+    Returns whether the default cache outlives this process, so that
+    payloads warmed here are seen by the web workers.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    return backend not in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+def list_recently_active_users(limit: int) -> list[User]:
+    """
+    Returns the users who logged in most recently, newest first.
+
+    Args:
+        limit (int): The maximum number of users.
+    Returns:
+        list[User]: Up to limit users who have logged in at least once.
+    """
+    return list(
+        get_user_model()
+        .objects.filter(is_active=True, last_login__isnull=False)
+        .order_by("-last_login")[:limit]
+    )
+
+
+def warm_user_caches(user: User, db_slot=None) -> int:
+    """
+    Builds and caches the categories and recent notes payloads of a user
+    that are not cached for the current cache versions yet.
+
+    Args:
+        user (User): The user whose payloads are warmed.
+        db_slot (optional): A context manager held while querying the
+            database, e.g. a semaphore bounding concurrent warmers.
+    Returns:
+        int: The number of payloads built.
+    """
+    db_slot = db_slot or nullcontext()
+    built = 0
+
+    versions, payload = get_cached_categories(user_id=user.id)
+    if payload is None:
+        with db_slot:
+            categories = list_categories_for_user(user)
+        set_cached_categories(
+            user_id=user.id,
+            versions=versions,
+            payload=serialize_categories_list(categories),
+        )
+        built += 1
+
+    note_versions = get_note_cache_versions(user_id=user.id)
+    for limit in WARMED_NOTE_LIST_LIMITS:
+        key = get_notes_payload_cache_key(
+            user_id=user.id, limit=limit, cursor=None, summary=False
+        )
+        local = cache_notes_payload_locally(limit)
+        versions, payload = get_payload(key, note_versions, local=local)
+        if payload is not None:
+            continue
+        with db_slot:
+            if limit is None:
+                notes, next_cursor = list_notes_for_user(user), None
+            else:
+                notes, next_cursor = list_notes_page_for_user(user, limit)
+        if len(notes) > NOTE_CACHE_MAX_NOTES:
+            continue
+        set_payload(
+            key,
+            versions,
+            serialize_notes_list(notes, next_cursor, summary=False),
+            NOTE_CACHE_TTL_SECONDS,
+            local=local,
+        )
+        built += 1
+    return built
@@ -1,12 +1,23 @@
 from django.contrib.auth.models import User
 from django.db.models import Q
 
+from api.db_router import replica_reads
 from api.models import Category
 
 
+def _categories_queryset_for_user(user: User):
+    return Category.objects.filter(
+        Q(owner__isnull=True) | Q(owner=user)
+    ).order_by("-is_default", "name")
+
+
 def list_categories_for_user(user: User) -> list[Category]:
-    return list(
-        Category.objects.filter(
-            Q(owner__isnull=True) | Q(owner=user)
-        ).order_by("-is_default", "name")
-    )
+    with replica_reads():
+        return list(_categories_queryset_for_user(user))
+
+
+async def alist_categories_for_user(user: User) -> list[Category]:
+    with replica_reads():
+        return [
+            category async for category in _categories_queryset_for_user(user)
+        ]
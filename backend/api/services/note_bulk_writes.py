@@ -0,0 +1,29 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from api.cache.note_cache import bump_user_note_cache_version
+from api.models import Note
+from api.services.note_search_index import index_notes
+
+
+@contextmanager
+def bulk_note_writes() -> Iterator[list[Note]]:
+    """
+    Runs bulk writes of notes in one transaction. bulk_create and
+    bulk_update bypass model signals, so the notes added to the yielded
+    list are refreshed here instead: their search index entries in the
+    same transaction, and the notes cache of every affected user once it
+    has committed.
+
+    Yields:
+        list[Note]: The list to add the written notes to.
+    """
+    written_notes = []
+    with transaction.atomic():
+        yield written_notes
+        index_notes(written_notes)
+
+    for user_id in {note.user_id for note in written_notes}:
+        bump_user_note_cache_version(user_id)
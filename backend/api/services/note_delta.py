@@ -0,0 +1,45 @@
+import hashlib
+
+
+class InvalidContentDeltaError(Exception):
+    pass
+
+
+def content_sha256(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def apply_content_delta(content: str, delta: list[list]) -> str:
+    """
+    Applies splice operations to a text. Each operation is
+    [start, end, text] and replaces content[start:end] with text.
+
+    Offsets refer to the original content, are counted in UTF-16 code
+    units (the unit of JavaScript string indices) and must be sorted and
+    non-overlapping.
+
+    Args:
+        content (str): The base content the delta was computed against.
+        delta (list[list]): The splice operations.
+    Returns:
+        str: The patched content.
+    Raises:
+        InvalidContentDeltaError: If an operation falls outside the
+            content or splits a surrogate pair.
+    """
+    encoded = content.encode("utf-16-le")
+    length = len(encoded) // 2
+    parts = []
+    position = 0
+    for start, end, text in delta:
+        if start < position or end > length:
+            raise InvalidContentDeltaError
+        parts.append(encoded[position * 2 : start * 2])
+        parts.append(text.encode("utf-16-le", "surrogatepass"))
+        position = end
+    parts.append(encoded[position * 2 :])
+
+    try:
+        return b"".join(parts).decode("utf-16-le")
+    except UnicodeDecodeError:
+        raise InvalidContentDeltaError from None
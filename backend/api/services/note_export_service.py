@@ -0,0 +1,109 @@
+import gzip
+from pathlib import Path
+from typing import BinaryIO
+
+from django.contrib.auth.models import User
+from django.db.models import Max, Min
+
+from api.http.fast_json import iter_ndjson
+from api.models import Note
+from api.serializers.note_serializer import serialize_note_export
+from api.services.note_service import NOTE_EXPORT_CHUNK_SIZE
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+NOTE_EXPORT_COMPRESSIONS = ("gzip", "zstd")
+
+
+class CompressionUnavailableError(Exception):
+    pass
+
+
+def split_note_user_id_ranges(
+    shards: int, user: User | None = None
+) -> list[tuple[int, int]]:
+    """
+    Splits the ids of the users owning notes into contiguous ranges of
+    equal width, one per export shard.
+
+    Args:
+        shards (int): The maximum number of ranges.
+        user (User, optional): Restricts the ranges to this user's notes.
+    Returns:
+        list[tuple[int, int]]: Half-open [start, end) user id ranges in
+        ascending order. Empty when there are no notes.
+    """
+    queryset = Note.objects.all() if user is None else user.notes.all()
+    bounds = queryset.aggregate(low=Min("user_id"), high=Max("user_id"))
+    if bounds["low"] is None:
+        return []
+
+    low, high = bounds["low"], bounds["high"] + 1
+    width = -(-(high - low) // shards)
+    return [
+        (start, min(start + width, high)) for start in range(low, high, width)
+    ]
+
+
+def open_compressed(path: Path, compression: str) -> BinaryIO:
+    """
+    Opens the given path for writing through a gzip or zstd compressor.
+
+    Args:
+        path (Path): The file to create.
+        compression (str): One of NOTE_EXPORT_COMPRESSIONS.
+    Returns:
+        BinaryIO: A writable binary stream; closing it finishes the file.
+    Raises:
+        CompressionUnavailableError: If zstd is requested without the
+            zstandard package installed.
+    """
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if zstandard is None:  # pragma: no cover
+        raise CompressionUnavailableError(compression)
+    return zstandard.ZstdCompressor(level=3).stream_writer(path.open("wb"))
+
+
+def write_note_export(
+    path: Path,
+    compression: str,
+    user: User | None = None,
+    user_id_range: tuple[int, int] | None = None,
+) -> int:
+    """
+    Writes notes as compressed NDJSON in id order, iterating the
+    queryset in chunks so memory stays constant.
+
+    Args:
+        path (Path): The file to create.
+        compression (str): One of NOTE_EXPORT_COMPRESSIONS.
+        user (User, optional): Only export this user's notes.
+        user_id_range (tuple[int, int], optional): Only export the notes
+            of users whose id is in this half-open range.
+    Returns:
+        int: The number of exported notes.
+    """
+    queryset = Note.objects.select_related("category", "user").order_by("id")
+    if user is not None:
+        queryset = queryset.filter(user=user)
+    if user_id_range is not None:
+        queryset = queryset.filter(
+            user_id__gte=user_id_range[0], user_id__lt=user_id_range[1]
+        )
+
+    count = 0
+
+    def records():
+        nonlocal count
+        for note in queryset.iterator(chunk_size=NOTE_EXPORT_CHUNK_SIZE):
+            count += 1
+            yield serialize_note_export(note)
+
+    with open_compressed(path, compression) as output:
+        for chunk in iter_ndjson(records()):
+            output.write(chunk)
+    return count
@@ -0,0 +1,104 @@
+from django.contrib.auth.models import User
+
+from api.models import Category, Note, NoteImportProgress
+from api.services.note_bulk_writes import bulk_note_writes
+
+NOTE_IMPORT_BATCH_SIZE = 1000
+NOTE_IMPORT_CATEGORY_COLOR = "#D9D9D9"
+
+
+def load_category_ids(user: User | None) -> dict[str, int]:
+    """
+    Returns a name to id map of the shared categories, or of the
+    categories owned by the given user.
+
+    Args:
+        user (User | None): The owner of the categories, or None for the
+            shared categories.
+    Returns:
+        dict[str, int]: The category ids keyed by category name.
+    """
+    return dict(Category.objects.filter(owner=user).values_list("name", "id"))
+
+
+def create_import_category(
+    user: User, name: str, color: str | None = None
+) -> Category:
+    """
+    Returns the category of the given user with the given name, creating
+    it when an imported note references a category that does not exist.
+
+    Args:
+        user (User): The owner of the category.
+        name (str): The name of the category.
+        color (str, optional): The color of a created category.
+    Returns:
+        Category: The existing or created category.
+    """
+    category, _ = Category.objects.get_or_create(
+        owner=user,
+        name=name,
+        defaults={"color": color or NOTE_IMPORT_CATEGORY_COLOR},
+    )
+    return category
+
+
+def get_import_progress(
+    source: str, restart: bool = False
+) -> NoteImportProgress:
+    """
+    Returns the saved progress of an interrupted import of the given
+    source, or unsaved progress starting at its first line.
+
+    Args:
+        source (str): The name the progress is saved under.
+        restart (bool, optional): Whether to discard saved progress.
+    Returns:
+        NoteImportProgress: The progress to resume from.
+    """
+    if restart:
+        NoteImportProgress.objects.filter(source=source).delete()
+    progress = NoteImportProgress.objects.filter(source=source).first()
+    return progress or NoteImportProgress(source=source)
+
+
+def import_notes_batch(
+    notes: list[Note], progress: NoteImportProgress | None = None
+) -> list[Note]:
+    """
+    Inserts a batch of imported notes in one transaction (see
+    bulk_note_writes).
+
+    The created_at and edited_at set on the notes are kept; notes without
+    them are dated at the import time.
+
+    Args:
+        notes (list[Note]): Unsaved notes with their category and user ids.
+        progress (NoteImportProgress, optional): The import progress up to
+            the end of this batch, saved in the same transaction.
+    Returns:
+        list[Note]: The created notes.
+    """
+    timestamps = [(note.created_at, note.edited_at) for note in notes]
+    with bulk_note_writes() as written_notes:
+        created_notes = Note.objects.bulk_create(notes)
+        _restore_timestamps(created_notes, timestamps)
+        written_notes.extend(created_notes)
+        if progress is not None:
+            progress.imported += len(created_notes)
+            progress.save()
+    return created_notes
+
+
+def _restore_timestamps(notes: list[Note], timestamps: list[tuple]) -> None:
+    # bulk_create stamps auto_now_add/auto_now fields with the current
+    # time, so the imported dates are written back in a second statement.
+    dated_notes = []
+    for note, (created_at, edited_at) in zip(notes, timestamps, strict=True):
+        if created_at is None and edited_at is None:
+            continue
+        note.created_at = created_at or edited_at
+        note.edited_at = edited_at or created_at
+        dated_notes.append(note)
+    if dated_notes:
+        Note.objects.bulk_update(dated_notes, ["created_at", "edited_at"])
@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+
+from api.models import Note
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+def encode_note_cursor(note: Note) -> str:
+    """
+    Encodes the sort key of the given note into an opaque cursor string.
+
+    Args:
+        note (Note): The last note of a page.
+    Returns:
+        str: A URL-safe cursor pointing right after the given note.
+    """
+    raw = json.dumps(
+        [note.edited_at.isoformat(), note.created_at.isoformat(), note.id],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_note_cursor(cursor: str) -> tuple[datetime, datetime, int]:
+    """
+    Decodes a cursor produced by encode_note_cursor.
+
+    Args:
+        cursor (str): The opaque cursor sent by the client.
+    Returns:
+        tuple[datetime, datetime, int]: The edited_at, created_at and id
+        of the last note of the previous page.
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        edited_at, created_at, note_id = json.loads(raw)
+        return (
+            datetime.fromisoformat(edited_at),
+            datetime.fromisoformat(created_at),
+            int(note_id),
+        )
+    except (TypeError, ValueError, UnicodeError):
+        raise InvalidCursorError from None
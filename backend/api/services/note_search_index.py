@@ -0,0 +1,77 @@
+from django.db import connection
+
+from api.models import Note
+
+NOTE_SEARCH_TABLE = "api_note_fts"
+
+
+def uses_note_search_table() -> bool:
+    """
+    Returns whether search goes through the FTS5 table. Only SQLite has
+    one; PostgreSQL searches the notes table through a GIN index instead.
+    """
+    return connection.vendor == "sqlite"
+
+
+def note_search_owner(user_id: int) -> str:
+    """
+    Returns the token identifying a user in the owner column of the FTS5
+    table. Searches match it together with the query terms, so FTS5 only
+    reads the postings of that user's notes.
+    """
+    return f"u{user_id}"
+
+
+def index_note(note: Note) -> None:
+    """
+    Adds or refreshes the search index entry of the given note.
+
+    Args:
+        note (Note): The saved note to index.
+    """
+    index_notes([note])
+
+
+def index_notes(notes: list[Note]) -> None:
+    """
+    Adds or refreshes the search index entries of the given notes in two
+    batched statements (see bulk_note_writes).
+
+    Args:
+        notes (list[Note]): The saved notes to index.
+    """
+    if not uses_note_search_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {NOTE_SEARCH_TABLE} WHERE rowid = %s",
+            [[note.id] for note in notes],
+        )
+        cursor.executemany(
+            f"INSERT INTO {NOTE_SEARCH_TABLE} (rowid, title, content, owner)"
+            " VALUES (%s, %s, %s, %s)",
+            [
+                [
+                    note.id,
+                    note.title,
+                    note.content,
+                    note_search_owner(note.user_id),
+                ]
+                for note in notes
+            ],
+        )
+
+
+def remove_note_from_index(note_id: int) -> None:
+    """
+    Removes the search index entry of the note with the given id.
+
+    Args:
+        note_id (int): The ID of the deleted note.
+    """
+    if not uses_note_search_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {NOTE_SEARCH_TABLE} WHERE rowid = %s", [note_id]
+        )
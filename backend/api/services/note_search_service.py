@@ -0,0 +1,203 @@
+import html
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection
+
+from api.models import Note
+from api.services.note_search_index import (
+    NOTE_SEARCH_TABLE,
+    note_search_owner,
+    uses_note_search_table,
+)
+from api.services.note_service import notes_queryset_for_user
+
+NOTE_SNIPPET_TOKENS = 16
+# Text search configuration of the PostgreSQL index. "simple" lowercases
+# without stemming, like the FTS5 unicode61 tokenizer.
+NOTE_SEARCH_CONFIG = "simple"
+_SEARCH_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+# Private-use characters delimit the matches in raw snippets, so that the
+# note text can be HTML-escaped before they become <mark> tags.
+_MATCH_START = "\ue000"
+_MATCH_STOP = "\ue001"
+# The owner is part of the MATCH expression (see note_search_query) and
+# rank is configured as BM25 over title and content, so FTS5 finds and
+# orders the user's matches without a separate filter or sort step.
+NOTE_FTS_SEARCH_SQL = (
+    f"SELECT rowid, snippet({NOTE_SEARCH_TABLE}, 0, %s, %s, '…',"
+    f" {NOTE_SNIPPET_TOKENS}), snippet({NOTE_SEARCH_TABLE}, 1, %s, %s,"
+    f" '…', {NOTE_SNIPPET_TOKENS})"
+    f" FROM {NOTE_SEARCH_TABLE}"
+    f" WHERE {NOTE_SEARCH_TABLE} MATCH %s"
+    " ORDER BY rank LIMIT %s"
+)
+
+
+def _highlight(snippet: str) -> str:
+    return (
+        html.escape(snippet)
+        .replace(_MATCH_START, "<mark>")
+        .replace(_MATCH_STOP, "</mark>")
+    )
+
+
+def build_note_search_expression(query: str) -> str:
+    """
+    Turns free text typed by the user into a safe FTS5 match expression.
+    Every word becomes a quoted term and the last one also matches as a
+    prefix, so FTS5 operators in the input are never interpreted.
+
+    Args:
+        query (str): The raw search text.
+    Returns:
+        str: The match expression, or an empty string when the query has
+        no searchable words.
+    """
+    terms = [f'"{term}"' for term in _SEARCH_TERM_PATTERN.findall(query)]
+    if terms:
+        terms[-1] = f"{terms[-1]}*"
+    return " ".join(terms)
+
+
+def note_search_query(user_id: int, expression: str) -> str:
+    """
+    Returns the FTS5 match expression of a search expression (see
+    build_note_search_expression) restricted to the given user's notes.
+    The terms only match the title and content columns.
+    """
+    owner = note_search_owner(user_id)
+    return f'owner : "{owner}" AND {{title content}} : ({expression})'
+
+
+def build_note_tsquery(query: str) -> str:
+    """
+    Turns free text typed by the user into a PostgreSQL tsquery matching
+    every word, the last one also as a prefix. Terms are quoted, so
+    tsquery operators in the input are never interpreted.
+
+    Args:
+        query (str): The raw search text.
+    Returns:
+        str: The tsquery text, or an empty string when the query has no
+        searchable words.
+    """
+    terms = [f"'{term}'" for term in _SEARCH_TERM_PATTERN.findall(query)]
+    if terms:
+        terms[-1] = f"{terms[-1]}:*"
+    return " & ".join(terms)
+
+
+def note_search_vector():
+    """
+    Returns the weighted tsvector expression searched on PostgreSQL.
+    Migration 0007 indexes exactly this expression, so both must change
+    together.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector(
+        "title", weight="A", config=NOTE_SEARCH_CONFIG
+    ) + SearchVector("content", weight="B", config=NOTE_SEARCH_CONFIG)
+
+
+def search_notes_for_user(
+    user: User, query: str, limit: int
+) -> list[tuple[Note, str]]:
+    """
+    Returns the user's notes matching the query, best BM25 rank first,
+    each paired with a snippet of the matching text. Snippets are HTML:
+    the note text is escaped and the matches are wrapped in <mark>.
+
+    Args:
+        user (User): The user whose notes are searched.
+        query (str): The raw search text.
+        limit (int): The maximum number of results.
+    Returns:
+        list[tuple[Note, str]]: The matching notes and their snippets.
+        Notes are loaded in summary mode (see list_notes_for_user).
+    """
+    if not uses_note_search_table():
+        return _search_notes_with_tsvector(user, query, limit)
+
+    expression = build_note_search_expression(query)
+    if not expression:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            NOTE_FTS_SEARCH_SQL,
+            [
+                *(_MATCH_START, _MATCH_STOP) * 2,
+                note_search_query(user.id, expression),
+                limit,
+            ],
+        )
+        ranked = cursor.fetchall()
+
+    notes = notes_queryset_for_user(user, summary=True).in_bulk(
+        [note_id for note_id, *_ in ranked]
+    )
+    # Show the column that matched, preferring the content.
+    return [
+        (
+            notes[note_id],
+            _highlight(
+                content_snippet
+                if _MATCH_START in content_snippet
+                else title_snippet
+            ),
+        )
+        for note_id, title_snippet, content_snippet in ranked
+        if note_id in notes
+    ]
+
+
+def _search_notes_with_tsvector(
+    user: User, query: str, limit: int
+) -> list[tuple[Note, str]]:
+    from django.contrib.postgres.search import (
+        SearchHeadline,
+        SearchQuery,
+        SearchRank,
+    )
+
+    expression = build_note_tsquery(query)
+    if not expression:
+        return []
+
+    search_query = SearchQuery(
+        expression, search_type="raw", config=NOTE_SEARCH_CONFIG
+    )
+    headline_options = {
+        "query": search_query,
+        "config": NOTE_SEARCH_CONFIG,
+        "start_sel": _MATCH_START,
+        "stop_sel": _MATCH_STOP,
+        "max_words": NOTE_SNIPPET_TOKENS,
+        "min_words": NOTE_SNIPPET_TOKENS // 2,
+        "max_fragments": 1,
+    }
+    vector = note_search_vector()
+    notes = (
+        notes_queryset_for_user(user, summary=True)
+        .alias(search=vector, rank=SearchRank(vector, search_query))
+        .annotate(
+            title_snippet=SearchHeadline("title", **headline_options),
+            content_snippet=SearchHeadline("content", **headline_options),
+        )
+        .filter(search=search_query)
+        .order_by("-rank", "id")[:limit]
+    )
+    # Like snippet() on FTS5, show the column that matched.
+    return [
+        (
+            note,
+            _highlight(
+                note.content_snippet
+                if _MATCH_START in note.content_snippet
+                else note.title_snippet
+            ),
+        )
+        for note in notes
+    ]
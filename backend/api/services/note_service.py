@@ -1,25 +1,194 @@
-from django.db.models import Q
+from collections.abc import AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db.models import F, Q
+from django.db.models.functions import Substr
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
+from api.cache.note_cache import (
+    abump_user_note_cache_version,
+    bump_user_note_cache_version,
+)
+from api.db_router import replica_reads
 from api.models import Category, Note
-from django.contrib.auth.models import User
+from api.services.note_bulk_writes import bulk_note_writes
+from api.services.note_delta import apply_content_delta, content_sha256
+from api.services.note_pagination import (
+    decode_note_cursor,
+    encode_note_cursor,
+)
+from api.services.note_search_index import index_note
+
+NOTE_PREVIEW_LENGTH = 200
+NOTE_EXPORT_CHUNK_SIZE = 2000
+NOTE_SUMMARY_FIELDS = (
+    "id",
+    "title",
+    "created_at",
+    "edited_at",
+    "version",
+    "user",
+    "category__id",
+    "category__name",
+    "category__color",
+)
 
 
 class CategoryNotFoundError(Exception):
     pass
 
 
-def list_notes_for_user(user: User) -> list[Note]:
+class NoteVersionConflictError(Exception):
+    def __init__(self, current_version: int | None):
+        super().__init__(current_version)
+        self.current_version = current_version
+
+
+def notes_queryset_for_user(user: User, summary: bool = False):
+    """
+    Returns the base queryset for listing the user's notes.
+
+    Args:
+        user (User): The user whose notes are to be listed.
+        summary (bool, optional): If True, the content column is deferred
+            and replaced by a content_preview truncated by the database.
+    Returns:
+        QuerySet[Note]: The notes of the user with their category.
+    """
+    queryset = Note.objects.filter(user=user).select_related("category")
+    if summary:
+        queryset = queryset.only(*NOTE_SUMMARY_FIELDS).annotate(
+            content_preview=Substr("content", 1, NOTE_PREVIEW_LENGTH)
+        )
+    return queryset
+
+
+def list_notes_for_user(user: User, summary: bool = False) -> list[Note]:
     """
     Returns a list of Note objects belonging to the given user,
     ordered by edited_at and created_at.
 
     Args:
         user (User): The user whose notes are to be listed.
+        summary (bool, optional): If True, content is not loaded and each
+            note gets a truncated content_preview attribute instead.
     Returns:
         list[Note]: A list of Note objects belonging to the user.
     """
-    return list(Note.objects.filter(user=user).select_related("category"))
+    with replica_reads():
+        return list(notes_queryset_for_user(user, summary))
+
+
+async def alist_notes_for_user(
+    user: User, summary: bool = False
+) -> list[Note]:
+    """
+    Async variant of list_notes_for_user, iterating the queryset with
+    the async ORM.
+    """
+    with replica_reads():
+        return [note async for note in notes_queryset_for_user(user, summary)]
+
+
+def iter_notes_for_user(
+    user: User, chunk_size: int = NOTE_EXPORT_CHUNK_SIZE
+) -> Iterator[Note]:
+    """
+    Lazily yields every note of the given user in id order, fetching
+    chunk_size rows at a time instead of loading the whole account.
+
+    Args:
+        user (User): The user whose notes are to be exported.
+        chunk_size (int, optional): The number of rows fetched per
+            database round trip.
+    Returns:
+        Iterator[Note]: The notes of the user with their category.
+    """
+    return (
+        notes_queryset_for_user(user)
+        .order_by("id")
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def aiter_notes_for_user(
+    user: User, chunk_size: int = NOTE_EXPORT_CHUNK_SIZE
+) -> AsyncIterator[Note]:
+    """
+    Async variant of iter_notes_for_user, iterating the queryset with
+    the async ORM.
+    """
+    return (
+        notes_queryset_for_user(user)
+        .order_by("id")
+        .aiterator(chunk_size=chunk_size)
+    )
+
+
+def list_notes_page_for_user(
+    user: User, limit: int, cursor: str | None = None, summary: bool = False
+) -> tuple[list[Note], str | None]:
+    """
+    Returns one page of the user's notes using keyset pagination on
+    (edited_at, created_at, id), newest first.
+
+    Args:
+        user (User): The user whose notes are to be listed.
+        limit (int): The maximum number of notes in the page.
+        cursor (str, optional): The cursor returned with the previous page.
+            If None, the first page is returned.
+        summary (bool, optional): If True, content is not loaded and each
+            note gets a truncated content_preview attribute instead.
+    Returns:
+        tuple[list[Note], str | None]: The notes of the page and the cursor
+        of the next page, or None when there are no more notes.
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    queryset = _notes_page_queryset(user, limit, cursor, summary)
+    with replica_reads():
+        return _split_notes_page(list(queryset), limit)
+
+
+async def alist_notes_page_for_user(
+    user: User, limit: int, cursor: str | None = None, summary: bool = False
+) -> tuple[list[Note], str | None]:
+    """
+    Async variant of list_notes_page_for_user.
+    """
+    queryset = _notes_page_queryset(user, limit, cursor, summary)
+    with replica_reads():
+        return _split_notes_page([note async for note in queryset], limit)
+
+
+def _notes_page_queryset(
+    user: User, limit: int, cursor: str | None, summary: bool
+):
+    # One extra row tells whether there is a next page.
+    queryset = notes_queryset_for_user(user, summary).order_by(
+        "-edited_at", "-created_at", "-id"
+    )
+    if cursor is not None:
+        edited_at, created_at, note_id = decode_note_cursor(cursor)
+        queryset = queryset.filter(
+            Q(edited_at__lt=edited_at)
+            | Q(edited_at=edited_at, created_at__lt=created_at)
+            | Q(edited_at=edited_at, created_at=created_at, id__lt=note_id)
+        )
+    return queryset[: limit + 1]
+
+
+def _split_notes_page(
+    notes: list[Note], limit: int
+) -> tuple[list[Note], str | None]:
+    if len(notes) <= limit:
+        return notes, None
+
+    notes = notes[:limit]
+    return notes, encode_note_cursor(notes[-1])
 
 
 def get_note_for_user(user: User, note_id: int) -> Note:
@@ -34,11 +203,28 @@ def get_note_for_user(user: User, note_id: int) -> Note:
     Raises:
         Http404: If no Note with the given note_id exists for the user.
     """
-    return get_object_or_404(
-        Note.objects.select_related("category"),
-        id=note_id,
-        user=user,
-    )
+    with replica_reads():
+        return get_object_or_404(
+            Note.objects.select_related("category"),
+            id=note_id,
+            user=user,
+        )
+
+
+async def aget_note_for_user(user: User, note_id: int) -> Note:
+    """
+    Async variant of get_note_for_user.
+
+    Raises:
+        Http404: If no Note with the given note_id exists for the user.
+    """
+    try:
+        with replica_reads():
+            return await Note.objects.select_related("category").aget(
+                id=note_id, user=user
+            )
+    except Note.DoesNotExist:
+        raise Http404 from None
 
 
 def _allowed_category_for_user_or_none(
@@ -55,10 +241,21 @@ def _allowed_category_for_user_or_none(
         that are either shared or owned by the user.
         The list will contain at most one Category.
     """
-    return list(
-        Category.objects.filter(id=category_id).filter(
-            Q(owner__isnull=True) | Q(owner=user)
-        )
+    return list(_allowed_category_queryset(category_id, user))
+
+
+async def _aallowed_category_for_user_or_none(
+    category_id: int, user: User
+) -> list[Category]:
+    return [
+        category
+        async for category in _allowed_category_queryset(category_id, user)
+    ]
+
+
+def _allowed_category_queryset(category_id: int, user: User):
+    return Category.objects.filter(id=category_id).filter(
+        Q(owner__isnull=True) | Q(owner=user)
     )
 
 
@@ -91,13 +288,54 @@ def create_note_for_user(user: User, title, content, category_id):
     )
 
 
+async def acreate_note_for_user(user: User, title, content, category_id):
+    """
+    Async variant of create_note_for_user.
+
+    Raises:
+        CategoryNotFoundError: If the category is neither shared nor owned
+        by the user.
+    """
+    categories = await _aallowed_category_for_user_or_none(category_id, user)
+    category = categories[0] if categories else None
+    if category is None:
+        raise CategoryNotFoundError
+
+    return await Note.objects.acreate(
+        title=title,
+        content=content,
+        category=category,
+        user=user,
+    )
+
+
 def patch_note_for_user(
-    note: Note, user: User, title=None, content=None, category_id=None
+    note: Note,
+    user: User,
+    title=None,
+    content=None,
+    category_id=None,
+    expected_version=None,
+    content_delta=None,
+    base_content_sha256=None,
 ):
     """
     Patches the given Note object with the provided title, content,
     and category_id, if they are not None. The note must belong to
     the given user.
+
+    Only the fields whose value actually changes are written, with a
+    single UPDATE filtered by id and user that also increments version.
+    When nothing changes (an idle autosave) no query is issued and
+    edited_at is left untouched.
+
+    If expected_version is given, the UPDATE is additionally filtered by
+    it, so a concurrent write in between is detected atomically without
+    row locks.
+
+    Instead of a full content, a content_delta computed against the
+    stored content can be sent (see apply_content_delta). The write is
+    then always conditioned on the version the delta was applied to.
     Args:
         note (Note): The Note object to patch. Must belong to the user.
         user (User): The user who owns the note.
@@ -107,23 +345,296 @@ def patch_note_for_user(
             If None, the content will not be changed.
         category_id (int, optional): The ID of the new category to associate
             with the note. If None, the category will not be changed.
+        expected_version (int, optional): The version the client last saw.
+            If None, the patch is applied whatever the current version.
+        content_delta (list[list], optional): Splice operations to apply
+            to the stored content. Mutually exclusive with content.
+        base_content_sha256 (str, optional): The SHA-256 hex digest of the
+            content the delta was computed against.
     Returns:
         Note: The updated Note object after patching.
     Raises:
         CategoryNotFoundError: If category_id is provided and no Category with
             the given category_id exists that is either shared or owned by
             the user.
+        NoteVersionConflictError: If expected_version is provided and the
+            note was modified since that version, or if the delta base
+            does not match the stored content.
+        InvalidContentDeltaError: If the delta does not fit the content.
     """
-    if title is not None:
-        note.title = title.strip()
-    if content is not None:
-        note.content = content.strip()
-    if category_id is not None:
+    changes, expected_version = _note_patch_changes(
+        note,
+        title,
+        content,
+        expected_version,
+        content_delta,
+        base_content_sha256,
+    )
+    if category_id is not None and str(category_id) != str(note.category_id):
         categories = _allowed_category_for_user_or_none(category_id, user)
-        category = categories[0] if categories else None
+        changes["category"] = _category_or_raise(categories)
+
+    if not changes:
+        return note
+
+    changes["edited_at"] = timezone.now()
+    queryset = _note_patch_queryset(note, user, expected_version)
+    if not queryset.update(**changes, version=F("version") + 1):
+        raise NoteVersionConflictError(
+            Note.objects.filter(id=note.id)
+            .values_list("version", flat=True)
+            .first()
+        )
+    _apply_note_patch(note, changes)
+
+    # update() bypasses model signals, so refresh their side effects here.
+    if "title" in changes or "content" in changes:
+        index_note(note)
+    bump_user_note_cache_version(user.id)
+    return note
+
+
+async def apatch_note_for_user(
+    note: Note,
+    user: User,
+    title=None,
+    content=None,
+    category_id=None,
+    expected_version=None,
+    content_delta=None,
+    base_content_sha256=None,
+):
+    """
+    Async variant of patch_note_for_user, with the same arguments,
+    return value and exceptions.
+    """
+    changes, expected_version = _note_patch_changes(
+        note,
+        title,
+        content,
+        expected_version,
+        content_delta,
+        base_content_sha256,
+    )
+    if category_id is not None and str(category_id) != str(note.category_id):
+        categories = await _aallowed_category_for_user_or_none(
+            category_id, user
+        )
+        changes["category"] = _category_or_raise(categories)
+
+    if not changes:
+        return note
+
+    changes["edited_at"] = timezone.now()
+    queryset = _note_patch_queryset(note, user, expected_version)
+    if not await queryset.aupdate(**changes, version=F("version") + 1):
+        raise NoteVersionConflictError(
+            await Note.objects.filter(id=note.id)
+            .values_list("version", flat=True)
+            .afirst()
+        )
+    _apply_note_patch(note, changes)
+
+    if "title" in changes or "content" in changes:
+        await sync_to_async(index_note)(note)
+    await abump_user_note_cache_version(user.id)
+    return note
+
+
+def _note_patch_changes(
+    note: Note,
+    title,
+    content,
+    expected_version,
+    content_delta,
+    base_content_sha256,
+) -> tuple[dict, int | None]:
+    # Returns the changed title/content and the version the UPDATE must
+    # be conditioned on; the category is resolved by the caller.
+    if expected_version is not None and expected_version != note.version:
+        raise NoteVersionConflictError(note.version)
+
+    if content_delta is not None:
+        if (
+            base_content_sha256 is not None
+            and base_content_sha256 != content_sha256(note.content)
+        ):
+            raise NoteVersionConflictError(note.version)
+        # Not stripped: the client applies the same delta to its copy,
+        # whose digest must keep matching the stored content.
+        content = apply_content_delta(note.content, content_delta)
+        expected_version = note.version
+    elif content is not None:
+        content = content.strip()
+
+    changes = {}
+    if title is not None and title.strip() != note.title:
+        changes["title"] = title.strip()
+    if content is not None and content != note.content:
+        changes["content"] = content
+    return changes, expected_version
+
+
+def _category_or_raise(categories: list[Category]) -> Category:
+    if not categories:
+        raise CategoryNotFoundError
+    return categories[0]
+
+
+def _note_patch_queryset(note: Note, user: User, expected_version):
+    queryset = Note.objects.filter(id=note.id, user=user)
+    if expected_version is not None:
+        queryset = queryset.filter(version=expected_version)
+    return queryset
+
+
+def _apply_note_patch(note: Note, changes: dict) -> None:
+    for field, value in changes.items():
+        setattr(note, field, value)
+    note.version += 1
+
+
+def _bulk_item_error(operation: str, index: int, field: str, message: str):
+    return {
+        "operation": operation,
+        "index": index,
+        "errors": {field: [message]},
+    }
+
+
+def bulk_write_notes_for_user(
+    user: User, creates: list[dict], updates: list[dict]
+) -> tuple[list[Note], list[Note], list[dict]]:
+    """
+    Creates and patches many notes of the given user at once. Every
+    referenced category and note is loaded with a single query each, and
+    all writes happen in one transaction with bulk_create/bulk_update.
+
+    Items referencing a category or note the user cannot access, and
+    updates whose expected_version is stale (reported with status 409 and
+    the current version), are skipped; the other items are still
+    written. The search index and the notes cache are refreshed by
+    bulk_note_writes.
+
+    Args:
+        user (User): The user who owns the notes.
+        creates (list[dict]): Validated create items with index, title,
+            content and category_id.
+        updates (list[dict]): Validated update items with index, id and
+            optional title, content, category_id and expected_version.
+    Returns:
+        tuple[list[Note], list[Note], list[dict]]: The created notes, the
+        updated notes and the per-item errors.
+    """
+    category_ids = {
+        item["category_id"]
+        for item in [*creates, *updates]
+        if item["category_id"] is not None
+    }
+    categories = (
+        Category.objects.filter(id__in=category_ids)
+        .filter(Q(owner__isnull=True) | Q(owner=user))
+        .in_bulk()
+    )
+
+    item_errors = []
+    new_notes = []
+    for item in creates:
+        category = categories.get(item["category_id"])
         if category is None:
-            raise CategoryNotFoundError
+            item_errors.append(
+                _bulk_item_error(
+                    "create",
+                    item["index"],
+                    "category_id",
+                    "Category not found.",
+                )
+            )
+            continue
+        new_notes.append(
+            Note(
+                title=item["title"],
+                content=item["content"],
+                category=category,
+                user=user,
+            )
+        )
+
+    with bulk_note_writes() as written_notes:
+        created_notes = Note.objects.bulk_create(new_notes)
+        updated_notes = _bulk_update_notes(
+            user, updates, categories, item_errors
+        )
+        written_notes.extend([*created_notes, *updated_notes])
+    return created_notes, updated_notes, item_errors
+
+
+def _bulk_update_notes(
+    user: User, updates: list[dict], categories: dict, item_errors: list
+) -> list[Note]:
+    # Runs inside the bulk transaction. The rows are locked while they are
+    # checked against expected_version and written, so a concurrent PATCH
+    # can neither be overwritten nor share a version with this write.
+    notes = (
+        Note.objects.filter(user=user)
+        .select_related("category")
+        .select_for_update(of=("self",))
+        .in_bulk([item["id"] for item in updates])
+    )
+    now = timezone.now()
+    changed_notes = {}
+    for item in updates:
+        note = notes.get(item["id"])
+        if note is None or note.id in changed_notes:
+            message = "Note not found." if note is None else "Duplicate note."
+            item_errors.append(
+                _bulk_item_error("update", item["index"], "id", message)
+            )
+            continue
+        expected_version = item["expected_version"]
+        if expected_version is not None and expected_version != note.version:
+            item_errors.append(
+                {
+                    **_bulk_item_error(
+                        "update",
+                        item["index"],
+                        "expected_version",
+                        "The note was modified since this version.",
+                    ),
+                    "status": 409,
+                    "version": note.version,
+                }
+            )
+            continue
+        category = note.category
+        if item["category_id"] is not None:
+            category = categories.get(item["category_id"])
+            if category is None:
+                item_errors.append(
+                    _bulk_item_error(
+                        "update",
+                        item["index"],
+                        "category_id",
+                        "Category not found.",
+                    )
+                )
+                continue
+        if item["title"] is not None:
+            note.title = item["title"].strip()
+        if item["content"] is not None:
+            note.content = item["content"].strip()
         note.category = category
+        note.edited_at = now
+        changed_notes[note.id] = note
 
-    note.save()
-    return note
+    updated_notes = list(changed_notes.values())
+    versions = {note.id: note.version + 1 for note in updated_notes}
+    for note in updated_notes:
+        note.version = F("version") + 1
+    Note.objects.bulk_update(
+        updated_notes,
+        ["title", "content", "category", "edited_at", "version"],
+    )
+    for note in updated_notes:
+        note.version = versions[note.id]
+    return updated_notes
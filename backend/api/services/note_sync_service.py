@@ -0,0 +1,126 @@
+import base64
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from api.models import Note, NoteTombstone
+from api.services.note_service import notes_queryset_for_user
+
+# Writes are stamped with timezone.now() before they commit (and import
+# batches even before their bulk insert), so a write committing after a
+# sync started can carry an earlier time. Tokens lag behind the sync by
+# this window so that such writes are still returned by the next sync.
+NOTE_SYNC_WINDOW = timedelta(seconds=60)
+
+
+class InvalidSyncTokenError(Exception):
+    pass
+
+
+def encode_sync_token(moment: datetime) -> str:
+    """
+    Encodes a point in time into an opaque sync token.
+
+    Args:
+        moment (datetime): The time the synchronization started.
+    Returns:
+        str: A URL-safe token to send back as `since` on the next sync.
+    """
+    raw = moment.isoformat().encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_sync_token(token: str) -> datetime:
+    """
+    Decodes a token produced by encode_sync_token.
+
+    Args:
+        token (str): The opaque token sent by the client.
+    Returns:
+        datetime: The time the previous synchronization started.
+    Raises:
+        InvalidSyncTokenError: If the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii"))
+        moment = datetime.fromisoformat(raw.decode("utf-8"))
+    except (ValueError, UnicodeError):
+        raise InvalidSyncTokenError from None
+    if timezone.is_naive(moment):
+        raise InvalidSyncTokenError
+    return moment
+
+
+def record_note_deletion(note: Note) -> None:
+    """
+    Records a tombstone so that clients syncing later learn about the
+    deletion of the given note.
+
+    Args:
+        note (Note): The note that was deleted.
+    """
+    NoteTombstone.objects.create(note_id=note.id, user_id=note.user_id)
+
+
+def note_tombstone_cutoff() -> datetime:
+    """
+    Returns the time before which tombstones are no longer kept (see
+    NOTE_TOMBSTONE_RETENTION_DAYS).
+    """
+    retention = timedelta(days=settings.NOTE_TOMBSTONE_RETENTION_DAYS)
+    return timezone.now() - retention
+
+
+def prune_note_tombstones() -> int:
+    """
+    Deletes the tombstones older than the retention window. Syncs from
+    before the window get a full resync, so no deletion is missed.
+
+    Returns:
+        int: The number of deleted tombstones.
+    """
+    deleted, _ = NoteTombstone.objects.filter(
+        deleted_at__lt=note_tombstone_cutoff()
+    ).delete()
+    return deleted
+
+
+def list_note_changes_for_user(
+    user: User, since: str | None = None
+) -> tuple[list[Note], list[int], str, bool]:
+    """
+    Returns the user's notes changed since the given sync token, and the
+    ids of the notes deleted since then.
+
+    Notes edited or deleted within NOTE_SYNC_WINDOW before the previous
+    sync are returned again, so clients must apply changes idempotently
+    (by id). Tokens older than the tombstone retention window may have
+    lost deletions, so they get a full resync: every note and no
+    deletions, and the client drops the notes that are not returned.
+
+    Args:
+        user (User): The user whose changes are listed.
+        since (str, optional): The token returned by the previous sync.
+            If None, every note is returned as a full resync.
+    Returns:
+        tuple[list[Note], list[int], str, bool]: The changed notes, the
+        deleted note ids, the token to use for the next sync and whether
+        this is a full resync.
+    Raises:
+        InvalidSyncTokenError: If the token is malformed.
+    """
+    next_token = encode_sync_token(timezone.now() - NOTE_SYNC_WINDOW)
+    notes = notes_queryset_for_user(user)
+    moment = None if since is None else decode_sync_token(since)
+    if moment is None or moment < note_tombstone_cutoff():
+        return list(notes), [], next_token, True
+
+    changed = list(notes.filter(edited_at__gte=moment))
+    deleted_ids = list(
+        NoteTombstone.objects.filter(
+            user=user, deleted_at__gte=moment
+        ).values_list("note_id", flat=True)
+    )
+    return changed, deleted_ids, next_token, False
@@ -1,11 +1,59 @@
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from api.cache.category_cache import bump_category_cache_version
-from api.models import Category
+from api.cache.category_cache import (
+    bump_shared_category_cache_version,
+    bump_user_category_cache_version,
+)
+from api.cache.note_cache import (
+    bump_shared_note_cache_version,
+    bump_user_note_cache_version,
+)
+from api.models import Category, Note
+from api.services.note_search_index import (
+    index_note,
+    remove_note_from_index,
+)
+from api.services.note_sync_service import record_note_deletion
 
 
 @receiver(post_save, sender=Category)
 @receiver(post_delete, sender=Category)
-def invalidate_categories_cache_on_category_change(**kwargs):
-    bump_category_cache_version()
+def invalidate_categories_cache_on_category_change(instance, **kwargs):
+    if instance.owner_id is None:
+        bump_shared_category_cache_version()
+    else:
+        bump_user_category_cache_version(instance.owner_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_notes_cache_on_category_change(instance, **kwargs):
+    if instance.owner_id is None:
+        bump_shared_note_cache_version()
+    else:
+        bump_user_note_cache_version(instance.owner_id)
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_delete, sender=Note)
+def invalidate_notes_cache_on_note_change(instance, **kwargs):
+    bump_user_note_cache_version(instance.user_id)
+
+
+@receiver(post_save, sender=Note)
+def index_note_on_save(instance, **kwargs):
+    index_note(instance)
+
+
+@receiver(post_delete, sender=Note)
+def remove_note_from_index_on_delete(instance, **kwargs):
+    remove_note_from_index(instance.id)
+
+
+@receiver(post_delete, sender=Note)
+def record_tombstone_on_note_delete(instance, origin=None, **kwargs):
+    # Notes removed by a user account deletion need no tombstone; the
+    # tombstone would also reference the user being deleted.
+    if type(origin) is Note or getattr(origin, "model", None) is Note:
+        record_note_deletion(instance)
@@ -0,0 +1,5 @@
+from django.urls import include, path
+
+from api.urls import build_urlpatterns
+
+urlpatterns = [path("api/", include(build_urlpatterns(async_views=True)))]
@@ -0,0 +1,50 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from api.cache.cache_stats import reset_cache_stats
+from api.cache.payload_cache import local_payloads
+from api.models import Category, Note
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    local_payloads.clear()
+    reset_cache_stats()
+    yield
+    cache.clear()
+    local_payloads.clear()
+
+
+@pytest.fixture(params=["sync", "async"])
+def api_views(request, settings):
+    """Runs a test against both the sync and the async API views."""
+    if request.param == "async":
+        settings.ROOT_URLCONF = "api.tests.async_urls"
+    return request.param
+
+
+@pytest.fixture
+def user(client):
+    """A user logged in with the test client."""
+    user = get_user_model().objects.create_user(
+        "note-owner", password="strong-pass"
+    )
+    client.force_login(user)
+    return user
+
+
+@pytest.fixture
+def create_note():
+    """Creates notes of a user in the first shared default category."""
+
+    def create(user, title="Title", content="content"):
+        return Note.objects.create(
+            title=title,
+            content=content,
+            category=Category.objects.get(name=Category.DEFAULTS[0]["name"]),
+            user=user,
+        )
+
+    return create
@@ -0,0 +1,33 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from app.settings import cache_from_url
+
+
+@pytest.mark.parametrize(
+    ("url", "backend", "location"),
+    [
+        (
+            "redis://cache:6379/1",
+            "django.core.cache.backends.redis.RedisCache",
+            "redis://cache:6379/1",
+        ),
+        (
+            "memcached://cache-1:11211,cache-2:11211",
+            "django.core.cache.backends.memcached.PyMemcacheCache",
+            ["cache-1:11211", "cache-2:11211"],
+        ),
+        (
+            "locmem://notes",
+            "django.core.cache.backends.locmem.LocMemCache",
+            "notes",
+        ),
+    ],
+)
+def test_cache_from_url_selects_backend(url, backend, location):
+    assert cache_from_url(url) == {"BACKEND": backend, "LOCATION": location}
+
+
+def test_cache_from_url_rejects_unknown_schemes():
+    with pytest.raises(ImproperlyConfigured):
+        cache_from_url("file:///tmp/cache")
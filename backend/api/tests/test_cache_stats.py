@@ -0,0 +1,87 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from api.cache.cache_stats import (
+    get_cache_hit_rates,
+    record_cache_lookup,
+    reset_cache_stats,
+)
+from api.models import Category
+
+
+def test_cache_hit_rates_count_lookups_per_cache():
+    record_cache_lookup("categories", hit=False)
+    record_cache_lookup("categories", hit=True)
+    record_cache_lookup("categories", hit=True)
+    record_cache_lookup("notes", hit=False)
+
+    assert get_cache_hit_rates() == {
+        "categories": {"hits": 2, "misses": 1, "hit_rate": 2 / 3},
+        "notes": {"hits": 0, "misses": 1, "hit_rate": 0.0},
+    }
+
+    reset_cache_stats()
+
+    assert get_cache_hit_rates() == {}
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("api_views")
+def test_category_and_note_reads_record_cache_lookups(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user("reader", password="pass")
+    other = user_model.objects.create_user("writer", password="pass")
+    client.force_login(user)
+
+    client.get(reverse("categories-collection"))
+    client.get(reverse("categories-collection"))
+    Category.objects.create(
+        name="Private", color="#112233", owner=other, is_default=False
+    )
+    client.get(reverse("categories-collection"))
+    client.get(reverse("notes-collection"))
+
+    stats = get_cache_hit_rates()
+    assert stats["categories"] == {
+        "hits": 2,
+        "misses": 1,
+        "hit_rate": 2 / 3,
+    }
+    assert stats["notes"]["misses"] == 1
+
+
+@pytest.mark.django_db
+def test_cache_stats_requires_authentication(client):
+    response = client.get(reverse("cache-stats"))
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_cache_stats_is_staff_only(client):
+    user = get_user_model().objects.create_user("regular", password="pass")
+    client.force_login(user)
+
+    response = client.get(reverse("cache-stats"))
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Staff only"
+
+
+@pytest.mark.django_db
+def test_cache_stats_returns_hit_rates_to_staff(client):
+    staff = get_user_model().objects.create_user(
+        "staff", password="pass", is_staff=True
+    )
+    client.force_login(staff)
+    record_cache_lookup("categories", hit=True)
+
+    response = client.get(reverse("cache-stats"))
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "caches": {
+            "categories": {"hits": 1, "misses": 0, "hit_rate": 1.0},
+        }
+    }
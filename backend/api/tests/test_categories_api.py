@@ -1,13 +1,19 @@
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.urls import reverse
 
-from api.cache import category_cache
-from api.cache.category_cache import CATEGORY_CACHE_VERSION_KEY
+from api.cache import category_cache, versioning
+from api.cache.category_cache import (
+    SHARED_CATEGORY_CACHE_VERSION_KEY,
+    get_user_category_cache_version_key,
+)
 from api.models import Category
 from api.views import category as category_views
 
+pytestmark = pytest.mark.usefixtures("api_views")
+
 
 @pytest.mark.django_db
 def test_categories_collection_requires_authentication(client):
@@ -71,6 +77,11 @@ def test_categories_collection_uses_cached_payload(client, monkeypatch):
         "list_categories_for_user",
         fail_if_called,
     )
+    monkeypatch.setattr(
+        category_views,
+        "alist_categories_for_user",
+        fail_if_called,
+    )
 
     second_response = client.get(reverse("categories-collection"))
     assert second_response.status_code == 200
@@ -78,9 +89,8 @@ def test_categories_collection_uses_cached_payload(client, monkeypatch):
 
 
 @pytest.mark.django_db
-def test_category_create_bumps_categories_cache_version():
-    cache.clear()
-    cache.set(CATEGORY_CACHE_VERSION_KEY, 1)
+def test_shared_category_change_bumps_the_shared_version():
+    cache.set(SHARED_CATEGORY_CACHE_VERSION_KEY, 1)
 
     Category.objects.create(
         name="Drama",
@@ -89,21 +99,260 @@ def test_category_create_bumps_categories_cache_version():
         is_default=False,
     )
 
-    assert cache.get(CATEGORY_CACHE_VERSION_KEY) == 2
+    assert cache.get(SHARED_CATEGORY_CACHE_VERSION_KEY) == 2
+
+
+@pytest.mark.django_db
+def test_owned_category_change_bumps_only_the_owner_version():
+    user_model = get_user_model()
+    owner = user_model.objects.create_user("owner", password="pass")
+    other = user_model.objects.create_user("other", password="pass")
+    owner_key = get_user_category_cache_version_key(owner.id)
+    other_key = get_user_category_cache_version_key(other.id)
+    cache.set_many(
+        {SHARED_CATEGORY_CACHE_VERSION_KEY: 1, owner_key: 1, other_key: 1}
+    )
+
+    category = Category.objects.create(
+        name="Work", color="#112233", owner=owner, is_default=False
+    )
+    category.delete()
+
+    assert cache.get_many(
+        [SHARED_CATEGORY_CACHE_VERSION_KEY, owner_key, other_key]
+    ) == {SHARED_CATEGORY_CACHE_VERSION_KEY: 1, owner_key: 3, other_key: 1}
 
 
 @pytest.mark.django_db
+def test_private_categories_of_others_keep_the_user_cache_warm(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user("reader", password="pass")
+    other = user_model.objects.create_user("creator", password="pass")
+    client.force_login(user)
+    client.get(reverse("categories-collection"))
+
+    Category.objects.create(
+        name="Private", color="#112233", owner=other, is_default=False
+    )
+    _, payload = category_cache.get_cached_categories(user_id=user.id)
+
+    assert payload is not None
+
+    Category.objects.create(
+        name="Shared", color="#445566", owner=None, is_default=False
+    )
+    response = client.get(reverse("categories-collection"))
+
+    names = [category["name"] for category in response.json()["categories"]]
+    assert "Shared" in names
+    assert "Private" not in names
+
+
 def test_bump_category_cache_version_falls_back_when_incr_not_supported(
     monkeypatch,
 ):
-    cache.clear()
-    cache.set(CATEGORY_CACHE_VERSION_KEY, 5)
+    cache.set(SHARED_CATEGORY_CACHE_VERSION_KEY, 5)
 
     def raise_not_implemented(_):
         raise NotImplementedError
 
-    monkeypatch.setattr(category_cache.cache, "incr", raise_not_implemented)
+    monkeypatch.setattr(versioning.cache, "incr", raise_not_implemented)
+
+    category_cache.bump_shared_category_cache_version()
+
+    assert cache.get(SHARED_CATEGORY_CACHE_VERSION_KEY) == 6
+
+
+def test_category_cache_versions_use_concurrently_added_values(monkeypatch):
+    def add_lost_race(key, value, timeout):
+        cache.set(key, 42, timeout)
+        return False
+
+    monkeypatch.setattr(versioning.cache, "add", add_lost_race)
+
+    versions, payload = category_cache.get_cached_categories(user_id=1)
+
+    assert versions == (42, 42)
+    assert payload is None
+
+
+def test_async_category_cache_versions_use_concurrently_added_values(
+    monkeypatch,
+):
+    async def add_lost_race(key, value, timeout):
+        cache.set(key, 42, timeout)
+        return False
+
+    monkeypatch.setattr(versioning.cache, "aadd", add_lost_race)
+
+    versions, _ = async_to_sync(category_cache.aget_cached_categories)(
+        user_id=1
+    )
+    assert versions == (42, 42)
+
+
+@pytest.fixture
+def cache_round_trips(monkeypatch):
+    """
+    Records the cache calls made by the code under test. Calls made by
+    the backend itself, like LocMemCache.get_many calling get for every
+    key, are one round trip on a remote cache and are not recorded.
+    """
+    calls = []
+    nested = [False]
+
+    def record(name):
+        if nested[0]:
+            return False
+        calls.append(name)
+        nested[0] = True
+        return True
+
+    def count(name, method):
+        def counted(*args, **kwargs):
+            outer = record(name)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if outer:
+                    nested[0] = False
 
-    category_cache.bump_category_cache_version()
+        async def acounted(*args, **kwargs):
+            outer = record(name)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                if outer:
+                    nested[0] = False
+
+        return acounted if name in ("aget", "aget_many") else counted
+
+    for name in ("get", "get_many", "set", "add", "aget", "aget_many"):
+        method = getattr(category_cache.cache, name)
+        monkeypatch.setattr(category_cache.cache, name, count(name, method))
+    return calls
+
+
+@pytest.mark.django_db
+def test_cached_categories_take_one_cache_round_trip(
+    client, cache_round_trips
+):
+    user = get_user_model().objects.create_user("trips", password="pass")
+    client.force_login(user)
+    client.get(reverse("categories-collection"))
+    cache_round_trips.clear()
+
+    response = client.get(reverse("categories-collection"))
+
+    assert response.status_code == 200
+    assert cache_round_trips in (["get_many"], ["aget_many"])
+
+
+@pytest.mark.django_db
+def test_categories_cached_for_an_older_version_are_rebuilt(client):
+    user = get_user_model().objects.create_user("stale", password="pass")
+    client.force_login(user)
+    versions, _ = category_cache.get_cached_categories(user_id=user.id)
+    category_cache.set_cached_categories(
+        user_id=user.id,
+        versions=(versions[0], versions[1] - 1),
+        payload={"categories": []},
+    )
+
+    response = client.get(reverse("categories-collection"))
+
+    assert len(response.json()["categories"]) == len(Category.DEFAULTS)
+
+
+def add_shared_category(name="Drama"):
+    return Category.objects.create(
+        name=name, color="#A8C686", owner=None, is_default=False
+    )
+
+
+@pytest.mark.django_db
+def test_one_request_rebuilds_categories_after_a_shared_change(client):
+    user = get_user_model().objects.create_user("herd", password="pass")
+    client.force_login(user)
+    first = client.get(reverse("categories-collection"))
+    add_shared_category()
+
+    rebuilding = client.get(reverse("categories-collection"))
+    rebuilt = client.get(reverse("categories-collection"))
+
+    names = [category["name"] for category in rebuilding.json()["categories"]]
+    assert "Drama" in names
+    assert rebuilding["ETag"] != first["ETag"]
+    assert rebuilt.json() == rebuilding.json()
+
+
+@pytest.mark.django_db
+def test_stale_categories_are_served_while_another_request_rebuilds(
+    client, monkeypatch
+):
+    user = get_user_model().objects.create_user("waiting", password="pass")
+    client.force_login(user)
+    first = client.get(reverse("categories-collection"))
+    add_shared_category()
+    monkeypatch.setattr(category_cache, "claim_rebuild", lambda key: False)
+
+    async def lost_claim(key):
+        return False
+
+    monkeypatch.setattr(category_cache, "aclaim_rebuild", lost_claim)
+
+    stale = client.get(reverse("categories-collection"))
+    revalidated = client.get(
+        reverse("categories-collection"), HTTP_IF_NONE_MATCH=first["ETag"]
+    )
+
+    assert stale.json() == first.json()
+    assert stale["ETag"] == first["ETag"]
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.django_db
+def test_stale_categories_are_not_served_after_the_user_own_change(
+    client, monkeypatch
+):
+    user = get_user_model().objects.create_user("writer", password="pass")
+    client.force_login(user)
+    client.get(reverse("categories-collection"))
+    monkeypatch.setattr(category_cache, "claim_rebuild", lambda key: False)
+
+    async def lost_claim(key):
+        return False
+
+    monkeypatch.setattr(category_cache, "aclaim_rebuild", lost_claim)
+    Category.objects.create(
+        name="Mine", color="#112233", owner=user, is_default=False
+    )
+
+    response = client.get(reverse("categories-collection"))
+
+    names = [category["name"] for category in response.json()["categories"]]
+    assert "Mine" in names
+
+
+@pytest.mark.django_db
+def test_categories_rebuild_is_claimed_once_per_version():
+    user = get_user_model().objects.create_user("claims", password="pass")
+    versions, _ = category_cache.get_cached_categories(user_id=user.id)
+    category_cache.set_cached_categories(
+        user_id=user.id, versions=versions, payload={"categories": []}
+    )
+    add_shared_category()
+
+    claimed = category_cache.get_cached_categories(user_id=user.id)
+    waiting = async_to_sync(category_cache.aget_cached_categories)(
+        user_id=user.id
+    )
+    add_shared_category("Comedy")
+    reclaimed = async_to_sync(category_cache.aget_cached_categories)(
+        user_id=user.id
+    )
 
-    assert cache.get(CATEGORY_CACHE_VERSION_KEY) == 6
+    assert claimed[1] is None
+    assert claimed[0] != versions
+    assert waiting == (versions, {"categories": []})
+    assert reclaimed[1] is None
@@ -0,0 +1,173 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from api.models import Category
+from api.views import category as category_views
+from api.views import note as note_views
+
+pytestmark = pytest.mark.usefixtures("api_views")
+
+
+def fail_if_called(*args, **kwargs):
+    raise AssertionError("Expected 304, but the payload was rebuilt.")
+
+
+@pytest.fixture
+def note(user, create_note):
+    return create_note(user, "Tagged")
+
+
+@pytest.mark.django_db
+def test_notes_collection_returns_304_for_matching_etag(
+    client, note, monkeypatch
+):
+    first = client.get(reverse("notes-collection"))
+    assert first.has_header("ETag")
+
+    monkeypatch.setattr(note_views, "list_notes_for_user", fail_if_called)
+    monkeypatch.setattr(note_views, "alist_notes_for_user", fail_if_called)
+    second = client.get(
+        reverse("notes-collection"), HTTP_IF_NONE_MATCH=first["ETag"]
+    )
+
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+@pytest.mark.django_db
+def test_notes_collection_etag_changes_after_note_edit(client, note):
+    first = client.get(reverse("notes-collection"))
+
+    note.title = "Edited"
+    note.save()
+    second = client.get(
+        reverse("notes-collection"), HTTP_IF_NONE_MATCH=first["ETag"]
+    )
+
+    assert second.status_code == 200
+    assert second["ETag"] != first["ETag"]
+    assert second.json()["notes"][0]["title"] == "Edited"
+
+
+@pytest.mark.django_db
+def test_notes_collection_etag_depends_on_query(client, note):
+    full = client.get(reverse("notes-collection"))
+    summary = client.get(
+        reverse("notes-collection"),
+        {"fields": "summary"},
+        HTTP_IF_NONE_MATCH=full["ETag"],
+    )
+
+    assert summary.status_code == 200
+    assert summary["ETag"] != full["ETag"]
+
+
+@pytest.mark.django_db
+def test_notes_collection_invalid_query_has_no_etag(client, user):
+    response = client.get(reverse("notes-collection"), {"limit": "0"})
+
+    assert response.status_code == 400
+    assert not response.has_header("ETag")
+
+
+@pytest.mark.django_db
+def test_note_detail_returns_304_for_matching_etag(client, note, monkeypatch):
+    url = reverse("note-detail", kwargs={"note_id": note.id})
+    first = client.get(url)
+    assert first.has_header("ETag")
+    assert not first.has_header("Last-Modified")
+
+    monkeypatch.setattr(note_views, "get_note_for_user", fail_if_called)
+    monkeypatch.setattr(note_views, "aget_note_for_user", fail_if_called)
+    second = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert second.status_code == 304
+
+
+@pytest.mark.django_db
+def test_note_detail_etag_changes_after_category_rename(client, note):
+    url = reverse("note-detail", kwargs={"note_id": note.id})
+    first = client.get(url)
+
+    Category.objects.filter(id=note.category_id).update(name="Renamed")
+    second = client.get(
+        url,
+        HTTP_IF_NONE_MATCH=first["ETag"],
+        HTTP_IF_MODIFIED_SINCE="Wed, 21 Oct 2099 07:28:00 GMT",
+    )
+
+    assert second.status_code == 200
+    assert second.json()["category"]["name"] == "Renamed"
+
+
+@pytest.mark.django_db
+def test_note_detail_etag_changes_after_patch(client, note):
+    url = reverse("note-detail", kwargs={"note_id": note.id})
+    first = client.get(url)
+
+    patched = client.patch(
+        url,
+        data=json.dumps({"content": "changed"}),
+        content_type="application/json",
+        HTTP_IF_NONE_MATCH=first["ETag"],
+    )
+    second = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert patched.status_code == 200
+    assert second.status_code == 200
+    assert second.json()["content"] == "changed"
+
+
+@pytest.mark.django_db
+def test_note_detail_missing_note_is_still_404(client, user):
+    response = client.get(reverse("note-detail", kwargs={"note_id": 999}))
+
+    assert response.status_code == 404
+    assert not response.has_header("ETag")
+
+
+@pytest.mark.django_db
+def test_note_detail_requires_authentication_before_etag(client, note):
+    client.logout()
+
+    response = client.get(reverse("note-detail", kwargs={"note_id": note.id}))
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_categories_collection_returns_304_for_matching_etag(
+    client, user, monkeypatch
+):
+    first = client.get(reverse("categories-collection"))
+
+    monkeypatch.setattr(
+        category_views, "list_categories_for_user", fail_if_called
+    )
+    monkeypatch.setattr(
+        category_views, "alist_categories_for_user", fail_if_called
+    )
+    second = client.get(
+        reverse("categories-collection"), HTTP_IF_NONE_MATCH=first["ETag"]
+    )
+
+    assert second.status_code == 304
+
+
+@pytest.mark.django_db
+def test_categories_collection_etag_changes_after_category_change(
+    client, user
+):
+    first = client.get(reverse("categories-collection"))
+
+    Category.objects.create(name="Fresh", color="#abcdef", owner=user)
+    second = client.get(
+        reverse("categories-collection"), HTTP_IF_NONE_MATCH=first["ETag"]
+    )
+
+    assert second.status_code == 200
+    assert "Fresh" in [
+        category["name"] for category in second.json()["categories"]
+    ]
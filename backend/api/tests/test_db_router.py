@@ -0,0 +1,155 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import reverse
+
+from api.db_router import (
+    PrimaryReplicaRouter,
+    get_user_primary_pin_key,
+    primary_pinned,
+    replica_reads,
+)
+from api.models import Category, Note
+
+
+@pytest.fixture
+def read_routes(settings, monkeypatch):
+    """
+    Configures a replica and records where each api read is routed,
+    while still running the queries on the test database.
+    """
+    settings.DATABASE_REPLICAS = ["replica_0"]
+    routes = []
+    route = PrimaryReplicaRouter.db_for_read
+
+    def recording_db_for_read(self, model, **hints):
+        if model._meta.app_label == "api":
+            routes.append((model.__name__, route(self, model, **hints)))
+        return "default"
+
+    monkeypatch.setattr(
+        PrimaryReplicaRouter, "db_for_read", recording_db_for_read
+    )
+    return routes
+
+
+def test_router_sends_only_opted_in_reads_to_replicas(settings):
+    router = PrimaryReplicaRouter()
+    settings.DATABASE_REPLICAS = ["replica_0", "replica_1"]
+
+    assert router.db_for_read(Note) == "default"
+    with replica_reads():
+        assert router.db_for_read(Note) in settings.DATABASE_REPLICAS
+        with primary_pinned():
+            assert router.db_for_read(Note) == "default"
+    assert router.db_for_write(Note) == "default"
+    assert router.allow_relation(Note(), Category()) is True
+    assert router.allow_migrate("default", "api") is True
+    assert router.allow_migrate("replica_0", "api") is False
+
+
+def test_router_reads_primary_without_replicas(settings):
+    settings.DATABASE_REPLICAS = []
+
+    with replica_reads():
+        assert PrimaryReplicaRouter().db_for_read(Note) == "default"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("api_views")
+def test_note_and_category_reads_go_to_replicas(
+    client, user, read_routes, create_note
+):
+    note = create_note(user)
+    read_routes.clear()
+
+    client.get(reverse("notes-collection"))
+    client.get(reverse("notes-collection"), {"limit": 10})
+    client.get(reverse("note-detail", args=[note.id]))
+    client.get(reverse("categories-collection"))
+
+    assert {route for route in read_routes if route[0] != "Note"} == {
+        ("Category", "replica_0")
+    }
+    assert ("Note", "replica_0") in read_routes
+    assert ("Note", "default") not in read_routes
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("api_views")
+def test_user_reads_primary_for_a_window_after_a_patch(
+    client, user, read_routes, create_note
+):
+    note = create_note(user)
+    url = reverse("note-detail", args=[note.id])
+    read_routes.clear()
+
+    response = client.patch(
+        url,
+        data=json.dumps({"title": "Saved"}),
+        content_type="application/json",
+    )
+    patch_routes = list(read_routes)
+    read_routes.clear()
+    detail = client.get(url)
+
+    assert response.status_code == 200
+    assert patch_routes
+    assert {alias for _, alias in patch_routes} == {"default"}
+    assert detail.json()["title"] == "Saved"
+    assert {alias for _, alias in read_routes} == {"default"}
+
+    cache.delete(get_user_primary_pin_key(user.id))
+    read_routes.clear()
+    client.get(url)
+
+    assert {alias for _, alias in read_routes} == {"replica_0"}
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("api_views")
+def test_failed_writes_do_not_pin_the_user(client, user, read_routes):
+    response = client.patch(
+        reverse("note-detail", args=[0]),
+        data=json.dumps({"title": "Missing"}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 404
+    assert cache.get(get_user_primary_pin_key(user.id)) is None
+
+
+@pytest.mark.django_db
+def test_async_middleware_pins_the_user_after_a_patch(
+    settings, read_routes, create_note
+):
+    settings.ROOT_URLCONF = "api.tests.async_urls"
+    user = get_user_model().objects.create_user(
+        "asgi-writer", password="strong-pass-123"
+    )
+    note = create_note(user)
+    url = reverse("note-detail", args=[note.id])
+    async_client = AsyncClient()
+    read_routes.clear()
+
+    async def exercise():
+        await async_client.aforce_login(user)
+        await async_client.get(url)
+        unpinned = list(read_routes)
+        read_routes.clear()
+        await async_client.patch(
+            url,
+            data=json.dumps({"title": "Saved"}),
+            content_type="application/json",
+        )
+        await async_client.get(url)
+        return unpinned
+
+    unpinned = async_to_sync(exercise)()
+
+    assert {alias for _, alias in unpinned} == {"replica_0"}
+    assert {alias for _, alias in read_routes} == {"default"}
@@ -0,0 +1,45 @@
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from api.http import fast_json
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(fast_json, "orjson", None)
+    elif fast_json.orjson is None:  # pragma: no cover
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_dumps_matches_stdlib_encoding(backend):
+    moment = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+    data = {"title": "Café ☕", "when": moment, "amount": Decimal("1.50")}
+
+    assert json.loads(fast_json.dumps(data)) == {
+        "title": "Café ☕",
+        "when": "2026-01-02T03:04:05Z",
+        "amount": "1.50",
+    }
+
+
+def test_loads_parses_bytes(backend):
+    assert fast_json.loads('{"title": "Café"}'.encode()) == {"title": "Café"}
+
+
+@pytest.mark.parametrize("body", [b"{invalid", b'"\xff"'])
+def test_loads_raises_value_error_for_invalid_body(backend, body):
+    with pytest.raises(ValueError):
+        fast_json.loads(body)
+
+
+def test_json_response_sets_content_type_and_status(backend):
+    response = fast_json.JsonResponse({"detail": "ok"}, status=201)
+
+    assert response.status_code == 201
+    assert response["Content-Type"] == "application/json"
+    assert json.loads(response.content) == {"detail": "ok"}
@@ -1,7 +1,38 @@
+import gzip
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from io import StringIO
+
 import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from api.cache.category_cache import (
+    SHARED_CATEGORY_CACHE_VERSION_KEY,
+    get_cached_categories,
+)
+from api.cache.note_cache import (
+    SHARED_NOTE_CACHE_VERSION_KEY,
+    get_note_cache_versions,
+    get_notes_payload_cache_key,
+)
+from api.cache.payload_cache import get_payload, local_payloads
+from api.http import fast_json
+from api.management.commands import export_notes, serve
+from api.models import Category, Note, NoteImportProgress, NoteTombstone
+from api.services import cache_warming_service, note_bulk_writes
+from api.services.note_export_service import split_note_user_id_ranges
+from api.services.note_search_service import search_notes_for_user
 
-from api.models import Category
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
 
 
 @pytest.mark.django_db
@@ -29,3 +60,610 @@ def test_sync_default_categories_command_updates_shared_defaults():
     }
 
     assert categories == expected
+
+
+@pytest.mark.django_db
+def test_sync_default_categories_command_leaves_unchanged_rows_alone():
+    def shared_versions():
+        return (
+            cache.get(SHARED_NOTE_CACHE_VERSION_KEY),
+            cache.get(SHARED_CATEGORY_CACHE_VERSION_KEY),
+        )
+
+    cache.set_many(
+        {
+            SHARED_NOTE_CACHE_VERSION_KEY: 1,
+            SHARED_CATEGORY_CACHE_VERSION_KEY: 1,
+        }
+    )
+    Category.objects.filter(
+        owner__isnull=True, name=Category.DEFAULTS[0]["name"]
+    ).update(color="#000000")
+
+    call_command("sync_default_categories")
+    synced = shared_versions()
+    call_command("sync_default_categories")
+
+    assert synced == (2, 2)
+    assert shared_versions() == synced
+
+
+def write_ndjson(path, records):
+    lines = [
+        record if isinstance(record, str) else fast_json.dumps(record).decode()
+        for record in records
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def importer():
+    return get_user_model().objects.create_user(
+        "importer", password="strong-pass"
+    )
+
+
+@pytest.mark.django_db
+def test_import_notes_command_imports_in_batches(tmp_path, importer):
+    shared_name = Category.DEFAULTS[0]["name"]
+    owned = Category.objects.create(
+        name="Work", color="#111111", owner=importer
+    )
+    source = write_ndjson(
+        tmp_path / "notes.ndjson",
+        [
+            {"title": "Shared", "content": "one", "category": shared_name},
+            {"title": "Owned", "content": "two", "category": {"name": "Work"}},
+            {
+                "title": " New ",
+                "content": "three",
+                "category": {"name": "Imported", "color": "#222222"},
+            },
+        ],
+    )
+    stdout = StringIO()
+
+    call_command(
+        "import_notes",
+        str(source),
+        user="importer",
+        batch_size=2,
+        stdout=stdout,
+    )
+
+    notes = Note.objects.filter(user=importer).order_by("id")
+    assert [note.title for note in notes] == ["Shared", "Owned", "New"]
+    assert notes[0].category.name == shared_name
+    assert notes[1].category == owned
+    assert notes[2].category.owner == importer
+    assert notes[2].category.color == "#222222"
+    assert [note.id for note, _ in search_notes_for_user(importer, "three", 5)]
+    output = stdout.getvalue()
+    assert "Imported 2 notes" in output
+    assert "Imported 3 notes, skipped 0 records" in output
+    assert "rows/s" in output
+    assert not NoteImportProgress.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_notes_command_skips_invalid_records(tmp_path, importer):
+    other = get_user_model().objects.create_user(
+        "other", password="strong-pass"
+    )
+    source = write_ndjson(
+        tmp_path / "notes.ndjson",
+        [
+            {"title": "Owned by other", "category": "Personal"},
+            "",
+            "not json",
+            {"title": "No category"},
+            {"title": "Ghost", "category": "Personal", "username": "ghost"},
+            {"title": "x" * 181, "category": "Personal"},
+            {"title": "Bad color", "category": {"name": "A", "color": 1}},
+            ["not", "an", "object"],
+            {"title": 1, "category": "Personal", "username": 2},
+            {"title": "Bad date", "category": "Personal", "edited_at": "x"},
+        ],
+    )
+    (tmp_path / "notes.ndjson").write_text(
+        source.read_text().replace(
+            '"Owned by other",', '"Owned by other","username":"other",'
+        )
+    )
+    stdout, stderr = StringIO(), StringIO()
+
+    call_command("import_notes", str(source), stdout=stdout, stderr=stderr)
+
+    assert list(Note.objects.values_list("title", "user")) == [
+        ("Owned by other", other.id)
+    ]
+    assert "skipped 8 records" in stdout.getvalue()
+    errors = stderr.getvalue()
+    assert "Line 3 skipped (non_field_errors: Invalid JSON.)" in errors
+    assert "Line 4 skipped (category: A category name is required.)" in (
+        errors
+    )
+    assert "Line 5 skipped (username: User not found.)" in errors
+    assert "Line 8 skipped (non_field_errors: Must be a JSON object.)" in (
+        errors
+    )
+    assert "Line 10 skipped (edited_at: Must be an ISO 8601 datetime.)" in (
+        errors
+    )
+
+
+@pytest.mark.django_db
+def test_import_notes_command_keeps_record_dates(tmp_path, importer):
+    source = write_ndjson(
+        tmp_path / "notes.ndjson",
+        [
+            {
+                "title": "Dated",
+                "category": "Personal",
+                "created_at": "2024-03-01T08:00:00",
+            },
+            {
+                "title": "Invalid date",
+                "category": "Personal",
+                "created_at": "2024-02-30T08:00:00",
+            },
+            {"title": "Undated", "category": "Personal"},
+        ],
+    )
+    stderr = StringIO()
+
+    call_command(
+        "import_notes",
+        str(source),
+        user="importer",
+        stdout=StringIO(),
+        stderr=stderr,
+    )
+
+    dates = note_dates()
+    assert dates["Dated"] == (
+        datetime(2024, 3, 1, 8, tzinfo=UTC),
+        datetime(2024, 3, 1, 8, tzinfo=UTC),
+    )
+    assert dates["Undated"][0].year > 2024
+    assert "Invalid date" not in dates
+    assert "Line 2 skipped (created_at: Must be an ISO 8601 datetime.)" in (
+        stderr.getvalue()
+    )
+
+
+@pytest.mark.django_db
+def test_import_notes_command_resumes_from_checkpoint(tmp_path, importer):
+    source = write_ndjson(
+        tmp_path / "notes.ndjson",
+        [
+            {"title": f"Note {index}", "category": "Personal"}
+            for index in range(3)
+        ],
+    )
+    first_line = source.read_bytes().split(b"\n")[0] + b"\n"
+    NoteImportProgress.objects.create(
+        source="notes-import", offset=len(first_line), line=1, imported=1
+    )
+    stdout = StringIO()
+
+    call_command(
+        "import_notes",
+        str(source),
+        user="importer",
+        checkpoint="notes-import",
+        stdout=stdout,
+    )
+
+    assert list(Note.objects.values_list("title", flat=True)) == [
+        "Note 2",
+        "Note 1",
+    ]
+    assert "Resuming after line 1." in stdout.getvalue()
+    assert "Imported 3 notes" in stdout.getvalue()
+    assert not NoteImportProgress.objects.exists()
+
+    call_command(
+        "import_notes",
+        str(source),
+        user="importer",
+        restart=True,
+        stdout=StringIO(),
+    )
+    assert Note.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_import_notes_command_saves_progress_with_each_batch(
+    tmp_path, importer, monkeypatch
+):
+    source = write_ndjson(
+        tmp_path / "notes.ndjson",
+        [
+            {"title": f"Note {index}", "category": "Personal"}
+            for index in range(3)
+        ],
+    )
+    real_index_notes = note_bulk_writes.index_notes
+    calls = []
+
+    def failing_index_notes(notes):
+        # Fails the second batch after its notes are inserted.
+        calls.append(len(notes))
+        if len(calls) == 2:
+            raise RuntimeError("crash")
+        return real_index_notes(notes)
+
+    monkeypatch.setattr(note_bulk_writes, "index_notes", failing_index_notes)
+
+    with pytest.raises(RuntimeError):
+        call_command(
+            "import_notes",
+            str(source),
+            user="importer",
+            batch_size=2,
+            stdout=StringIO(),
+        )
+
+    progress = NoteImportProgress.objects.get(source=str(source.resolve()))
+    assert (progress.line, progress.imported) == (2, 2)
+    assert Note.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_import_notes_command_rejects_bad_arguments(tmp_path, importer):
+    source = write_ndjson(tmp_path / "notes.ndjson", [])
+
+    with pytest.raises(CommandError, match="File not found"):
+        call_command("import_notes", str(tmp_path / "missing.ndjson"))
+    with pytest.raises(CommandError, match="User not found"):
+        call_command("import_notes", str(source), user="ghost")
+    with pytest.raises(CommandError, match="--batch-size"):
+        call_command("import_notes", str(source), batch_size=0)
+
+
+def read_export(path, compression="gzip"):
+    if compression == "zstd":
+        decompressor = zstandard.ZstdDecompressor()
+        raw = decompressor.stream_reader(path.read_bytes()).read()
+    else:
+        raw = gzip.decompress(path.read_bytes())
+    return [fast_json.loads(line) for line in raw.splitlines()]
+
+
+def note_dates():
+    return {
+        title: (created_at, edited_at)
+        for title, created_at, edited_at in Note.objects.values_list(
+            "title", "created_at", "edited_at"
+        )
+    }
+
+
+def create_note(user, title):
+    return Note.objects.create(
+        title=title,
+        content=f"{title} content",
+        category=Category.objects.get(name=Category.DEFAULTS[0]["name"]),
+        user=user,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_export_notes_command_round_trips_through_import(
+    tmp_path, importer, compression
+):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    notes = [create_note(importer, f"Note {index}") for index in range(3)]
+    for index, note in enumerate(notes):
+        Note.objects.filter(id=note.id).update(
+            created_at=datetime(2024, 1, index + 1, tzinfo=UTC),
+            edited_at=datetime(2024, 2, index + 1, 12, 30, tzinfo=UTC),
+        )
+    dates = note_dates()
+    output = tmp_path / f"notes.ndjson.{compression}"
+    stdout = StringIO()
+
+    call_command(
+        "export_notes",
+        str(output),
+        compression=compression,
+        stdout=stdout,
+    )
+
+    records = read_export(output, compression)
+    assert [record["id"] for record in records] == [note.id for note in notes]
+    assert records[0]["username"] == "importer"
+    assert records[0]["content"] == "Note 0 content"
+    assert "Exported 3 notes" in stdout.getvalue()
+
+    Note.objects.all().delete()
+    source = tmp_path / "notes.ndjson"
+    source.write_bytes(
+        b"".join(fast_json.dumps(record) + b"\n" for record in records)
+    )
+    call_command("import_notes", str(source), stdout=StringIO())
+    assert note_dates() == dates
+
+
+@pytest.mark.django_db
+def test_export_notes_command_filters_by_user(tmp_path, importer):
+    other = get_user_model().objects.create_user(
+        "other", password="strong-pass"
+    )
+    own_note = create_note(importer, "Own")
+    create_note(other, "Other")
+    output = tmp_path / "notes.ndjson.gz"
+
+    call_command(
+        "export_notes",
+        str(output),
+        user="importer",
+        workers=4,
+        stdout=StringIO(),
+    )
+
+    assert [record["id"] for record in read_export(output)] == [own_note.id]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_notes_command_shards_users_across_workers(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(
+        export_notes, "ProcessPoolExecutor", ThreadPoolExecutor
+    )
+    users = [
+        get_user_model().objects.create_user(
+            f"user-{index}", password="strong-pass"
+        )
+        for index in range(5)
+    ]
+    notes = [create_note(user, user.username) for user in users]
+    output = tmp_path / "notes.ndjson.gz"
+
+    call_command("export_notes", str(output), workers=2, stdout=StringIO())
+
+    records = read_export(output)
+    assert [record["id"] for record in records] == [note.id for note in notes]
+    assert list(tmp_path.iterdir()) == [output]
+
+
+def test_split_note_user_id_ranges_covers_every_user(db):
+    assert split_note_user_id_ranges(3) == []
+
+    users = [
+        get_user_model().objects.create_user(f"user-{index}")
+        for index in range(5)
+    ]
+    for user in users:
+        create_note(user, user.username)
+
+    ranges = split_note_user_id_ranges(2)
+
+    assert len(ranges) == 2
+    assert ranges[0][0] == users[0].id
+    assert ranges[0][1] == ranges[1][0]
+    assert ranges[-1][1] == users[-1].id + 1
+
+
+@pytest.mark.django_db
+def test_export_notes_command_rejects_bad_arguments(tmp_path):
+    output = str(tmp_path / "notes.ndjson.gz")
+
+    with pytest.raises(CommandError, match="User not found"):
+        call_command("export_notes", output, user="ghost")
+    with pytest.raises(CommandError, match="--workers"):
+        call_command("export_notes", output, workers=0)
+
+
+@pytest.mark.parametrize(
+    ("server", "workers", "expected"),
+    [
+        ("gunicorn", 3, ["-m", "gunicorn", "app.wsgi:application"]),
+        ("uvicorn", 1, ["-m", "uvicorn", "app.asgi:application"]),
+        ("runserver", 1, ["runserver", "0.0.0.0:9000"]),
+    ],
+)
+def test_serve_command_execs_selected_server(
+    monkeypatch, settings, server, workers, expected
+):
+    settings.APP_SERVER = server
+    settings.WEB_CONCURRENCY = 0
+    monkeypatch.setenv("APP_SERVER", "")
+    monkeypatch.setattr(serve.os, "cpu_count", lambda: 1)
+    monkeypatch.setattr(serve, "shared_cache_configured", lambda: True)
+    calls = []
+    monkeypatch.setattr(
+        serve.os, "execvp", lambda *arguments: calls.append(arguments)
+    )
+    stdout = StringIO()
+
+    call_command("serve", port=9000, stdout=stdout)
+
+    [(executable, argv)] = calls
+    assert executable == sys.executable
+    assert serve.os.environ["APP_SERVER"] == server
+    assert all(argument in argv for argument in expected)
+    if server != "runserver":
+        assert any(argument.endswith(f"={workers}") for argument in argv)
+    assert f"Starting {server} with {workers} workers." in stdout.getvalue()
+
+
+def test_serve_command_uses_configured_worker_count(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        serve.os, "execvp", lambda *arguments: calls.append(arguments)
+    )
+    monkeypatch.setattr(serve, "shared_cache_configured", lambda: True)
+
+    call_command("serve", server="gunicorn", workers=5, stdout=StringIO())
+
+    assert "--workers=5" in calls[0][1]
+
+
+def test_serve_command_runs_one_worker_with_process_local_cache(
+    monkeypatch,
+):
+    calls = []
+    monkeypatch.setattr(
+        serve.os, "execvp", lambda *arguments: calls.append(arguments)
+    )
+    stderr = StringIO()
+
+    call_command(
+        "serve",
+        server="gunicorn",
+        workers=5,
+        stdout=StringIO(),
+        stderr=stderr,
+    )
+
+    assert "--workers=1" in calls[0][1]
+    assert "starting 1 worker instead of 5" in stderr.getvalue()
+
+
+def test_serve_command_rejects_unknown_server(settings):
+    settings.APP_SERVER = "waitress"
+
+    with pytest.raises(CommandError, match="APP_SERVER"):
+        call_command("serve")
+
+
+def log_in(user, when):
+    user.last_login = when
+    user.save(update_fields=["last_login"])
+    return user
+
+
+def warmed_payloads(user):
+    local_payloads.clear()
+    _, categories = get_cached_categories(user_id=user.id)
+    versions = get_note_cache_versions(user_id=user.id)
+    notes = [
+        get_payload(
+            get_notes_payload_cache_key(
+                user_id=user.id, limit=limit, cursor=None, summary=False
+            ),
+            versions,
+        )[1]
+        for limit in cache_warming_service.WARMED_NOTE_LIST_LIMITS
+    ]
+    return categories, notes
+
+
+@pytest.mark.django_db
+def test_prune_note_tombstones_command_reports_deleted_rows(importer):
+    create_note(importer, "Deleted").delete()
+    NoteTombstone.objects.update(deleted_at=datetime(2024, 1, 1, tzinfo=UTC))
+    stdout = StringIO()
+
+    call_command("prune_note_tombstones", stdout=stdout)
+
+    assert not NoteTombstone.objects.exists()
+    assert "Pruned 1 note tombstones older than 30 days." in stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_warm_caches_command_warms_recently_active_users():
+    users = [
+        get_user_model().objects.create_user(f"user-{index}", password="pw")
+        for index in range(3)
+    ]
+    recent = log_in(users[0], "2026-01-02T00:00:00Z")
+    log_in(users[1], "2026-01-01T00:00:00Z")
+    note = create_note(recent, "Warm")
+    stdout = StringIO()
+
+    call_command("warm_caches", users=1, workers=1, stdout=stdout)
+
+    categories, notes = warmed_payloads(recent)
+    assert len(categories["categories"]) == len(Category.DEFAULTS)
+    assert [page["notes"][0]["id"] for page in notes] == [note.id, note.id]
+    assert warmed_payloads(users[1]) == (None, [None, None])
+    assert "Warmed 3 payloads for 1 users" in stdout.getvalue()
+
+    call_command("warm_caches", users=1, workers=1, stdout=stdout)
+
+    assert "Warmed 0 payloads for 1 users" in stdout.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_warm_caches_command_bounds_database_concurrency(monkeypatch):
+    users = [
+        log_in(
+            get_user_model().objects.create_user(f"user-{index}", "pw"),
+            f"2026-01-0{index + 1}T00:00:00Z",
+        )
+        for index in range(6)
+    ]
+    active = []
+    peak = [0]
+    lock = threading.Lock()
+    list_categories = cache_warming_service.list_categories_for_user
+
+    def tracked_list_categories(user):
+        with lock:
+            active.append(user)
+            peak[0] = max(peak[0], len(active))
+        time.sleep(0.02)
+        try:
+            return list_categories(user)
+        finally:
+            with lock:
+                active.remove(user)
+
+    monkeypatch.setattr(
+        cache_warming_service,
+        "list_categories_for_user",
+        tracked_list_categories,
+    )
+
+    call_command("warm_caches", workers=4, db_concurrency=2, stdout=StringIO())
+
+    assert peak[0] == 2
+    for user in users:
+        categories, notes = warmed_payloads(user)
+        assert categories is not None
+        assert None not in notes
+
+
+def test_warm_caches_command_rejects_bad_arguments():
+    with pytest.raises(CommandError, match="--db-concurrency"):
+        call_command("warm_caches", db_concurrency=0)
+
+
+@pytest.mark.django_db
+def test_warm_caches_command_warns_about_a_process_local_cache():
+    stderr = StringIO()
+
+    call_command("warm_caches", stdout=StringIO(), stderr=stderr)
+
+    assert "Set CACHE_URL" in stderr.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sync_default_categories_command_can_warm_caches(monkeypatch):
+    user = log_in(
+        get_user_model().objects.create_user("returning", password="pw"),
+        "2026-01-01T00:00:00Z",
+    )
+    stdout = StringIO()
+
+    call_command("sync_default_categories", warm_caches=True, stdout=stdout)
+
+    assert "Skipped cache warming" in stdout.getvalue()
+    assert warmed_payloads(user)[0] is None
+
+    monkeypatch.setattr(
+        "api.management.commands.sync_default_categories."
+        "shared_cache_configured",
+        lambda: True,
+    )
+    call_command("sync_default_categories", warm_caches=True, stdout=stdout)
+
+    assert "Warmed 3 payloads for 1 users" in stdout.getvalue()
+    assert warmed_payloads(user)[0] is not None
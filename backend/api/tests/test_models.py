@@ -2,7 +2,7 @@ import pytest
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
 
-from api.models import Category, Note
+from api.models import Category, Note, NoteTombstone
 
 
 def default_name(index):
@@ -169,3 +169,15 @@ def test_same_user_cannot_duplicate_private_category_name():
             owner=user,
             is_default=False,
         )
+
+
+@pytest.mark.django_db
+def test_note_tombstone_str_mentions_note_id():
+    user_model = get_user_model()
+    user = user_model.objects.create_user(
+        username="tombstone-user",
+        password="strong-pass-123",
+    )
+    tombstone = NoteTombstone.objects.create(note_id=42, user=user)
+
+    assert str(tombstone) == "Deleted note 42"
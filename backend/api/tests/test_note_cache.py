@@ -0,0 +1,176 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+
+from api.cache import note_cache
+from api.cache.note_cache import (
+    SHARED_NOTE_CACHE_VERSION_KEY,
+    get_user_note_cache_version_key,
+)
+from api.models import Category
+from api.views import note as note_views
+
+pytestmark = pytest.mark.usefixtures("api_views")
+
+
+def fail_if_called(*args, **kwargs):
+    raise AssertionError("Expected cached response, but service was called.")
+
+
+@pytest.mark.django_db
+def test_notes_collection_uses_cached_payload(
+    client, user, monkeypatch, create_note
+):
+    create_note(user)
+    first_response = client.get(reverse("notes-collection"))
+
+    monkeypatch.setattr(note_views, "list_notes_for_user", fail_if_called)
+    monkeypatch.setattr(note_views, "alist_notes_for_user", fail_if_called)
+
+    second_response = client.get(reverse("notes-collection"))
+    assert second_response.json() == first_response.json()
+
+
+@pytest.mark.django_db
+def test_notes_collection_caches_each_page_separately(
+    client, user, monkeypatch, create_note
+):
+    create_note(user, "first")
+    create_note(user, "second")
+    first_page = client.get(reverse("notes-collection"), {"limit": 1}).json()
+    second_page = client.get(
+        reverse("notes-collection"),
+        {"limit": 1, "cursor": first_page["next_cursor"]},
+    ).json()
+
+    monkeypatch.setattr(note_views, "list_notes_page_for_user", fail_if_called)
+    monkeypatch.setattr(
+        note_views, "alist_notes_page_for_user", fail_if_called
+    )
+
+    assert (
+        client.get(reverse("notes-collection"), {"limit": 1}).json()
+        == first_page
+    )
+    assert (
+        client.get(
+            reverse("notes-collection"),
+            {"limit": 1, "cursor": first_page["next_cursor"]},
+        ).json()
+        == second_page
+    )
+    assert first_page != second_page
+
+
+@pytest.mark.django_db
+def test_note_changes_invalidate_cached_notes(client, user, create_note):
+    note = create_note(user, "before")
+    client.get(reverse("notes-collection"))
+
+    note.title = "after"
+    note.save()
+    titles = [
+        item["title"]
+        for item in client.get(reverse("notes-collection")).json()["notes"]
+    ]
+    assert titles == ["after"]
+
+    note.delete()
+    assert client.get(reverse("notes-collection")).json()["notes"] == []
+
+
+@pytest.mark.django_db
+def test_shared_category_change_invalidates_cached_notes(
+    client, user, create_note
+):
+    create_note(user)
+    client.get(reverse("notes-collection"))
+
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    category.color = "#000000"
+    category.save()
+
+    notes = client.get(reverse("notes-collection")).json()["notes"]
+    assert notes[0]["category"]["color"] == "#000000"
+
+
+@pytest.mark.django_db
+def test_owned_category_change_only_bumps_owner_version(user):
+    user_model = get_user_model()
+    other = user_model.objects.create_user("other", password="strong-pass")
+    cache.set(get_user_note_cache_version_key(user.id), 1)
+    cache.set(get_user_note_cache_version_key(other.id), 1)
+    cache.set(SHARED_NOTE_CACHE_VERSION_KEY, 1)
+
+    Category.objects.create(name="Mine", color="#123456", owner=user)
+
+    assert cache.get(get_user_note_cache_version_key(user.id)) == 2
+    assert cache.get(get_user_note_cache_version_key(other.id)) == 1
+    assert cache.get(SHARED_NOTE_CACHE_VERSION_KEY) == 1
+
+
+def test_bump_note_cache_version_initializes_missing_version():
+    note_cache.bump_shared_note_cache_version()
+
+    assert cache.get(SHARED_NOTE_CACHE_VERSION_KEY) > 1
+
+
+def test_bump_note_cache_version_falls_back_when_incr_not_supported(
+    monkeypatch,
+):
+    cache.set(SHARED_NOTE_CACHE_VERSION_KEY, 5)
+
+    def raise_not_implemented(_):
+        raise NotImplementedError
+
+    monkeypatch.setattr(note_cache.cache, "incr", raise_not_implemented)
+
+    note_cache.bump_shared_note_cache_version()
+
+    assert cache.get(SHARED_NOTE_CACHE_VERSION_KEY) == 6
+
+
+def test_note_cache_version_uses_concurrently_added_value(monkeypatch):
+    def add_lost_race(key, value, timeout):
+        cache.set(key, 42, timeout)
+        return False
+
+    monkeypatch.setattr(note_cache.cache, "add", add_lost_race)
+
+    assert note_cache.get_note_cache_versions(user_id=1) == (42, 42)
+
+
+def test_abump_note_cache_version_initializes_missing_version():
+    async_to_sync(note_cache.abump_user_note_cache_version)(1)
+
+    assert cache.get(get_user_note_cache_version_key(1)) > 1
+
+
+def test_abump_note_cache_version_falls_back_when_incr_not_supported(
+    monkeypatch,
+):
+    cache.set(get_user_note_cache_version_key(1), 5)
+
+    async def raise_not_implemented(_):
+        raise NotImplementedError
+
+    monkeypatch.setattr(note_cache.cache, "aincr", raise_not_implemented)
+
+    async_to_sync(note_cache.abump_user_note_cache_version)(1)
+
+    assert cache.get(get_user_note_cache_version_key(1)) == 6
+
+
+def test_async_note_cache_version_uses_concurrently_added_value(
+    monkeypatch,
+):
+    async def add_lost_race(key, value, timeout):
+        cache.set(key, 42, timeout)
+        return False
+
+    monkeypatch.setattr(note_cache.cache, "aadd", add_lost_race)
+
+    versions = async_to_sync(note_cache.aget_note_cache_versions)(user_id=1)
+    assert versions == (42, 42)
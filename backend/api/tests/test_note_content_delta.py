@@ -0,0 +1,171 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from api.services.note_delta import (
+    InvalidContentDeltaError,
+    apply_content_delta,
+    content_sha256,
+)
+
+pytestmark = pytest.mark.usefixtures("api_views")
+
+
+@pytest.fixture
+def note(user, create_note):
+    return create_note(user, content="Hello world")
+
+
+def patch(client, note, payload):
+    return client.patch(
+        reverse("note-detail", kwargs={"note_id": note.id}),
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+
+
+def test_apply_content_delta_applies_sorted_splices():
+    assert (
+        apply_content_delta("Hello world", [[0, 5, "Howdy"], [11, 11, "!"]])
+        == "Howdy world!"
+    )
+
+
+def test_apply_content_delta_counts_utf16_code_units():
+    # The emoji takes two UTF-16 code units, like in JavaScript.
+    assert apply_content_delta("a😀b", [[3, 4, "c"]]) == "a😀c"
+
+
+@pytest.mark.parametrize(
+    "delta",
+    [[[0, 20, "x"]], [[3, 4, "x"], [1, 2, "y"]], [[2, 2, "x"]]],
+)
+def test_apply_content_delta_rejects_operations_that_do_not_fit(delta):
+    with pytest.raises(InvalidContentDeltaError):
+        apply_content_delta("a😀b", delta)
+
+
+@pytest.mark.django_db
+def test_patch_applies_delta_with_expected_version(client, note):
+    response = patch(
+        client,
+        note,
+        {"content_delta": [[6, 11, "there"]], "expected_version": 1},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["content"] == "Hello there"
+    assert response.json()["version"] == 2
+
+
+@pytest.mark.django_db
+def test_patch_applies_delta_with_base_hash(client, note):
+    response = patch(
+        client,
+        note,
+        {
+            "content_delta": [[0, 0, "Oh, "]],
+            "base_content_sha256": content_sha256("Hello world"),
+        },
+    )
+
+    assert response.status_code == 200
+    note.refresh_from_db()
+    assert note.content == "Oh, Hello world"
+
+
+@pytest.mark.django_db
+def test_patch_keeps_whitespace_produced_by_delta(client, note):
+    typed = patch(
+        client,
+        note,
+        {"content_delta": [[11, 11, "\n\n"]], "expected_version": 1},
+    )
+    continued = patch(
+        client,
+        note,
+        {
+            "content_delta": [[13, 13, "Next"]],
+            "base_content_sha256": content_sha256("Hello world\n\n"),
+        },
+    )
+
+    assert typed.json()["content"] == "Hello world\n\n"
+    assert continued.status_code == 200
+    assert continued.json()["content"] == "Hello world\n\nNext"
+
+
+@pytest.mark.django_db
+def test_patch_delta_with_stale_base_hash_conflicts(client, note):
+    response = patch(
+        client,
+        note,
+        {
+            "content_delta": [[0, 0, "x"]],
+            "base_content_sha256": content_sha256("Old content"),
+        },
+    )
+
+    assert response.status_code == 409
+    note.refresh_from_db()
+    assert note.content == "Hello world"
+
+
+@pytest.mark.django_db
+def test_patch_delta_with_stale_version_conflicts(client, note):
+    patch(client, note, {"title": "Other tab"})
+
+    response = patch(
+        client, note, {"content_delta": [[0, 0, "x"]], "expected_version": 1}
+    )
+
+    assert response.status_code == 409
+
+
+@pytest.mark.django_db
+def test_patch_delta_outside_content_is_rejected(client, note):
+    response = patch(
+        client, note, {"content_delta": [[50, 60, "x"]], "expected_version": 1}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "Content delta does not match the note content"
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("payload", "field"),
+    [
+        ({"content_delta": [[0, 0, "x"]]}, "content_delta"),
+        (
+            {
+                "content_delta": [[0, 0, "x"]],
+                "content": "full",
+                "expected_version": 1,
+            },
+            "content",
+        ),
+        (
+            {"content_delta": [[0, 0, "x"]], "base_content_sha256": 5},
+            "base_content_sha256",
+        ),
+        ({"content_delta": "x", "expected_version": 1}, "content_delta"),
+        (
+            {"content_delta": [[2, 1, "x"]], "expected_version": 1},
+            "content_delta",
+        ),
+        (
+            {"content_delta": [[0, True, "x"]], "expected_version": 1},
+            "content_delta",
+        ),
+        ({"content_delta": [[0, 1]], "expected_version": 1}, "content_delta"),
+    ],
+)
+def test_patch_rejects_malformed_delta(client, note, payload, field):
+    response = patch(client, note, payload)
+
+    assert response.status_code == 400
+    assert field in response.json()["errors"]
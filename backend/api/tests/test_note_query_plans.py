@@ -0,0 +1,116 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Category, Note
+from api.services.note_search_index import NOTE_SEARCH_TABLE
+from api.services.note_search_service import (
+    note_search_vector,
+    search_notes_for_user,
+)
+from api.services.note_service import (
+    list_notes_for_user,
+    list_notes_page_for_user,
+)
+
+sqlite_only = pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="Checks SQLite query plans."
+)
+postgresql_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Checks PostgreSQL plans."
+)
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return " | ".join(row[-1] for row in cursor.fetchall())
+
+
+def captured_note_query_plan(func):
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return query_plan(context.captured_queries[-1]["sql"])
+
+
+@pytest.fixture
+def user_with_notes():
+    user_model = get_user_model()
+    user = user_model.objects.create_user("planner", password="strong-pass")
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    for index in range(3):
+        Note.objects.create(
+            title=f"Note {index}",
+            content="content",
+            category=category,
+            user=user,
+        )
+    return user
+
+
+@sqlite_only
+@pytest.mark.django_db
+def test_list_notes_for_user_uses_index_without_temp_sort(user_with_notes):
+    plan = captured_note_query_plan(
+        lambda: list_notes_for_user(user_with_notes)
+    )
+
+    assert "note_user_edited_idx" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@sqlite_only
+@pytest.mark.django_db
+def test_list_notes_page_for_user_uses_index_without_temp_sort(
+    user_with_notes,
+):
+    _, cursor = list_notes_page_for_user(user_with_notes, limit=1)
+
+    plan = captured_note_query_plan(
+        lambda: list_notes_page_for_user(
+            user_with_notes, limit=1, cursor=cursor
+        )
+    )
+
+    assert "note_user_edited_idx" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@sqlite_only
+@pytest.mark.django_db
+def test_note_search_filters_and_ranks_inside_fts5(user_with_notes):
+    with CaptureQueriesContext(connection) as context:
+        search_notes_for_user(user_with_notes, "note", 5)
+    [sql] = [
+        query["sql"]
+        for query in context.captured_queries
+        if NOTE_SEARCH_TABLE in query["sql"]
+    ]
+
+    plan = query_plan(sql)
+
+    # One MATCH over the owner token and the terms, ordered by the FTS5
+    # rank, instead of a post-filter on the user and a separate sort.
+    assert f"SCAN {NOTE_SEARCH_TABLE} VIRTUAL TABLE INDEX" in plan
+    assert "TEMP B-TREE" not in plan
+    assert "user_id" not in sql
+
+
+@postgresql_only
+@pytest.mark.django_db
+def test_note_search_vector_matches_gin_index():
+    from django.contrib.postgres.search import SearchQuery
+
+    search_query = SearchQuery("'word':*", search_type="raw")
+    with connection.cursor() as cursor:
+        # An empty table is cheaper to scan; leave the index as the only
+        # option to prove the expression matches the indexed one.
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    plan = (
+        Note.objects.alias(search=note_search_vector())
+        .filter(search=search_query)
+        .explain()
+    )
+
+    assert "api_note_search_gin_idx" in plan
@@ -0,0 +1,194 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+
+from api.models import Note
+from api.services.note_service import (
+    NoteVersionConflictError,
+    apatch_note_for_user,
+    patch_note_for_user,
+)
+from api.views import note as note_views
+
+pytestmark = pytest.mark.usefixtures("api_views")
+
+
+@pytest.fixture
+def note(user, create_note):
+    return create_note(user, content="Content")
+
+
+def patch(client, note, payload, **headers):
+    return client.patch(
+        reverse("note-detail", kwargs={"note_id": note.id}),
+        data=json.dumps(payload),
+        content_type="application/json",
+        **headers,
+    )
+
+
+@pytest.mark.django_db
+def test_patch_increments_version(client, note):
+    response = patch(client, note, {"title": "New", "expected_version": 1})
+
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    note.refresh_from_db()
+    assert note.version == 2
+
+
+@pytest.mark.django_db
+def test_patch_with_stale_expected_version_conflicts(client, note):
+    patch(client, note, {"title": "First writer", "expected_version": 1})
+
+    response = patch(
+        client, note, {"title": "Second writer", "expected_version": 1}
+    )
+
+    assert response.status_code == 409
+    assert response.json()["version"] == 2
+    note.refresh_from_db()
+    assert note.title == "First writer"
+
+
+@pytest.mark.django_db
+def test_patch_uses_if_match_etag(client, note):
+    url = reverse("note-detail", kwargs={"note_id": note.id})
+    etag = client.get(url)["ETag"]
+
+    first = patch(client, note, {"content": "A"}, HTTP_IF_MATCH=etag)
+    second = patch(client, note, {"content": "B"}, HTTP_IF_MATCH=etag)
+    fresh = patch(
+        client, note, {"content": "C"}, HTTP_IF_MATCH=client.get(url)["ETag"]
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+    assert fresh.status_code == 200
+    assert fresh.json()["version"] == 3
+
+
+@pytest.mark.django_db
+def test_patch_with_wildcard_if_match_is_unconditional(client, note):
+    response = patch(client, note, {"title": "Any"}, HTTP_IF_MATCH="*")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_idle_patch_with_stale_version_conflicts(client, note):
+    patch(client, note, {"title": "Changed"})
+
+    response = patch(client, note, {"title": "Changed", "expected_version": 1})
+
+    assert response.status_code == 409
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("version", ["abc", 0, -3])
+def test_patch_rejects_invalid_expected_version(client, note, version):
+    response = patch(client, note, {"title": "x", "expected_version": version})
+
+    assert response.status_code == 400
+    assert "expected_version" in response.json()["errors"]
+
+
+PATCH_SERVICES = pytest.mark.parametrize(
+    "patch_note",
+    [patch_note_for_user, async_to_sync(apatch_note_for_user)],
+    ids=["sync", "async"],
+)
+
+
+@pytest.mark.django_db
+@PATCH_SERVICES
+def test_conditional_update_detects_concurrent_write(user, note, patch_note):
+    stale_copy = Note.objects.get(id=note.id)
+    patch_note(note, user, title="Winner", expected_version=1)
+
+    with pytest.raises(NoteVersionConflictError) as error:
+        patch_note(stale_copy, user, title="Loser", expected_version=1)
+
+    assert error.value.current_version == 2
+    note.refresh_from_db()
+    assert note.title == "Winner"
+
+
+@pytest.mark.django_db
+@PATCH_SERVICES
+def test_update_of_concurrently_deleted_note_conflicts(user, note, patch_note):
+    stale_copy = Note.objects.get(id=note.id)
+    note.delete()
+
+    with pytest.raises(NoteVersionConflictError) as error:
+        patch_note(stale_copy, user, title="Ghost")
+
+    assert error.value.current_version is None
+
+
+@pytest.mark.django_db
+def test_patch_of_concurrently_deleted_note_returns_404(
+    client, note, monkeypatch
+):
+    def raise_deleted(*args, **kwargs):
+        raise NoteVersionConflictError(None)
+
+    monkeypatch.setattr(note_views, "patch_note_for_user", raise_deleted)
+    monkeypatch.setattr(note_views, "apatch_note_for_user", raise_deleted)
+
+    response = patch(client, note, {"title": "Ghost"})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_bulk_update_increments_version(client, note):
+    client.post(
+        reverse("notes-bulk"),
+        data=json.dumps({"update": [{"id": note.id, "title": "Bulk"}]}),
+        content_type="application/json",
+    )
+
+    note.refresh_from_db()
+    assert note.version == 2
+
+
+@pytest.mark.django_db
+def test_saving_a_note_outside_the_api_invalidates_its_etag(client, note):
+    url = reverse("note-detail", kwargs={"note_id": note.id})
+    etag = client.get(url)["ETag"]
+
+    note.content = "Changed in the admin"
+    note.save()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    stale = patch(client, note, {"title": "Stale"}, HTTP_IF_MATCH=etag)
+
+    assert note.version == 2
+    assert response.status_code == 200
+    assert response.json()["content"] == "Changed in the admin"
+    assert stale.status_code == 409
+
+
+@pytest.mark.django_db
+def test_saving_selected_fields_still_increments_version(note):
+    note.title = "Renamed"
+    note.save(update_fields=["title"])
+    note.refresh_from_db()
+
+    assert (note.title, note.version) == ("Renamed", 2)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("expected_version", [1.5, "1.5", True])
+def test_patch_rejects_non_integer_expected_version(
+    client, note, expected_version
+):
+    response = patch(
+        client, note, {"title": "New", "expected_version": expected_version}
+    )
+
+    assert response.status_code == 400
+    assert "expected_version" in response.json()["errors"]
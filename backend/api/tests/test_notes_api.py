@@ -1,10 +1,17 @@
 import json
 
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from api.models import Category, Note
+from api.services.note_service import NOTE_PREVIEW_LENGTH
+
+pytestmark = pytest.mark.usefixtures("api_views")
 
 
 @pytest.mark.django_db
@@ -291,7 +298,8 @@ def test_note_detail_patch_malformed_json_keeps_note_unchanged(client):
         content_type="application/json",
     )
 
-    assert response.status_code == 200
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid JSON"
     note.refresh_from_db()
     assert note.title == "Old title"
     assert note.content == "Old content"
@@ -346,3 +354,326 @@ def test_note_detail_patch_rejects_invalid_category(client):
 
     assert response.status_code == 400
     assert response.json()["detail"] == "Category not found"
+
+
+def _create_notes(user, category, count):
+    return [
+        Note.objects.create(
+            title=f"Note {index}",
+            content=f"content {index}",
+            category=category,
+            user=user,
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_notes_collection_paginates_with_cursor(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user("pager", password="strong-pass-123")
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    notes = _create_notes(user, category, 5)
+    client.force_login(user)
+
+    first = client.get(reverse("notes-collection"), {"limit": 2}).json()
+    second = client.get(
+        reverse("notes-collection"),
+        {"limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+    third = client.get(
+        reverse("notes-collection"),
+        {"limit": 2, "cursor": second["next_cursor"]},
+    ).json()
+
+    ids = [
+        note["id"] for page in (first, second, third) for note in page["notes"]
+    ]
+    assert ids == [note.id for note in reversed(notes)]
+    assert first["next_cursor"] is not None
+    assert third["next_cursor"] is None
+
+
+@pytest.mark.django_db
+def test_notes_collection_pagination_breaks_timestamp_ties_by_id(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user("ties", password="strong-pass-123")
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    notes = _create_notes(user, category, 3)
+    Note.objects.filter(user=user).update(
+        edited_at=notes[0].edited_at,
+        created_at=notes[0].created_at,
+    )
+    client.force_login(user)
+
+    first = client.get(reverse("notes-collection"), {"limit": 2}).json()
+    second = client.get(
+        reverse("notes-collection"),
+        {"limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+
+    ids = [note["id"] for note in first["notes"] + second["notes"]]
+    assert ids == sorted((note.id for note in notes), reverse=True)
+
+
+@pytest.mark.django_db
+def test_notes_collection_cursor_without_limit_uses_default_page(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user(
+        "default-page", password="strong-pass-123"
+    )
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    _create_notes(user, category, 3)
+    client.force_login(user)
+
+    first = client.get(reverse("notes-collection"), {"limit": 1}).json()
+    response = client.get(
+        reverse("notes-collection"), {"cursor": first["next_cursor"]}
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["notes"]) == 2
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.django_db
+def test_notes_collection_without_limit_returns_all_notes(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user(
+        "all-notes", password="strong-pass-123"
+    )
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    _create_notes(user, category, 3)
+    client.force_login(user)
+
+    response = client.get(reverse("notes-collection"))
+
+    assert len(response.json()["notes"]) == 3
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("limit", ["0", "abc", "1000"])
+def test_notes_collection_rejects_invalid_limit(client, limit):
+    user_model = get_user_model()
+    user = user_model.objects.create_user("limits", password="strong-pass-123")
+    client.force_login(user)
+
+    response = client.get(reverse("notes-collection"), {"limit": limit})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid query"
+    assert "limit" in response.json()["errors"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("cursor", ["not-base64!", "WzFd", "eyJhIjoxfQ=="])
+def test_notes_collection_rejects_invalid_cursor(client, cursor):
+    user_model = get_user_model()
+    user = user_model.objects.create_user("cursor", password="strong-pass-123")
+    client.force_login(user)
+
+    response = client.get(
+        reverse("notes-collection"), {"limit": 2, "cursor": cursor}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.django_db
+def test_notes_collection_summary_mode_returns_content_preview(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user(
+        "summary", password="strong-pass-123"
+    )
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    Note.objects.create(
+        title="Long note",
+        content="x" * (NOTE_PREVIEW_LENGTH + 50),
+        category=category,
+        user=user,
+    )
+    client.force_login(user)
+
+    response = client.get(reverse("notes-collection"), {"fields": "summary"})
+
+    assert response.status_code == 200
+    note = response.json()["notes"][0]
+    assert "content" not in note
+    assert note["content_preview"] == "x" * NOTE_PREVIEW_LENGTH
+    assert note["title"] == "Long note"
+    assert note["category"]["id"] == category.id
+
+
+@pytest.mark.django_db
+def test_notes_collection_summary_mode_supports_pagination(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user(
+        "summary-pages", password="strong-pass-123"
+    )
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    notes = _create_notes(user, category, 3)
+    client.force_login(user)
+
+    first = client.get(
+        reverse("notes-collection"), {"fields": "summary", "limit": 2}
+    ).json()
+    second = client.get(
+        reverse("notes-collection"),
+        {"fields": "summary", "limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+
+    ids = [note["id"] for note in first["notes"] + second["notes"]]
+    assert ids == [note.id for note in reversed(notes)]
+    assert second["notes"][0]["content_preview"] == "content 0"
+
+
+@pytest.mark.django_db
+def test_notes_collection_rejects_unknown_fields_mode(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user("fields", password="strong-pass-123")
+    client.force_login(user)
+
+    response = client.get(reverse("notes-collection"), {"fields": "all"})
+
+    assert response.status_code == 400
+    assert "fields" in response.json()["errors"]
+
+
+@pytest.mark.django_db
+def test_note_detail_patch_with_identical_values_skips_write(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user(
+        "idle-autosave", password="strong-pass-123"
+    )
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    note = Note.objects.create(
+        title="Same title",
+        content="Same content",
+        category=category,
+        user=user,
+    )
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.patch(
+            reverse("note-detail", kwargs={"note_id": note.id}),
+            data=json.dumps(
+                {
+                    "title": "Same title",
+                    "content": "Same content ",
+                    "category_id": str(category.id),
+                }
+            ),
+            content_type="application/json",
+        )
+
+    assert response.status_code == 200
+    assert not any(
+        query["sql"].startswith("UPDATE") for query in context.captured_queries
+    )
+    stored = Note.objects.get(id=note.id)
+    assert stored.edited_at == note.edited_at
+
+
+@pytest.mark.django_db
+def test_note_detail_patch_only_writes_changed_columns(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user(
+        "partial-writer", password="strong-pass-123"
+    )
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    note = Note.objects.create(
+        title="Old title",
+        content="Large unchanged content",
+        category=category,
+        user=user,
+    )
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.patch(
+            reverse("note-detail", kwargs={"note_id": note.id}),
+            data=json.dumps(
+                {"title": "New title", "content": "Large unchanged content"}
+            ),
+            content_type="application/json",
+        )
+
+    updates = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "api_note"')
+    ]
+    assert len(updates) == 1
+    assert '"title"' in updates[0]
+    assert '"content"' not in updates[0]
+    assert '"user_id"' in updates[0].split("WHERE")[1]
+    assert response.json()["title"] == "New title"
+    stored = Note.objects.get(id=note.id)
+    assert stored.title == "New title"
+    assert stored.edited_at > note.edited_at
+
+
+@pytest.mark.django_db
+def test_note_detail_patch_refreshes_search_and_cached_list(client):
+    user_model = get_user_model()
+    user = user_model.objects.create_user(
+        "patch-refresh", password="strong-pass-123"
+    )
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    note = Note.objects.create(
+        title="Before",
+        content="walrus",
+        category=category,
+        user=user,
+    )
+    client.force_login(user)
+    client.get(reverse("notes-collection"))
+
+    client.patch(
+        reverse("note-detail", kwargs={"note_id": note.id}),
+        data=json.dumps({"title": "After", "content": "narwhal"}),
+        content_type="application/json",
+    )
+
+    listed = client.get(reverse("notes-collection")).json()["notes"]
+    found = client.get(reverse("notes-search"), {"q": "narwhal"}).json()
+    stale = client.get(reverse("notes-search"), {"q": "walrus"}).json()
+    assert listed[0]["title"] == "After"
+    assert [item["id"] for item in found["notes"]] == [note.id]
+    assert stale["notes"] == []
+
+
+@pytest.mark.django_db
+def test_async_views_serve_notes_through_the_asgi_handler():
+    user = get_user_model().objects.create_user(
+        "asgi", password="strong-pass-123"
+    )
+    category = Category.objects.get(name=Category.DEFAULTS[0]["name"])
+    async_client = AsyncClient()
+
+    async def exercise():
+        await async_client.aforce_login(user)
+        created = await async_client.post(
+            reverse("notes-collection"),
+            {"title": "Async", "content": "body", "category_id": category.id},
+        )
+        note_id = created.json()["id"]
+        patched = await async_client.patch(
+            reverse("note-detail", args=[note_id]),
+            data=json.dumps({"title": "Patched", "expected_version": 1}),
+            content_type="application/json",
+        )
+        detail = await async_client.get(reverse("note-detail", args=[note_id]))
+        listed = await async_client.get(reverse("notes-collection"))
+        return created, patched, detail, listed
+
+    created, patched, detail, listed = async_to_sync(exercise)()
+
+    assert created.status_code == 201
+    assert patched.json()["version"] == 2
+    assert detail.json()["title"] == "Patched"
+    assert detail["ETag"].startswith('"2-')
+    assert [note["title"] for note in listed.json()["notes"]] == ["Patched"]
@@ -0,0 +1,393 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from api.models import Category, Note
+from api.validators.note_payload import (
+    NOTE_BULK_MAX_ITEMS,
+    NOTE_TITLE_MAX_LENGTH,
+)
+
+
+def post_bulk(client, payload):
+    return client.post(
+        reverse("notes-bulk"),
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+
+
+@pytest.fixture
+def category():
+    return Category.objects.get(name=Category.DEFAULTS[0]["name"])
+
+
+@pytest.mark.django_db
+def test_notes_bulk_requires_authentication(client):
+    response = post_bulk(client, {"create": []})
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_notes_bulk_creates_and_updates_notes(client, user, category):
+    other_category = Category.objects.get(name=Category.DEFAULTS[1]["name"])
+    existing = Note.objects.create(
+        title="Old", content="old", category=category, user=user
+    )
+
+    response = post_bulk(
+        client,
+        {
+            "create": [
+                {
+                    "title": " First ",
+                    "content": "a",
+                    "category_id": category.id,
+                },
+                {"title": "Second", "category_id": str(other_category.id)},
+            ],
+            "update": [
+                {
+                    "id": existing.id,
+                    "content": "new",
+                    "category_id": other_category.id,
+                }
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert [note["title"] for note in payload["created"]] == [
+        "First",
+        "Second",
+    ]
+    assert payload["updated"][0]["content"] == "new"
+    assert payload["errors"] == []
+    existing.refresh_from_db()
+    assert existing.title == "Old"
+    assert existing.content == "new"
+    assert existing.category_id == other_category.id
+    assert existing.edited_at > existing.created_at
+    assert Note.objects.filter(user=user).count() == 3
+
+
+@pytest.mark.django_db
+def test_notes_bulk_uses_constant_number_of_queries(
+    client, user, category, django_assert_max_num_queries
+):
+    notes = [
+        Note.objects.create(
+            title=f"Note {index}", content="", category=category, user=user
+        )
+        for index in range(20)
+    ]
+    payload = {
+        "create": [
+            {"title": f"New {index}", "category_id": category.id}
+            for index in range(50)
+        ],
+        "update": [{"id": note.id, "title": "Renamed"} for note in notes],
+    }
+
+    with django_assert_max_num_queries(15):
+        response = post_bulk(client, payload)
+
+    assert len(response.json()["created"]) == 50
+    assert len(response.json()["updated"]) == 20
+
+
+@pytest.mark.django_db
+def test_notes_bulk_reports_item_errors_and_writes_valid_items(
+    client, user, category
+):
+    user_model = get_user_model()
+    other = user_model.objects.create_user("other", password="strong-pass")
+    private = Category.objects.create(
+        name="Private", color="#000", owner=other
+    )
+    foreign_note = Note.objects.create(
+        title="Foreign", content="", category=category, user=other
+    )
+    own_note = Note.objects.create(
+        title="Own", content="", category=category, user=user
+    )
+
+    response = post_bulk(
+        client,
+        {
+            "create": [
+                {"title": "Valid", "category_id": category.id},
+                {"title": "Bad category", "category_id": private.id},
+                {"title": 5, "category_id": category.id},
+                "not an object",
+                {"content": ["x"], "category_id": True},
+            ],
+            "update": [
+                {"id": foreign_note.id, "title": "Hijack"},
+                {"id": own_note.id, "category_id": private.id},
+                {"id": own_note.id, "title": "Renamed"},
+                {"id": own_note.id, "title": "Renamed twice"},
+                {"id": "abc", "category_id": "x", "content": 3},
+                7,
+            ],
+        },
+    )
+
+    payload = response.json()
+    assert [note["title"] for note in payload["created"]] == ["Valid"]
+    assert [note["title"] for note in payload["updated"]] == ["Renamed"]
+    assert [
+        (error["operation"], error["index"], sorted(error["errors"]))
+        for error in payload["errors"]
+    ] == [
+        ("create", 1, ["category_id"]),
+        ("create", 2, ["title"]),
+        ("create", 3, ["non_field_errors"]),
+        ("create", 4, ["category_id", "content"]),
+        ("update", 0, ["id"]),
+        ("update", 1, ["category_id"]),
+        ("update", 3, ["id"]),
+        ("update", 4, ["category_id", "content", "id"]),
+        ("update", 5, ["non_field_errors"]),
+    ]
+    foreign_note.refresh_from_db()
+    assert foreign_note.title == "Foreign"
+
+
+@pytest.mark.django_db
+def test_notes_bulk_refreshes_search_and_cached_list(client, user, category):
+    client.get(reverse("notes-collection"))
+
+    post_bulk(
+        client,
+        {
+            "create": [
+                {
+                    "title": "Bulk",
+                    "content": "zebra",
+                    "category_id": category.id,
+                }
+            ]
+        },
+    )
+
+    titles = [
+        note["title"]
+        for note in client.get(reverse("notes-collection")).json()["notes"]
+    ]
+    found = client.get(reverse("notes-search"), {"q": "zebra"}).json()
+    assert titles == ["Bulk"]
+    assert [note["title"] for note in found["notes"]] == ["Bulk"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [],
+        {"create": {}},
+        {"update": "x"},
+        {"create": [{"category_id": 1}] * (NOTE_BULK_MAX_ITEMS + 1)},
+    ],
+)
+def test_notes_bulk_rejects_malformed_payload(client, user, payload):
+    response = post_bulk(client, payload)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid payload"
+
+
+@pytest.mark.django_db
+def test_notes_collection_accepts_json_post(client, user, category):
+    response = client.post(
+        reverse("notes-collection"),
+        data=json.dumps({"title": "JSON", "category_id": category.id}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 201
+    assert response.json()["title"] == "JSON"
+
+
+@pytest.mark.django_db
+def test_notes_bulk_update_checks_expected_version(client, user, category):
+    note = Note.objects.create(
+        title="Shared", content="", category=category, user=user
+    )
+    fresh = Note.objects.create(
+        title="Fresh", content="", category=category, user=user
+    )
+    note.title = "Edited elsewhere"
+    note.save()
+
+    response = post_bulk(
+        client,
+        {
+            "update": [
+                {"id": note.id, "title": "Offline", "expected_version": 1},
+                {"id": fresh.id, "title": "Synced", "expected_version": 1},
+                {"id": fresh.id, "expected_version": 1.5},
+            ]
+        },
+    )
+
+    payload = response.json()
+    errors = {error["index"]: error for error in payload["errors"]}
+    assert [note["version"] for note in payload["updated"]] == [2]
+    assert errors[0]["status"] == 409
+    assert errors[0]["version"] == 2
+    assert errors[2]["errors"] == {
+        "expected_version": ["Must be a positive integer."]
+    }
+    note.refresh_from_db()
+    fresh.refresh_from_db()
+    assert (note.title, note.version) == ("Edited elsewhere", 2)
+    assert (fresh.title, fresh.version) == ("Synced", 2)
+
+
+@pytest.mark.django_db
+def test_notes_bulk_update_increments_the_stored_version(
+    client, user, category
+):
+    note = Note.objects.create(
+        title="Raced", content="", category=category, user=user
+    )
+    Note.objects.filter(id=note.id).update(version=5)
+
+    response = post_bulk(client, {"update": [{"id": note.id, "title": "B"}]})
+
+    assert response.json()["updated"][0]["version"] == 6
+    note.refresh_from_db()
+    assert note.version == 6
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "body",
+    [
+        [],
+        "x",
+        {"title": 5, "category_id": 1},
+        {"content": ["x"], "category_id": 1},
+        {"title": "T" * (NOTE_TITLE_MAX_LENGTH + 1), "category_id": 1},
+        {"title": "Bad id", "category_id": [1]},
+    ],
+)
+def test_notes_collection_rejects_invalid_json_post(client, user, body):
+    response = client.post(
+        reverse("notes-collection"),
+        data=json.dumps(body),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid payload"
+    assert Note.objects.count() == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "body",
+    [
+        [],
+        {"title": 5},
+        {"content": {"text": "x"}},
+        {"title": "T" * (NOTE_TITLE_MAX_LENGTH + 1)},
+        {"category_id": "abc"},
+    ],
+)
+def test_note_patch_rejects_invalid_json_body(client, user, category, body):
+    note = Note.objects.create(
+        title="Kept", content="", category=category, user=user
+    )
+
+    response = client.patch(
+        reverse("note-detail", args=[note.id]),
+        data=json.dumps(body),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+    note.refresh_from_db()
+    assert note.title == "Kept"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("method", "url_name"),
+    [
+        ("post", "notes-collection"),
+        ("post", "notes-bulk"),
+        ("patch", "note-detail"),
+    ],
+)
+def test_note_writes_reject_unparseable_json(
+    client, user, category, method, url_name
+):
+    note = Note.objects.create(
+        title="Kept", content="", category=category, user=user
+    )
+    url = reverse(
+        url_name, args=[note.id] if url_name == "note-detail" else []
+    )
+
+    response = getattr(client, method)(
+        url, data='{"create": [{"title": "Cut', content_type="application/json"
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid JSON"}
+    assert list(Note.objects.values_list("title", flat=True)) == ["Kept"]
+
+
+@pytest.mark.django_db
+def test_note_patch_treats_empty_category_id_as_unchanged(
+    client, user, category
+):
+    note = Note.objects.create(
+        title="Kept", content="", category=category, user=user
+    )
+
+    response = client.patch(
+        reverse("note-detail", args=[note.id]),
+        data=json.dumps({"title": "Renamed", "category_id": ""}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+    assert response.json()["category"]["id"] == category.id
+
+
+@pytest.mark.django_db
+def test_notes_bulk_reports_too_long_titles_per_item(client, user, category):
+    note = Note.objects.create(
+        title="Short", content="", category=category, user=user
+    )
+    too_long = "T" * (NOTE_TITLE_MAX_LENGTH + 1)
+
+    response = post_bulk(
+        client,
+        {
+            "create": [
+                {"title": too_long, "category_id": category.id},
+                {"title": "Fits", "category_id": category.id},
+            ],
+            "update": [{"id": note.id, "title": too_long}],
+        },
+    )
+
+    payload = response.json()
+    assert response.status_code == 200
+    assert [note["title"] for note in payload["created"]] == ["Fits"]
+    assert [
+        (error["operation"], error["index"], error["errors"])
+        for error in payload["errors"]
+    ] == [
+        ("create", 0, {"title": ["At most 180 characters."]}),
+        ("update", 0, {"title": ["At most 180 characters."]}),
+    ]
@@ -0,0 +1,185 @@
+import base64
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from api.models import Note, NoteTombstone
+from api.services.note_sync_service import (
+    NOTE_SYNC_WINDOW,
+    encode_sync_token,
+    prune_note_tombstones,
+)
+
+
+def backdate(*notes):
+    # Moves notes out of the window that every sync returns again.
+    Note.objects.filter(id__in=[note.id for note in notes]).update(
+        edited_at=timezone.now() - 2 * NOTE_SYNC_WINDOW
+    )
+    NoteTombstone.objects.update(
+        deleted_at=timezone.now() - 2 * NOTE_SYNC_WINDOW
+    )
+
+
+def get_changes(client, since=None):
+    params = {"since": since} if since else {}
+    return client.get(reverse("notes-changes"), params).json()
+
+
+@pytest.mark.django_db
+def test_notes_changes_requires_authentication(client):
+    response = client.get(reverse("notes-changes"))
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_notes_changes_without_token_returns_everything(
+    client, user, create_note
+):
+    note = create_note(user, "Existing")
+
+    payload = get_changes(client)
+
+    assert [item["id"] for item in payload["notes"]] == [note.id]
+    assert payload["deleted_ids"] == []
+    assert payload["next_since"]
+    assert payload["full_resync"] is True
+
+
+@pytest.mark.django_db
+def test_notes_changes_returns_only_changes_since_token(
+    client, user, create_note
+):
+    untouched = create_note(user, "Untouched")
+    edited = create_note(user, "Edited")
+    deleted = create_note(user, "Deleted")
+    backdate(untouched, edited, deleted)
+    token = get_changes(client)["next_since"]
+
+    edited.title = "Edited again"
+    edited.save()
+    created = create_note(user, "Created")
+    deleted_id = deleted.id
+    deleted.delete()
+
+    payload = get_changes(client, token)
+
+    ids = {item["id"] for item in payload["notes"]}
+    assert ids == {edited.id, created.id}
+    assert untouched.id not in ids
+    assert payload["deleted_ids"] == [deleted_id]
+    assert payload["full_resync"] is False
+
+    backdate(edited, created)
+    later = get_changes(client, payload["next_since"])
+
+    assert later["notes"] == []
+    assert later["deleted_ids"] == []
+
+
+@pytest.mark.django_db
+def test_notes_changes_returns_writes_committed_after_the_sync(
+    client, user, create_note
+):
+    token = get_changes(client)["next_since"]
+    # Stamped before the sync above read the notes, committed after it.
+    late = create_note(user, "Late commit")
+    Note.objects.filter(id=late.id).update(
+        edited_at=timezone.now() - NOTE_SYNC_WINDOW / 2
+    )
+
+    payload = get_changes(client, token)
+
+    assert [item["id"] for item in payload["notes"]] == [late.id]
+
+
+@pytest.mark.django_db
+def test_notes_changes_only_includes_own_notes(client, user, create_note):
+    user_model = get_user_model()
+    other = user_model.objects.create_user("other", password="strong-pass")
+    token = get_changes(client)["next_since"]
+
+    create_note(other, "Not mine").delete()
+    create_note(other, "Also not mine")
+
+    payload = get_changes(client, token)
+    assert payload["notes"] == []
+    assert payload["deleted_ids"] == []
+
+
+@pytest.mark.django_db
+def test_notes_changes_resyncs_tokens_older_than_tombstone_retention(
+    client, user, create_note, settings
+):
+    settings.NOTE_TOMBSTONE_RETENTION_DAYS = 7
+    kept = create_note(user, "Kept")
+    create_note(user, "Deleted").delete()
+    NoteTombstone.objects.update(deleted_at=timezone.now() - timedelta(8))
+    token = encode_sync_token(timezone.now() - timedelta(days=8))
+
+    assert prune_note_tombstones() == 1
+    payload = get_changes(client, token)
+
+    assert payload["full_resync"] is True
+    assert [item["id"] for item in payload["notes"]] == [kept.id]
+    assert payload["deleted_ids"] == []
+
+
+@pytest.mark.django_db
+def test_prune_note_tombstones_keeps_the_retention_window(
+    client, user, create_note, settings
+):
+    settings.NOTE_TOMBSTONE_RETENTION_DAYS = 7
+    create_note(user, "Old").delete()
+    NoteTombstone.objects.update(deleted_at=timezone.now() - timedelta(8))
+    recent = create_note(user, "Recent")
+    recent_id = recent.id
+    recent.delete()
+
+    assert prune_note_tombstones() == 1
+    payload = get_changes(
+        client, encode_sync_token(timezone.now() - timedelta(days=6))
+    )
+
+    assert payload["full_resync"] is False
+    assert payload["deleted_ids"] == [recent_id]
+
+
+@pytest.mark.django_db
+def test_queryset_delete_records_tombstones(user, create_note):
+    create_note(user, "One")
+    create_note(user, "Two")
+
+    Note.objects.filter(user=user).delete()
+
+    assert NoteTombstone.objects.filter(user=user).count() == 2
+
+
+@pytest.mark.django_db
+def test_deleting_user_does_not_record_tombstones(user, create_note):
+    create_note(user, "Gone with the account")
+
+    user.delete()
+
+    assert NoteTombstone.objects.count() == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not-base64!",
+        base64.urlsafe_b64encode(b"yesterday").decode(),
+        base64.urlsafe_b64encode(b"2026-01-01T00:00:00").decode(),
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    ],
+)
+def test_notes_changes_rejects_invalid_token(client, user, token):
+    response = client.get(reverse("notes-changes"), {"since": token})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid sync token"
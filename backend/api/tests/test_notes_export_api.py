@@ -0,0 +1,115 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from api.http import fast_json
+
+pytestmark = pytest.mark.usefixtures("api_views")
+
+
+def read_stream(response):
+    if not response.is_async:
+        return b"".join(response.streaming_content)
+
+    async def consume():
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    return async_to_sync(consume)()
+
+
+@pytest.mark.django_db
+def test_notes_export_requires_authentication(client):
+    response = client.get(reverse("notes-export"))
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_notes_export_streams_ndjson_by_default(
+    client, user, api_views, create_note
+):
+    other_user = get_user_model().objects.create_user(
+        "other", password="strong-pass"
+    )
+    first = create_note(user, "First")
+    second = create_note(user, "Second")
+    create_note(other_user, "Private")
+
+    response = client.get(reverse("notes-export"))
+
+    assert response.status_code == 200
+    assert response.streaming
+    # Under ASGI a sync iterator would be consumed whole into memory.
+    assert response.is_async == (api_views == "async")
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response["Content-Disposition"] == (
+        'attachment; filename="notes.ndjson"'
+    )
+    lines = read_stream(response).splitlines()
+    exported = [fast_json.loads(line) for line in lines]
+    assert [note["id"] for note in exported] == [first.id, second.id]
+    assert exported[0]["content"] == "content"
+    assert exported[0]["version"] == 1
+
+
+@pytest.mark.django_db
+def test_notes_export_streams_json_array(client, user, create_note):
+    notes = [create_note(user, f"Note {index}") for index in range(3)]
+
+    response = client.get(reverse("notes-export"), {"format": "json"})
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    exported = fast_json.loads(read_stream(response))
+    assert [note["id"] for note in exported] == [note.id for note in notes]
+
+
+@pytest.mark.django_db
+def test_notes_export_of_empty_account(client, user):
+    ndjson = client.get(reverse("notes-export"))
+    json_array = client.get(reverse("notes-export"), {"format": "json"})
+
+    assert read_stream(ndjson) == b""
+    assert read_stream(json_array) == b"[]"
+
+
+@pytest.mark.django_db
+def test_notes_export_rejects_unknown_format(client, user):
+    response = client.get(reverse("notes-export"), {"format": "xml"})
+
+    assert response.status_code == 400
+    assert "format" in response.json()["errors"]
+
+
+def test_stream_helpers_buffer_small_items(monkeypatch):
+    monkeypatch.setattr(fast_json, "STREAM_BUFFER_SIZE", 16)
+    items = [{"id": index} for index in range(10)]
+
+    ndjson_chunks = list(fast_json.iter_ndjson(items))
+    array_chunks = list(fast_json.iter_json_array(items))
+
+    assert len(ndjson_chunks) > 1
+    assert all(len(chunk) < 16 + 10 for chunk in ndjson_chunks)
+    lines = b"".join(ndjson_chunks).splitlines()
+    assert [fast_json.loads(line) for line in lines] == items
+    assert fast_json.loads(b"".join(array_chunks)) == items
+
+
+def test_async_stream_helpers_buffer_small_items(monkeypatch):
+    monkeypatch.setattr(fast_json, "STREAM_BUFFER_SIZE", 16)
+    items = [{"id": index} for index in range(10)]
+
+    async def aitems():
+        for item in items:
+            yield item
+
+    async def collect(chunks):
+        return [chunk async for chunk in chunks]
+
+    ndjson_chunks = async_to_sync(collect)(fast_json.aiter_ndjson(aitems()))
+    array_chunks = async_to_sync(collect)(fast_json.aiter_json_array(aitems()))
+
+    assert len(ndjson_chunks) > 1
+    assert ndjson_chunks == list(fast_json.iter_ndjson(items))
+    assert array_chunks == list(fast_json.iter_json_array(items))
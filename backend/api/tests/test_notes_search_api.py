@@ -0,0 +1,143 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from api.services.note_search_service import (
+    build_note_search_expression,
+    build_note_tsquery,
+)
+
+
+@pytest.mark.django_db
+def test_notes_search_requires_authentication(client):
+    response = client.get(reverse("notes-search"), {"q": "anything"})
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_notes_search_ranks_matches_and_highlights_snippet(
+    client, user, create_note
+):
+    weak = create_note(user, "Groceries", "buy apples and milk")
+    strong = create_note(user, "Apples", "apples apples apples")
+    create_note(user, "Unrelated", "nothing to see here")
+
+    response = client.get(reverse("notes-search"), {"q": "apples"})
+
+    assert response.status_code == 200
+    notes = response.json()["notes"]
+    assert [note["id"] for note in notes] == [strong.id, weak.id]
+    assert "<mark>apples</mark>" in notes[1]["snippet"]
+    assert "content" not in notes[0]
+
+
+@pytest.mark.django_db
+def test_notes_search_escapes_note_html_in_snippets(client, user, create_note):
+    create_note(user, "Imported", 'x <img src=x onerror="alert(1)"> x')
+    create_note(user, "<b>alert</b>", "plain")
+
+    response = client.get(reverse("notes-search"), {"q": "alert"})
+
+    # PostgreSQL's parser treats tags as single tokens, so whether the
+    # attribute matches differs by backend; neither may return raw HTML.
+    snippets = [note["snippet"] for note in response.json()["notes"]]
+    assert "<mark>alert</mark>" in snippets[0]
+    for snippet in snippets:
+        text = snippet.replace("<mark>", "").replace("</mark>", "")
+        assert "<" not in text
+        assert ">" not in text
+
+
+@pytest.mark.django_db
+def test_notes_search_only_returns_own_notes(client, user, create_note):
+    user_model = get_user_model()
+    other = user_model.objects.create_user("other", password="strong-pass")
+    create_note(other, "Secret", "shared keyword")
+    own = create_note(user, "Mine", "shared keyword")
+
+    response = client.get(reverse("notes-search"), {"q": "keyword"})
+
+    assert [note["id"] for note in response.json()["notes"]] == [own.id]
+
+
+@pytest.mark.django_db
+def test_notes_search_does_not_match_owner_tokens(client, user, create_note):
+    create_note(user, "Plain", "nothing to see here")
+    mentioned = create_note(user, "Mention", f"ticket u{user.id}")
+
+    response = client.get(reverse("notes-search"), {"q": f"u{user.id}"})
+
+    assert [note["id"] for note in response.json()["notes"]] == [mentioned.id]
+
+
+@pytest.mark.django_db
+def test_notes_search_tracks_note_updates_and_deletes(
+    client, user, create_note
+):
+    note = create_note(user, "Draft", "old words")
+    note.content = "fresh words"
+    note.save()
+
+    assert client.get(reverse("notes-search"), {"q": "old"}).json() == {
+        "notes": []
+    }
+    found = client.get(reverse("notes-search"), {"q": "fresh"}).json()
+    assert [item["id"] for item in found["notes"]] == [note.id]
+
+    note.delete()
+
+    assert client.get(reverse("notes-search"), {"q": "fresh"}).json() == {
+        "notes": []
+    }
+
+
+@pytest.mark.django_db
+def test_notes_search_matches_last_term_as_prefix(client, user, create_note):
+    note = create_note(user, "Algebra", "linear transformations")
+
+    response = client.get(reverse("notes-search"), {"q": "linear transf"})
+
+    assert [item["id"] for item in response.json()["notes"]] == [note.id]
+
+
+@pytest.mark.django_db
+def test_notes_search_respects_limit(client, user, create_note):
+    for index in range(3):
+        create_note(user, f"Topic {index}", "repeated topic")
+
+    response = client.get(reverse("notes-search"), {"q": "topic", "limit": 2})
+
+    assert len(response.json()["notes"]) == 2
+
+
+@pytest.mark.django_db
+def test_notes_search_ignores_query_without_words(client, user, create_note):
+    create_note(user, "Symbols", "plain text")
+
+    response = client.get(reverse("notes-search"), {"q": "?! -"})
+
+    assert response.status_code == 200
+    assert response.json() == {"notes": []}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"q": "   "}, {"q": "x", "limit": "0"}, {"q": "x", "limit": "x"}],
+)
+def test_notes_search_rejects_invalid_query(client, user, params):
+    response = client.get(reverse("notes-search"), params)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid query"
+
+
+def test_build_note_search_expression_quotes_terms():
+    assert build_note_search_expression('say "hi" NEAR(x') == (
+        '"say" "hi" "NEAR" "x"*'
+    )
+
+
+def test_build_note_tsquery_quotes_terms():
+    assert build_note_tsquery("say 'hi' & !x") == ("'say' & 'hi' & 'x':*")
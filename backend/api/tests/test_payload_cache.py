@@ -0,0 +1,220 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+
+from api.cache import payload_cache
+from api.cache.note_cache import (
+    bump_shared_note_cache_version,
+    get_notes_payload_cache_key,
+    get_user_note_cache_version_key,
+)
+from api.cache.payload_cache import (
+    LocalCache,
+    aget_payload,
+    aset_payload,
+    get_payload,
+    local_payloads,
+    set_payload,
+)
+from api.models import Category, Note
+from api.views import note as note_views
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(payload_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def fail_if_called(*args, **kwargs):
+    raise AssertionError("Expected a local cache hit.")
+
+
+def test_local_cache_expires_entries_after_ttl(clock):
+    local = LocalCache(max_entries=10, ttl_seconds=30)
+    local.set("long", "value")
+    local.set("short", "value", ttl_seconds=5)
+
+    clock[0] += 10
+    assert local.get("short") is None
+    assert local.get("long") == "value"
+
+    clock[0] += 30
+    assert local.get("long") is None
+
+
+def test_local_cache_evicts_least_recently_used_entry():
+    local = LocalCache(max_entries=2, ttl_seconds=30)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+
+    assert local.get("b") is None
+    assert local.get("a") == 1
+    assert local.get("c") == 3
+
+
+def test_local_cache_drops_expired_entries_on_set(clock):
+    local = LocalCache(max_entries=10, ttl_seconds=30)
+    local.set("old", "value")
+    clock[0] += 31
+
+    local.set("new", "value")
+
+    assert list(local._entries) == ["new"]
+
+
+def test_get_payload_serves_local_hits_without_shared_cache(monkeypatch):
+    set_payload("payload", (1, 1), {"notes": []}, 60)
+    monkeypatch.setattr(cache, "get", fail_if_called)
+
+    assert get_payload("payload", (1, 1)) == ((1, 1), {"notes": []})
+
+
+def test_get_payload_fills_local_tier_from_shared_cache(monkeypatch):
+    cache.set("payload", {"versions": [1, 1], "payload": {"notes": []}})
+
+    assert get_payload("payload", (1, 1)) == ((1, 1), {"notes": []})
+    assert local_payloads.get("payload:v:1:s:1") == {"notes": []}
+    assert get_payload("payload", (2, 1)) == ((2, 1), None)
+
+
+def test_async_payload_helpers_use_local_tier(monkeypatch):
+    cache.set("payload", {"versions": [1, 1], "payload": {"categories": []}})
+
+    async def exercise():
+        shared = await aget_payload("payload", (1, 1))
+        await aset_payload("payload", (1, 2), {"notes": []}, 60)
+        monkeypatch.setattr(cache, "aget", fail_if_called)
+        return shared, await aget_payload("payload", (1, 2))
+
+    assert async_to_sync(exercise)() == (
+        ((1, 1), {"categories": []}),
+        ((1, 2), {"notes": []}),
+    )
+    assert cache.get("payload") == {
+        "versions": [1, 2],
+        "payload": {"notes": []},
+    }
+
+
+def test_payload_rebuild_after_shared_change_is_claimed_once():
+    set_payload("payload", (1, 1), {"notes": []}, 60)
+
+    claimed = get_payload("payload", (1, 2))
+    waiting = get_payload("payload", (1, 2))
+    awaiting = async_to_sync(aget_payload)("payload", (1, 2))
+    own_change = get_payload("payload", (2, 2))
+
+    assert claimed == ((1, 2), None)
+    assert waiting == ((1, 1), {"notes": []})
+    assert awaiting == ((1, 1), {"notes": []})
+    assert own_change == ((2, 2), None)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("api_views")
+def test_version_bump_by_another_worker_bypasses_local_tier(client):
+    user = get_user_model().objects.create_user(
+        "coherent", password="strong-pass"
+    )
+    client.force_login(user)
+    note = Note.objects.create(
+        title="Before",
+        content="content",
+        category=Category.objects.get(name=Category.DEFAULTS[0]["name"]),
+        user=user,
+    )
+    client.get(reverse("notes-collection"))
+
+    # Another worker writes and bumps the shared version; this process's
+    # local tier still holds the old payload.
+    Note.objects.filter(id=note.id).update(title="After")
+    cache.incr(get_user_note_cache_version_key(user.id))
+
+    response = client.get(reverse("notes-collection"))
+
+    assert response.json()["notes"][0]["title"] == "After"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("api_views")
+def test_stale_notes_are_served_while_another_request_rebuilds(
+    client, monkeypatch
+):
+    user = get_user_model().objects.create_user(
+        "waiting", password="strong-pass"
+    )
+    client.force_login(user)
+    first = client.get(reverse("notes-collection"))
+    bump_shared_note_cache_version()
+    monkeypatch.setattr(payload_cache, "claim_rebuild", lambda key: False)
+
+    async def lost_claim(key):
+        return False
+
+    monkeypatch.setattr(payload_cache, "aclaim_rebuild", lost_claim)
+
+    stale = client.get(reverse("notes-collection"))
+    revalidated = client.get(
+        reverse("notes-collection"), HTTP_IF_NONE_MATCH=first["ETag"]
+    )
+
+    assert stale.json() == first.json()
+    assert stale["ETag"] == first["ETag"]
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("api_views")
+def test_one_request_rebuilds_notes_after_a_shared_change(client):
+    user = get_user_model().objects.create_user("herd", password="strong-pass")
+    client.force_login(user)
+    first = client.get(reverse("notes-collection"))
+    bump_shared_note_cache_version()
+
+    rebuilding = client.get(reverse("notes-collection"))
+    rebuilt = client.get(reverse("notes-collection"))
+
+    assert rebuilding["ETag"] != first["ETag"]
+    assert rebuilt["ETag"] == rebuilding["ETag"]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("api_views")
+def test_only_note_pages_are_kept_in_the_local_tier(client, user, create_note):
+    create_note(user)
+
+    client.get(reverse("notes-collection"))
+    local_keys = list(local_payloads._entries)
+    client.get(reverse("notes-collection"), {"limit": 10})
+
+    assert local_keys == []
+    assert len(local_payloads._entries) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("api_views")
+def test_long_note_lists_are_not_cached(
+    client, user, create_note, monkeypatch
+):
+    monkeypatch.setattr(note_views, "NOTE_CACHE_MAX_NOTES", 1)
+    create_note(user, "First")
+    create_note(user, "Second")
+
+    client.get(reverse("notes-collection"))
+    client.get(reverse("notes-collection"), {"limit": 1})
+
+    def cached(limit):
+        return cache.get(
+            get_notes_payload_cache_key(
+                user_id=user.id, limit=limit, cursor=None, summary=False
+            )
+        )
+
+    assert cached(None) is None
+    assert cached(1) is not None
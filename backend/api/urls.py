@@ -1,17 +1,44 @@
+from django.conf import settings
 from django.urls import path
 
 from api import views
 
-urlpatterns = [
-    path("health/", views.health_check, name="health-check"),
-    path("auth/csrf/", views.csrf_cookie, name="csrf-cookie"),
-    path("auth/login/", views.APILoginView.as_view(), name="auth-login"),
-    path("auth/signup/", views.signup, name="auth-signup"),
-    path(
-        "categories/",
-        views.categories_collection,
-        name="categories-collection",
-    ),
-    path("notes/", views.notes_collection, name="notes-collection"),
-    path("notes/<int:note_id>/", views.note_detail, name="note-detail"),
-]
+
+def build_urlpatterns(async_views: bool) -> list:
+    """
+    Returns the API routes. With async_views the notes, export and
+    categories endpoints are served by their async variants, which avoid
+    a thread hop per request under ASGI but add one under WSGI.
+    """
+    if async_views:
+        categories_collection = views.acategories_collection
+        notes_collection = views.anotes_collection
+        note_detail = views.anote_detail
+        notes_export = views.anotes_export
+    else:
+        categories_collection = views.categories_collection
+        notes_collection = views.notes_collection
+        note_detail = views.note_detail
+        notes_export = views.notes_export
+
+    return [
+        path("health/", views.health_check, name="health-check"),
+        path("auth/csrf/", views.csrf_cookie, name="csrf-cookie"),
+        path("auth/login/", views.APILoginView.as_view(), name="auth-login"),
+        path("auth/signup/", views.signup, name="auth-signup"),
+        path("cache/stats/", views.cache_stats, name="cache-stats"),
+        path(
+            "categories/",
+            categories_collection,
+            name="categories-collection",
+        ),
+        path("notes/", notes_collection, name="notes-collection"),
+        path("notes/bulk/", views.notes_bulk, name="notes-bulk"),
+        path("notes/search/", views.notes_search, name="notes-search"),
+        path("notes/changes/", views.notes_changes, name="notes-changes"),
+        path("notes/export/", notes_export, name="notes-export"),
+        path("notes/<int:note_id>/", note_detail, name="note-detail"),
+    ]
+
+
+urlpatterns = build_urlpatterns(settings.API_ASYNC_VIEWS)
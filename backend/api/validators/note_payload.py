@@ -1,18 +1,41 @@
-import json
+from datetime import UTC
 
 from django.http import QueryDict
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.http import fast_json
+
+NOTE_BULK_MAX_ITEMS = 500
+NOTE_CONTENT_DELTA_MAX_OPERATIONS = 1000
+NOTE_TITLE_MAX_LENGTH = 180
+CATEGORY_NAME_MAX_LENGTH = 120
+CATEGORY_COLOR_MAX_LENGTH = 7
+
+
+class InvalidJSONError(Exception):
+    pass
 
 
 def parse_request_data(request):
-    if request.method == "POST":
-        return request.POST
+    """
+    Returns the form or JSON data of the request body.
 
+    Raises:
+        InvalidJSONError: If a JSON body does not parse, so a truncated
+            request is rejected instead of being read as empty.
+    """
     content_type = request.content_type or ""
+    if request.method == "POST" and not content_type.startswith(
+        "application/json"
+    ):
+        return request.POST
+
     if content_type.startswith("application/json"):
         try:
-            return json.loads(request.body.decode("utf-8"))
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            return {}
+            return fast_json.loads(request.body)
+        except ValueError:
+            raise InvalidJSONError from None
 
     if content_type.startswith("application/x-www-form-urlencoded"):
         return QueryDict(request.body.decode("utf-8"))
@@ -20,16 +43,326 @@ def parse_request_data(request):
     return {}
 
 
-def validate_note_create_payload(data: dict) -> tuple[dict, dict]:
-    title = data.get("title", "").strip()
-    content = data.get("content", "").strip()
-    category_id = data.get("category_id")
-
+def _note_text_errors(data, required: bool) -> dict:
+    # Title and content must be strings (or absent, unless required) and
+    # the title must fit the column.
     errors = {}
+    for field in ("title", "content"):
+        value = data.get(field, "" if required else None)
+        if value is not None and not isinstance(value, str):
+            errors[field] = ["Must be a string."]
+    title = data.get("title")
+    if isinstance(title, str) and len(title.strip()) > NOTE_TITLE_MAX_LENGTH:
+        errors["title"] = [f"At most {NOTE_TITLE_MAX_LENGTH} characters."]
+    return errors
+
+
+def validate_note_create_payload(data) -> tuple[dict, dict]:
+    if not isinstance(data, dict):
+        return {}, {"non_field_errors": ["Must be a JSON object."]}
+
+    errors = _note_text_errors(data, required=True)
+    category_id = data.get("category_id")
     if category_id in (None, ""):
         errors["category_id"] = ["This field is required."]
+    elif _parse_id(category_id) is None:
+        errors["category_id"] = ["Must be a valid category id."]
 
-    return (
-        {"title": title, "content": content, "category_id": category_id},
-        errors,
+    if errors:
+        return {}, errors
+    return {
+        "title": data.get("title", "").strip(),
+        "content": data.get("content", "").strip(),
+        "category_id": _parse_id(category_id),
+    }, {}
+
+
+def validate_note_patch_payload(data) -> tuple[dict, dict]:
+    """
+    Checks the fields of a PATCH body. The precondition and content delta
+    are validated separately. Fields that are not sent, and an empty
+    category_id, are returned as None.
+    """
+    if not isinstance(data, dict):
+        return {}, {"non_field_errors": ["Must be a JSON object."]}
+
+    errors = _note_text_errors(data, required=False)
+    category_id = data.get("category_id")
+    if category_id in (None, ""):
+        category_id = None
+    elif _parse_id(category_id) is None:
+        errors["category_id"] = ["Must be a valid category id."]
+    else:
+        category_id = _parse_id(category_id)
+
+    if errors:
+        return {}, errors
+    return {
+        "title": data.get("title"),
+        "content": data.get("content"),
+        "category_id": category_id,
+    }, {}
+
+
+def _parse_id(value) -> int | None:
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_version(value) -> int | None:
+    # Unlike ids, versions are compared exactly: 1.5 is not version 1.
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def validate_note_version_precondition(
+    data, if_match: str | None
+) -> tuple[int | None, dict]:
+    """
+    Reads the note version a PATCH is based on, either from the
+    expected_version field or from an If-Match header holding a note
+    ETag ("<version>-<digest>"). Returns None when neither is sent.
+    """
+    raw_version = data.get("expected_version")
+    if raw_version in (None, "") and if_match and if_match.strip() != "*":
+        etag = if_match.split(",")[0].strip().removeprefix("W/").strip('"')
+        raw_version = etag.split("-")[0]
+
+    if raw_version in (None, ""):
+        return None, {}
+
+    version = _parse_version(raw_version)
+    if version is None or version < 1:
+        return None, {"expected_version": ["Must be a positive integer."]}
+    return version, {}
+
+
+def validate_note_content_delta(data) -> tuple[dict, dict]:
+    """
+    Validates the optional content_delta of a PATCH: a list of
+    [start, end, text] splices, sorted and non-overlapping. A delta must
+    be anchored to a known base, through expected_version / If-Match or
+    base_content_sha256, and cannot be combined with a full content.
+    """
+    delta = data.get("content_delta")
+    base_sha256 = data.get("base_content_sha256") or None
+    if delta is None:
+        return {"content_delta": None, "base_content_sha256": None}, {}
+
+    errors = {}
+    if data.get("content") is not None:
+        errors["content"] = ["Cannot be combined with content_delta."]
+    if base_sha256 is not None and not isinstance(base_sha256, str):
+        errors["base_content_sha256"] = ["Must be a string."]
+
+    position = 0
+    valid = (
+        isinstance(delta, list)
+        and len(delta) <= NOTE_CONTENT_DELTA_MAX_OPERATIONS
     )
+    for operation in delta if valid else []:
+        if not (
+            isinstance(operation, list)
+            and len(operation) == 3
+            and all(
+                isinstance(offset, int) and not isinstance(offset, bool)
+                for offset in operation[:2]
+            )
+            and isinstance(operation[2], str)
+            and position <= operation[0] <= operation[1]
+        ):
+            valid = False
+            break
+        position = operation[1]
+    if not valid:
+        errors["content_delta"] = [
+            (
+                "Must be a list of at most "
+                f"{NOTE_CONTENT_DELTA_MAX_OPERATIONS} sorted, "
+                "non-overlapping [start, end, text] operations."
+            )
+        ]
+
+    if errors:
+        return {}, errors
+    return {"content_delta": delta, "base_content_sha256": base_sha256}, {}
+
+
+def _validate_bulk_create_item(item) -> tuple[dict, dict]:
+    if not isinstance(item, dict):
+        return {}, {"non_field_errors": ["Must be an object."]}
+
+    errors = _note_text_errors(item, required=True)
+    category_id = _parse_id(item.get("category_id"))
+    if category_id is None:
+        errors["category_id"] = ["A valid category id is required."]
+
+    if errors:
+        return {}, errors
+    return {
+        "title": item.get("title", "").strip(),
+        "content": item.get("content", "").strip(),
+        "category_id": category_id,
+    }, {}
+
+
+def _validate_bulk_update_item(item) -> tuple[dict, dict]:
+    if not isinstance(item, dict):
+        return {}, {"non_field_errors": ["Must be an object."]}
+
+    errors = {}
+    note_id = _parse_id(item.get("id"))
+    if note_id is None:
+        errors["id"] = ["A valid note id is required."]
+
+    errors.update(_note_text_errors(item, required=False))
+
+    category_id = None
+    if item.get("category_id") is not None:
+        category_id = _parse_id(item["category_id"])
+        if category_id is None:
+            errors["category_id"] = ["Must be a valid category id."]
+
+    expected_version, version_errors = validate_note_version_precondition(
+        item, None
+    )
+    errors.update(version_errors)
+
+    if errors:
+        return {}, errors
+    return {
+        "id": note_id,
+        "title": item.get("title"),
+        "content": item.get("content"),
+        "category_id": category_id,
+        "expected_version": expected_version,
+    }, {}
+
+
+def validate_note_bulk_payload(data) -> tuple[dict, dict]:
+    """
+    Validates a bulk write payload of the form
+    {"create": [...], "update": [...]}.
+
+    Structural problems are reported as top-level errors. Problems with a
+    single item are collected in payload["item_errors"] so that the other
+    items can still be written.
+    """
+    if not isinstance(data, dict):
+        return {}, {"non_field_errors": ["Must be a JSON object."]}
+
+    errors = {}
+    operations = {}
+    for operation in ("create", "update"):
+        items = data.get(operation, [])
+        if not isinstance(items, list):
+            errors[operation] = ["Must be a list."]
+        operations[operation] = items
+
+    if errors:
+        return {}, errors
+
+    if len(operations["create"]) + len(operations["update"]) > (
+        NOTE_BULK_MAX_ITEMS
+    ):
+        return {}, {
+            "non_field_errors": [
+                f"At most {NOTE_BULK_MAX_ITEMS} items per request."
+            ]
+        }
+
+    validators = {
+        "create": _validate_bulk_create_item,
+        "update": _validate_bulk_update_item,
+    }
+    payload = {"create": [], "update": [], "item_errors": []}
+    for operation, validate_item in validators.items():
+        for index, item in enumerate(operations[operation]):
+            cleaned, item_errors = validate_item(item)
+            if item_errors:
+                payload["item_errors"].append(
+                    {
+                        "operation": operation,
+                        "index": index,
+                        "errors": item_errors,
+                    }
+                )
+            else:
+                payload[operation].append({"index": index, **cleaned})
+
+    return payload, {}
+
+
+def validate_note_import_record(data) -> tuple[dict, dict]:
+    """
+    Validates one record of an NDJSON note import. Records use the
+    export format: title, content and a category given either by name
+    or as an object with a name and an optional color. The optional
+    username selects the owner when the import is not bound to a user,
+    and the optional created_at and edited_at keep the note's dates.
+    """
+    if not isinstance(data, dict):
+        return {}, {"non_field_errors": ["Must be a JSON object."]}
+
+    errors = {}
+    for field in ("title", "content"):
+        if not isinstance(data.get(field, ""), str):
+            errors[field] = ["Must be a string."]
+    if len(str(data.get("title", "")).strip()) > NOTE_TITLE_MAX_LENGTH:
+        errors["title"] = [f"At most {NOTE_TITLE_MAX_LENGTH} characters."]
+
+    category = data.get("category")
+    if not isinstance(category, dict):
+        category = {"name": category}
+    category_name = category.get("name")
+    category_color = category.get("color")
+    if not (
+        isinstance(category_name, str)
+        and 0 < len(category_name.strip()) <= CATEGORY_NAME_MAX_LENGTH
+    ):
+        errors["category"] = ["A category name is required."]
+    elif category_color is not None and not (
+        isinstance(category_color, str)
+        and len(category_color) <= CATEGORY_COLOR_MAX_LENGTH
+    ):
+        errors["category"] = ["Color must be a hex color string."]
+
+    username = data.get("username")
+    if username is not None and not isinstance(username, str):
+        errors["username"] = ["Must be a string."]
+
+    timestamps = {}
+    for field in ("created_at", "edited_at"):
+        timestamps[field] = _parse_timestamp(data.get(field))
+        if data.get(field) is not None and timestamps[field] is None:
+            errors[field] = ["Must be an ISO 8601 datetime."]
+
+    if errors:
+        return {}, errors
+    return {
+        "title": data.get("title", "").strip(),
+        "content": data.get("content", "").strip(),
+        "category_name": category_name.strip(),
+        "category_color": category_color,
+        "username": username,
+        **timestamps,
+    }, {}
+
+
+def _parse_timestamp(value):
+    if not isinstance(value, str):
+        return None
+    try:
+        moment = parse_datetime(value)
+    except ValueError:
+        return None
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, UTC)
+    return moment
@@ -0,0 +1,71 @@
+NOTES_PAGE_DEFAULT_LIMIT = 50
+NOTES_PAGE_MAX_LIMIT = 200
+NOTE_LIST_FIELDS = ("full", "summary")
+NOTE_SEARCH_DEFAULT_LIMIT = 20
+NOTE_SEARCH_MAX_LIMIT = 100
+NOTE_EXPORT_FORMATS = ("ndjson", "json")
+
+
+def validate_note_list_query(params) -> tuple[dict, dict]:
+    raw_limit = params.get("limit")
+    cursor = params.get("cursor") or None
+    fields = params.get("fields") or "full"
+
+    errors = {}
+    if fields not in NOTE_LIST_FIELDS:
+        errors["fields"] = [
+            f"Must be one of: {', '.join(NOTE_LIST_FIELDS)}."
+        ]
+
+    limit = None
+    if raw_limit not in (None, ""):
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= NOTES_PAGE_MAX_LIMIT:
+            errors["limit"] = [
+                f"Must be an integer between 1 and {NOTES_PAGE_MAX_LIMIT}."
+            ]
+    elif cursor is not None:
+        limit = NOTES_PAGE_DEFAULT_LIMIT
+
+    return {
+        "limit": limit,
+        "cursor": cursor,
+        "summary": fields == "summary",
+    }, errors
+
+
+def validate_note_search_query(params) -> tuple[dict, dict]:
+    query = params.get("q", "").strip()
+    raw_limit = params.get("limit")
+
+    errors = {}
+    if not query:
+        errors["q"] = ["This field is required."]
+
+    limit = NOTE_SEARCH_DEFAULT_LIMIT
+    if raw_limit not in (None, ""):
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= NOTE_SEARCH_MAX_LIMIT:
+            errors["limit"] = [
+                f"Must be an integer between 1 and {NOTE_SEARCH_MAX_LIMIT}."
+            ]
+
+    return {"q": query, "limit": limit}, errors
+
+
+def validate_note_export_query(params) -> tuple[dict, dict]:
+    export_format = params.get("format") or "ndjson"
+
+    errors = {}
+    if export_format not in NOTE_EXPORT_FORMATS:
+        errors["format"] = [
+            f"Must be one of: {', '.join(NOTE_EXPORT_FORMATS)}."
+        ]
+
+    return {"format": export_format}, errors
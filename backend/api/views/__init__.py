@@ -1,17 +1,37 @@
 from api.views.auth import APILoginView as APILoginView
 from api.views.auth import csrf_cookie as csrf_cookie
 from api.views.auth import signup as signup
+from api.views.cache_stats import cache_stats as cache_stats
+from api.views.category import (
+    acategories_collection as acategories_collection,
+)
 from api.views.category import categories_collection as categories_collection
 from api.views.health import health_check as health_check
+from api.views.note import anote_detail as anote_detail
+from api.views.note import anotes_collection as anotes_collection
+from api.views.note import anotes_export as anotes_export
 from api.views.note import note_detail as note_detail
+from api.views.note import notes_bulk as notes_bulk
+from api.views.note import notes_changes as notes_changes
 from api.views.note import notes_collection as notes_collection
+from api.views.note import notes_export as notes_export
+from api.views.note import notes_search as notes_search
 
 __all__ = [
     "APILoginView",
-    "csrf_cookie",
-    "signup",
+    "acategories_collection",
+    "anote_detail",
+    "anotes_collection",
+    "anotes_export",
+    "cache_stats",
     "categories_collection",
+    "csrf_cookie",
     "health_check",
-    "notes_collection",
     "note_detail",
+    "notes_bulk",
+    "notes_changes",
+    "notes_collection",
+    "notes_export",
+    "notes_search",
+    "signup",
 ]
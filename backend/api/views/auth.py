@@ -1,9 +1,11 @@
 from django.contrib.auth import login
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.views import LoginView
-from django.http import HttpResponseNotAllowed, JsonResponse
+from django.http import HttpResponseNotAllowed
 from django.views.decorators.csrf import ensure_csrf_cookie
 
+from api.http.fast_json import JsonResponse
+
 
 @ensure_csrf_cookie
 def csrf_cookie(request):
@@ -0,0 +1,15 @@
+from django.views.decorators.http import require_GET
+
+from api.cache.cache_stats import get_cache_hit_rates
+from api.http.fast_json import JsonResponse
+
+
+@require_GET
+def cache_stats(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required"}, status=401)
+    if not request.user.is_staff:
+        return JsonResponse({"detail": "Staff only"}, status=403)
+
+    # Counters are kept per worker process.
+    return JsonResponse({"caches": get_cache_hit_rates()})
@@ -1,28 +1,59 @@
-from django.core.cache import cache
-from django.http import JsonResponse
-from django.views.decorators.http import require_GET
+from django.views.decorators.http import condition, require_GET
 
+from api.cache.cache_stats import record_cache_lookup
 from api.cache.category_cache import (
-    CATEGORY_CACHE_TTL_SECONDS,
-    get_categories_payload_cache_key,
+    aset_cached_categories,
+    set_cached_categories,
+)
+from api.http.fast_json import JsonResponse
+from api.serializers.category_serializer import serialize_categories_list
+from api.services.category_service import (
+    alist_categories_for_user,
+    list_categories_for_user,
+)
+from api.views.conditional import (
+    acached_categories,
+    acategories_collection_etag,
+    async_condition,
+    cached_categories,
+    categories_collection_etag,
 )
-from api.serializers.category_serializer import serialize_category
-from api.services.category_service import list_categories_for_user
 
 
 @require_GET
+@condition(etag_func=categories_collection_etag)
 def categories_collection(request):
     if not request.user.is_authenticated:
         return JsonResponse({"detail": "Authentication required"}, status=401)
 
-    cache_key = get_categories_payload_cache_key(user_id=request.user.id)
-    cached_payload = cache.get(cache_key)
+    versions, cached_payload = cached_categories(request)
+    record_cache_lookup("categories", hit=cached_payload is not None)
     if cached_payload is not None:
         return JsonResponse(cached_payload)
 
     categories = list_categories_for_user(request.user)
-    payload = {
-        "categories": [serialize_category(category) for category in categories]
-    }
-    cache.set(cache_key, payload, CATEGORY_CACHE_TTL_SECONDS)
+    payload = serialize_categories_list(categories)
+    set_cached_categories(
+        user_id=request.user.id, versions=versions, payload=payload
+    )
+    return JsonResponse(payload)
+
+
+@require_GET
+@async_condition(etag_func=acategories_collection_etag)
+async def acategories_collection(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required"}, status=401)
+
+    versions, cached_payload = await acached_categories(request, user)
+    record_cache_lookup("categories", hit=cached_payload is not None)
+    if cached_payload is not None:
+        return JsonResponse(cached_payload)
+
+    categories = await alist_categories_for_user(user)
+    payload = serialize_categories_list(categories)
+    await aset_cached_categories(
+        user_id=user.id, versions=versions, payload=payload
+    )
     return JsonResponse(payload)
@@ -0,0 +1,192 @@
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from api.cache.category_cache import (
+    aget_cached_categories,
+    get_cached_categories,
+)
+from api.cache.note_cache import (
+    aget_note_cache_versions,
+    cache_notes_payload_locally,
+    get_note_cache_versions,
+    get_notes_payload_cache_key,
+)
+from api.cache.payload_cache import aget_payload, get_payload
+from api.db_router import replica_reads
+from api.models import Note
+from api.validators.note_query import validate_note_list_query
+
+
+def _digest(*parts) -> str:
+    raw = ":".join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def cached_notes(request, query):
+    """
+    Returns the note cache versions and cached payload of the request's
+    notes list (see get_payload), read once per request and shared by
+    the ETag and the view.
+    """
+    if not hasattr(request, "_cached_notes"):
+        request._cached_notes = get_payload(
+            get_notes_payload_cache_key(user_id=request.user.id, **query),
+            get_note_cache_versions(user_id=request.user.id),
+            local=cache_notes_payload_locally(query["limit"]),
+        )
+    return request._cached_notes
+
+
+async def acached_notes(request, user, query):
+    if not hasattr(request, "_cached_notes"):
+        request._cached_notes = await aget_payload(
+            get_notes_payload_cache_key(user_id=user.id, **query),
+            await aget_note_cache_versions(user_id=user.id),
+            local=cache_notes_payload_locally(query["limit"]),
+        )
+    return request._cached_notes
+
+
+def cached_categories(request):
+    """
+    Returns the category cache versions and cached payload of the
+    request's user (see get_cached_categories), read once per request
+    and shared by the ETag and the view.
+    """
+    if not hasattr(request, "_cached_categories"):
+        request._cached_categories = get_cached_categories(
+            user_id=request.user.id
+        )
+    return request._cached_categories
+
+
+async def acached_categories(request, user):
+    if not hasattr(request, "_cached_categories"):
+        request._cached_categories = await aget_cached_categories(
+            user_id=user.id
+        )
+    return request._cached_categories
+
+
+def notes_collection_etag(request):
+    if request.method != "GET" or not request.user.is_authenticated:
+        return None
+
+    query, errors = validate_note_list_query(request.GET)
+    if errors:
+        return None
+    versions, _ = cached_notes(request, query)
+    key = get_notes_payload_cache_key(user_id=request.user.id, **query)
+    return _digest("notes", key, *versions)
+
+
+async def anotes_collection_etag(request):
+    user = await request.auser()
+    if request.method != "GET" or not user.is_authenticated:
+        return None
+
+    query, errors = validate_note_list_query(request.GET)
+    if errors:
+        return None
+    versions, _ = await acached_notes(request, user, query)
+    key = get_notes_payload_cache_key(user_id=user.id, **query)
+    return _digest("notes", key, *versions)
+
+
+def note_etag(note_id, version, category_id, category_name, category_color):
+    # The version prefix lets PATCH requests turn an If-Match header back
+    # into the note version they expect.
+    digest = _digest(note_id, category_id, category_name, category_color)
+    return f"{version}-{digest}"
+
+
+def _note_validators(request, note_id):
+    if not hasattr(request, "_note_validators"):
+        with replica_reads():
+            request._note_validators = (
+                Note.objects.filter(id=note_id, user=request.user)
+                .values_list(
+                    "version",
+                    "category_id",
+                    "category__name",
+                    "category__color",
+                )
+                .first()
+            )
+    return request._note_validators
+
+
+async def _anote_validators(request, note_id):
+    if not hasattr(request, "_note_validators"):
+        user = await request.auser()
+        with replica_reads():
+            request._note_validators = (
+                await Note.objects.filter(id=note_id, user=user)
+                .values_list(
+                    "version",
+                    "category_id",
+                    "category__name",
+                    "category__color",
+                )
+                .afirst()
+            )
+    return request._note_validators
+
+
+def note_detail_etag(request, note_id):
+    validators = _note_validators(request, note_id)
+    if validators is None:
+        return None
+    return note_etag(note_id, *validators)
+
+
+def categories_collection_etag(request):
+    if not request.user.is_authenticated:
+        return None
+    versions, _ = cached_categories(request)
+    return _digest("categories", request.user.id, *versions)
+
+
+async def anote_detail_etag(request, note_id):
+    validators = await _anote_validators(request, note_id)
+    if validators is None:
+        return None
+    return note_etag(note_id, *validators)
+
+
+async def acategories_collection_etag(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return None
+    versions, _ = await acached_categories(request, user)
+    return _digest("categories", user.id, *versions)
+
+
+def async_condition(etag_func):
+    """
+    Async counterpart of django.views.decorators.http.condition (ETag
+    only), whose async branch still calls the validator functions
+    synchronously. Here it is awaited, so it can use the async ORM and
+    cache APIs.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def inner(request, *args, **kwargs):
+            etag = await etag_func(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag is not None else None
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await func(request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD") and etag:
+                response.headers.setdefault("ETag", etag)
+            return response
+
+        return inner
+
+    return decorator
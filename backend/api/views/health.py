@@ -1,4 +1,4 @@
-from django.http import JsonResponse
+from api.http.fast_json import JsonResponse
 
 
 def health_check(request):
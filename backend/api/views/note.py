@@ -1,32 +1,92 @@
-from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
+from django.http import Http404, StreamingHttpResponse
+from django.views.decorators.http import (
+    condition,
+    require_GET,
+    require_http_methods,
+)
 
-from api.serializers.note_serializer import serialize_note
+from api.cache.cache_stats import record_cache_lookup
+from api.cache.note_cache import (
+    NOTE_CACHE_MAX_NOTES,
+    NOTE_CACHE_TTL_SECONDS,
+    cache_notes_payload_locally,
+    get_notes_payload_cache_key,
+)
+from api.cache.payload_cache import aset_payload, set_payload
+from api.http.fast_json import (
+    JsonResponse,
+    aiter_json_array,
+    aiter_ndjson,
+    iter_json_array,
+    iter_ndjson,
+)
+from api.serializers.note_serializer import (
+    serialize_note,
+    serialize_note_search_result,
+    serialize_notes_list,
+)
+from api.services.note_delta import InvalidContentDeltaError
+from api.services.note_pagination import InvalidCursorError
+from api.services.note_search_service import search_notes_for_user
 from api.services.note_service import (
     CategoryNotFoundError,
+    NoteVersionConflictError,
+    acreate_note_for_user,
+    aget_note_for_user,
+    aiter_notes_for_user,
+    alist_notes_for_user,
+    alist_notes_page_for_user,
+    apatch_note_for_user,
+    bulk_write_notes_for_user,
     create_note_for_user,
     get_note_for_user,
+    iter_notes_for_user,
     list_notes_for_user,
+    list_notes_page_for_user,
     patch_note_for_user,
 )
+from api.services.note_sync_service import (
+    InvalidSyncTokenError,
+    list_note_changes_for_user,
+)
 from api.validators.note_payload import (
+    InvalidJSONError,
     parse_request_data,
+    validate_note_bulk_payload,
+    validate_note_content_delta,
     validate_note_create_payload,
+    validate_note_patch_payload,
+    validate_note_version_precondition,
+)
+from api.validators.note_query import (
+    validate_note_export_query,
+    validate_note_list_query,
+    validate_note_search_query,
+)
+from api.views.conditional import (
+    acached_notes,
+    anote_detail_etag,
+    anotes_collection_etag,
+    async_condition,
+    cached_notes,
+    note_detail_etag,
+    notes_collection_etag,
 )
 
 
 @require_http_methods(["GET", "POST"])
+@condition(etag_func=notes_collection_etag)
 def notes_collection(request):
     if not request.user.is_authenticated:
         return JsonResponse({"detail": "Authentication required"}, status=401)
 
     if request.method == "GET":
-        notes = list_notes_for_user(request.user)
-        return JsonResponse(
-            {"notes": [serialize_note(note) for note in notes]}
-        )
+        return _list_notes(request)
 
-    data = parse_request_data(request)
+    try:
+        data = parse_request_data(request)
+    except InvalidJSONError:
+        return _invalid_json_response()
     payload, errors = validate_note_create_payload(data)
     if errors:
         return JsonResponse(
@@ -47,27 +107,392 @@ def notes_collection(request):
     return JsonResponse(serialize_note(note), status=201)
 
 
+def _list_notes(request):
+    query, errors = validate_note_list_query(request.GET)
+    if errors:
+        return JsonResponse(
+            {"detail": "Invalid query", "errors": errors},
+            status=400,
+        )
+
+    versions, cached_payload = cached_notes(request, query)
+    record_cache_lookup("notes", hit=cached_payload is not None)
+    if cached_payload is not None:
+        return JsonResponse(cached_payload)
+
+    if query["limit"] is None:
+        notes = list_notes_for_user(request.user, summary=query["summary"])
+        next_cursor = None
+    else:
+        try:
+            notes, next_cursor = list_notes_page_for_user(
+                request.user,
+                limit=query["limit"],
+                cursor=query["cursor"],
+                summary=query["summary"],
+            )
+        except InvalidCursorError:
+            return JsonResponse({"detail": "Invalid cursor"}, status=400)
+
+    payload = serialize_notes_list(notes, next_cursor, query["summary"])
+    if len(notes) <= NOTE_CACHE_MAX_NOTES:
+        set_payload(
+            get_notes_payload_cache_key(user_id=request.user.id, **query),
+            versions,
+            payload,
+            NOTE_CACHE_TTL_SECONDS,
+            local=cache_notes_payload_locally(query["limit"]),
+        )
+    return JsonResponse(payload)
+
+
+@require_http_methods(["GET", "POST"])
+@async_condition(etag_func=anotes_collection_etag)
+async def anotes_collection(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required"}, status=401)
+
+    if request.method == "GET":
+        return await _alist_notes(request, user)
+
+    try:
+        data = parse_request_data(request)
+    except InvalidJSONError:
+        return _invalid_json_response()
+    payload, errors = validate_note_create_payload(data)
+    if errors:
+        return JsonResponse(
+            {"detail": "Invalid payload", "errors": errors},
+            status=400,
+        )
+
+    try:
+        note = await acreate_note_for_user(
+            user,
+            title=payload["title"],
+            content=payload["content"],
+            category_id=payload["category_id"],
+        )
+    except CategoryNotFoundError:
+        return JsonResponse({"detail": "Category not found"}, status=400)
+
+    return JsonResponse(serialize_note(note), status=201)
+
+
+async def _alist_notes(request, user):
+    query, errors = validate_note_list_query(request.GET)
+    if errors:
+        return JsonResponse(
+            {"detail": "Invalid query", "errors": errors},
+            status=400,
+        )
+
+    versions, cached_payload = await acached_notes(request, user, query)
+    record_cache_lookup("notes", hit=cached_payload is not None)
+    if cached_payload is not None:
+        return JsonResponse(cached_payload)
+
+    if query["limit"] is None:
+        notes = await alist_notes_for_user(user, summary=query["summary"])
+        next_cursor = None
+    else:
+        try:
+            notes, next_cursor = await alist_notes_page_for_user(
+                user,
+                limit=query["limit"],
+                cursor=query["cursor"],
+                summary=query["summary"],
+            )
+        except InvalidCursorError:
+            return JsonResponse({"detail": "Invalid cursor"}, status=400)
+
+    payload = serialize_notes_list(notes, next_cursor, query["summary"])
+    if len(notes) <= NOTE_CACHE_MAX_NOTES:
+        await aset_payload(
+            get_notes_payload_cache_key(user_id=user.id, **query),
+            versions,
+            payload,
+            NOTE_CACHE_TTL_SECONDS,
+            local=cache_notes_payload_locally(query["limit"]),
+        )
+    return JsonResponse(payload)
+
+
+@require_http_methods(["POST"])
+def notes_bulk(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required"}, status=401)
+
+    try:
+        data = parse_request_data(request)
+    except InvalidJSONError:
+        return _invalid_json_response()
+    payload, errors = validate_note_bulk_payload(data)
+    if errors:
+        return JsonResponse(
+            {"detail": "Invalid payload", "errors": errors},
+            status=400,
+        )
+
+    created, updated, item_errors = bulk_write_notes_for_user(
+        request.user,
+        creates=payload["create"],
+        updates=payload["update"],
+    )
+    item_errors = sorted(
+        [*payload["item_errors"], *item_errors],
+        key=lambda error: (error["operation"], error["index"]),
+    )
+    return JsonResponse(
+        {
+            "created": [serialize_note(note) for note in created],
+            "updated": [serialize_note(note) for note in updated],
+            "errors": item_errors,
+        }
+    )
+
+
+@require_GET
+def notes_search(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required"}, status=401)
+
+    query, errors = validate_note_search_query(request.GET)
+    if errors:
+        return JsonResponse(
+            {"detail": "Invalid query", "errors": errors},
+            status=400,
+        )
+
+    results = search_notes_for_user(
+        request.user, query["q"], limit=query["limit"]
+    )
+    return JsonResponse(
+        {
+            "notes": [
+                serialize_note_search_result(note, snippet)
+                for note, snippet in results
+            ]
+        }
+    )
+
+
+@require_GET
+def notes_export(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required"}, status=401)
+
+    query, errors = validate_note_export_query(request.GET)
+    if errors:
+        return JsonResponse(
+            {"detail": "Invalid query", "errors": errors},
+            status=400,
+        )
+
+    notes = (
+        serialize_note(note) for note in iter_notes_for_user(request.user)
+    )
+    if query["format"] == "json":
+        content, content_type = iter_json_array(notes), "application/json"
+    else:
+        content, content_type = iter_ndjson(notes), "application/x-ndjson"
+
+    return _export_response(content, content_type, query["format"])
+
+
+@require_GET
+async def anotes_export(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required"}, status=401)
+
+    query, errors = validate_note_export_query(request.GET)
+    if errors:
+        return JsonResponse(
+            {"detail": "Invalid query", "errors": errors},
+            status=400,
+        )
+
+    notes = _aserialize_notes(aiter_notes_for_user(user))
+    if query["format"] == "json":
+        content, content_type = aiter_json_array(notes), "application/json"
+    else:
+        content, content_type = aiter_ndjson(notes), "application/x-ndjson"
+    return _export_response(content, content_type, query["format"])
+
+
+async def _aserialize_notes(notes):
+    async for note in notes:
+        yield serialize_note(note)
+
+
+def _export_response(content, content_type, export_format):
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response["Content-Disposition"] = (
+        f'attachment; filename="notes.{export_format}"'
+    )
+    return response
+
+
+@require_GET
+def notes_changes(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required"}, status=401)
+
+    try:
+        notes, deleted_ids, next_since, full_resync = (
+            list_note_changes_for_user(
+                request.user, since=request.GET.get("since") or None
+            )
+        )
+    except InvalidSyncTokenError:
+        return JsonResponse({"detail": "Invalid sync token"}, status=400)
+
+    return JsonResponse(
+        {
+            "notes": [serialize_note(note) for note in notes],
+            "deleted_ids": deleted_ids,
+            "next_since": next_since,
+            "full_resync": full_resync,
+        }
+    )
+
+
 @require_http_methods(["GET", "PATCH"])
 def note_detail(request, note_id):
     if not request.user.is_authenticated:
         return JsonResponse({"detail": "Authentication required"}, status=401)
 
+    if request.method == "GET":
+        return _get_note(request, note_id)
+    return _patch_note(request, note_id)
+
+
+@condition(etag_func=note_detail_etag)
+def _get_note(request, note_id):
     note = get_note_for_user(request.user, note_id)
+    return JsonResponse(serialize_note(note))
 
-    if request.method == "GET":
-        return JsonResponse(serialize_note(note))
 
-    data = parse_request_data(request)
+def _patch_note(request, note_id):
+    note = get_note_for_user(request.user, note_id)
+    try:
+        fields, precondition, errors = _validate_note_patch(request)
+    except InvalidJSONError:
+        return _invalid_json_response()
+    if errors:
+        return JsonResponse(
+            {"detail": "Invalid payload", "errors": errors},
+            status=400,
+        )
 
     try:
         note = patch_note_for_user(
             note,
             request.user,
-            title=data.get("title"),
-            content=data.get("content"),
-            category_id=data.get("category_id"),
+            **fields,
+            **precondition,
         )
-    except CategoryNotFoundError:
-        return JsonResponse({"detail": "Category not found"}, status=400)
+    except (
+        CategoryNotFoundError,
+        InvalidContentDeltaError,
+        NoteVersionConflictError,
+    ) as error:
+        return _note_patch_error_response(error)
+
+    return JsonResponse(serialize_note(note))
+
+
+@require_http_methods(["GET", "PATCH"])
+async def anote_detail(request, note_id):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Authentication required"}, status=401)
+
+    if request.method == "GET":
+        return await _aget_note(request, note_id)
+    return await _apatch_note(request, note_id)
+
+
+@async_condition(etag_func=anote_detail_etag)
+async def _aget_note(request, note_id):
+    note = await aget_note_for_user(await request.auser(), note_id)
+    return JsonResponse(serialize_note(note))
+
+
+async def _apatch_note(request, note_id):
+    user = await request.auser()
+    note = await aget_note_for_user(user, note_id)
+    try:
+        fields, precondition, errors = _validate_note_patch(request)
+    except InvalidJSONError:
+        return _invalid_json_response()
+    if errors:
+        return JsonResponse(
+            {"detail": "Invalid payload", "errors": errors},
+            status=400,
+        )
+
+    try:
+        note = await apatch_note_for_user(
+            note,
+            user,
+            **fields,
+            **precondition,
+        )
+    except (
+        CategoryNotFoundError,
+        InvalidContentDeltaError,
+        NoteVersionConflictError,
+    ) as error:
+        return _note_patch_error_response(error)
 
     return JsonResponse(serialize_note(note))
+
+
+def _validate_note_patch(request):
+    data = parse_request_data(request)
+    fields, errors = validate_note_patch_payload(data)
+    if errors:
+        return fields, {}, errors
+    expected_version, errors = validate_note_version_precondition(
+        data, request.headers.get("If-Match")
+    )
+    delta, delta_errors = validate_note_content_delta(data)
+    errors.update(delta_errors)
+    if (
+        not errors
+        and delta["content_delta"] is not None
+        and expected_version is None
+        and delta["base_content_sha256"] is None
+    ):
+        errors["content_delta"] = [
+            "Requires expected_version, If-Match or base_content_sha256."
+        ]
+    if errors:
+        return fields, {}, errors
+    return fields, {"expected_version": expected_version, **delta}, {}
+
+
+def _invalid_json_response():
+    return JsonResponse({"detail": "Invalid JSON"}, status=400)
+
+
+def _note_patch_error_response(error):
+    if isinstance(error, CategoryNotFoundError):
+        return JsonResponse({"detail": "Category not found"}, status=400)
+    if isinstance(error, InvalidContentDeltaError):
+        return JsonResponse(
+            {"detail": "Content delta does not match the note content"},
+            status=400,
+        )
+    if error.current_version is None:
+        raise Http404 from None
+    return JsonResponse(
+        {
+            "detail": "Note was modified by another request",
+            "version": error.current_version,
+        },
+        status=409,
+    )
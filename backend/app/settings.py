@@ -11,14 +11,71 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
 
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 
 def csv_to_list(value):
     return [item.strip() for item in value.split(",") if item.strip()]
 
 
+def database_from_url(url):
+    """
+    Returns the DATABASES entry described by a postgres:// (or
+    postgresql://) or sqlite:/// URL. Query parameters of a PostgreSQL
+    URL become connection OPTIONS, e.g. ?sslmode=require.
+    """
+    parts = urlsplit(url)
+    if parts.scheme == "sqlite":
+        return {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": unquote(parts.path[1:]) or BASE_DIR / "db.sqlite3",
+            "OPTIONS": {},
+        }
+    if parts.scheme in ("postgres", "postgresql"):
+        return {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": unquote(parts.path[1:]),
+            "USER": unquote(parts.username or ""),
+            "PASSWORD": unquote(parts.password or ""),
+            "HOST": unquote(parts.hostname or ""),
+            "PORT": str(parts.port or ""),
+            "OPTIONS": dict(parse_qsl(parts.query)),
+        }
+    raise ImproperlyConfigured(
+        f"Unsupported DATABASE_URL scheme: {parts.scheme!r}"
+    )
+
+
+def cache_from_url(url):
+    """
+    Returns the CACHES entry described by a redis:// (or rediss://),
+    memcached:// or locmem:// URL. Several memcached servers are
+    separated by commas: memcached://cache-1:11211,cache-2:11211.
+    """
+    parts = urlsplit(url)
+    if parts.scheme in ("redis", "rediss"):
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": url,
+        }
+    if parts.scheme == "memcached":
+        return {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": parts.netloc.split(","),
+        }
+    if parts.scheme == "locmem":
+        return {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": parts.netloc,
+        }
+    raise ImproperlyConfigured(
+        f"Unsupported CACHE_URL scheme: {parts.scheme!r}"
+    )
+
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -70,6 +127,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "api.middleware.PrimaryPinningMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -94,16 +152,124 @@ TEMPLATES = [
 WSGI_APPLICATION = "app.wsgi.application"
 
 
+# Serving (python manage.py serve)
+
+APP_SERVER = config("APP_SERVER", default="gunicorn")
+SERVER_PORT = config("PORT", default=8000, cast=int)
+# 0 derives the worker count from the number of CPUs.
+WEB_CONCURRENCY = config("WEB_CONCURRENCY", default=0, cast=int)
+# Async notes/categories views pay off under ASGI only.
+API_ASYNC_VIEWS = config(
+    "API_ASYNC_VIEWS", default=APP_SERVER == "uvicorn", cast=bool
+)
+
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Applied to every new SQLite connection. WAL lets readers run while a
+# write commits, and synchronous=NORMAL fsyncs only at checkpoints in WAL
+# mode. busy_timeout waits for the write lock instead of failing.
+SQLITE_PRAGMAS = {
+    "journal_mode": config("SQLITE_JOURNAL_MODE", default="WAL"),
+    "synchronous": config("SQLITE_SYNCHRONOUS", default="NORMAL"),
+    "busy_timeout": config("SQLITE_BUSY_TIMEOUT_MS", default=5000, cast=int),
+    "mmap_size": config("SQLITE_MMAP_SIZE", default=2**27, cast=int),
+    # Negative values are KiB rather than pages.
+    "cache_size": config("SQLITE_CACHE_SIZE", default=-20000, cast=int),
+    "temp_store": config("SQLITE_TEMP_STORE", default="MEMORY"),
+}
+
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_from_url(config("DATABASE_URL", default="sqlite:///"))
 }
 
+# Replicas of the default database serving the note and category reads
+# of api.db_router. Their schema comes from replication, not migrate.
+DATABASE_REPLICAS = []
+for index, url in enumerate(
+    config("DATABASE_REPLICA_URLS", default="", cast=csv_to_list)
+):
+    DATABASE_REPLICAS.append(f"replica_{index}")
+    DATABASES[f"replica_{index}"] = {
+        **database_from_url(url),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["api.db_router.PrimaryReplicaRouter"]
+# How long a user's reads stay on the primary after they write. Keep it
+# above the usual replication lag.
+DATABASE_REPLICA_PIN_SECONDS = config(
+    "DATABASE_REPLICA_PIN_SECONDS", default=5, cast=int
+)
+
+# A psycopg connection pool per process, shared by its threads. Django
+# requires persistent connections to be off when pooling.
+DATABASE_POOL_MAX_SIZE = config("DATABASE_POOL_MAX_SIZE", default=0, cast=int)
+
+for database in DATABASES.values():
+    if database["ENGINE"] == "django.db.backends.sqlite3":
+        database["OPTIONS"].update(
+            {
+                "init_command": ";".join(
+                    f"PRAGMA {name}={value}"
+                    for name, value in SQLITE_PRAGMAS.items()
+                ),
+                # Take the write lock when a transaction starts: a deferred
+                # transaction that upgrades to a writer fails with "database
+                # is locked" without waiting for busy_timeout.
+                "transaction_mode": config(
+                    "SQLITE_TRANSACTION_MODE", default="IMMEDIATE"
+                ),
+            }
+        )
+
+    # Keep connections open across requests instead of reconnecting every
+    # time, and check them before reuse so a restarted server is noticed.
+    database["CONN_MAX_AGE"] = config("CONN_MAX_AGE", default=60, cast=int)
+    database["CONN_HEALTH_CHECKS"] = True
+
+    if DATABASE_POOL_MAX_SIZE:
+        if database["ENGINE"] != "django.db.backends.postgresql":
+            raise ImproperlyConfigured(
+                "DATABASE_POOL_MAX_SIZE requires PostgreSQL databases."
+            )
+        database["CONN_MAX_AGE"] = 0
+        database["OPTIONS"]["pool"] = {
+            "min_size": config("DATABASE_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": DATABASE_POOL_MAX_SIZE,
+            "timeout": config("DATABASE_POOL_TIMEOUT", default=10, cast=int),
+        }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Workers share cache version counters, so production needs Redis or
+# Memcached. locmem:// is private to each process and only suits local
+# development and tests.
+CACHES = {"default": cache_from_url(config("CACHE_URL", default="locmem://"))}
+
+# In-process tier in front of CACHES for versioned payloads (see
+# api.cache.payload_cache). 0 entries disables it.
+API_LOCAL_CACHE_MAX_ENTRIES = config(
+    "API_LOCAL_CACHE_MAX_ENTRIES", default=512, cast=int
+)
+API_LOCAL_CACHE_TTL_SECONDS = config(
+    "API_LOCAL_CACHE_TTL_SECONDS", default=60, cast=int
+)
+# How long other requests keep serving a stale payload while one request
+# rebuilds it, before another request may take over the rebuild.
+API_CACHE_REBUILD_LOCK_SECONDS = config(
+    "API_CACHE_REBUILD_LOCK_SECONDS", default=10, cast=int
+)
+
+
+# How long deletions are kept for /api/notes/changes/. Clients whose last
+# sync is older get a full resync instead.
+NOTE_TOMBSTONE_RETENTION_DAYS = config(
+    "NOTE_TOMBSTONE_RETENTION_DAYS", default=30, cast=int
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
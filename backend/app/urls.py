@@ -16,9 +16,13 @@ Including another URLconf
 """
 
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("api.urls")),
 ]
+
+# Serves the admin assets under gunicorn/uvicorn too; a no-op unless DEBUG.
+urlpatterns += staticfiles_urlpatterns()
@@ -0,0 +1,145 @@
+"""Count cache round trips per GET /api/categories/ and GET /api/notes/.
+
+Requests go through the Django test client against a throwaway test
+database. The cache is a LocMemCache that counts calls the way a remote
+Redis or Memcached would see them (get_many is one round trip) and can
+sleep to simulate the network latency of each one.
+
+Usage:
+    uv run python -m benchmarks.bench_cache_round_trips --latency-ms 0.5
+"""
+
+import argparse
+import os
+import statistics
+import time
+from functools import wraps
+
+from django.core.cache.backends.locmem import LocMemCache
+
+PATHS = ("/api/categories/", "/api/notes/")
+
+
+def _round_trip(method):
+    @wraps(method)
+    def counted(self, *args, **kwargs):
+        # LocMemCache implements get_many with get; count the outer call.
+        if self.in_round_trip:
+            return method(self, *args, **kwargs)
+        self.in_round_trip = True
+        try:
+            RoundTripCountingCache.round_trips += 1
+            time.sleep(RoundTripCountingCache.latency)
+            return method(self, *args, **kwargs)
+        finally:
+            self.in_round_trip = False
+
+    return counted
+
+
+class RoundTripCountingCache(LocMemCache):
+    round_trips = 0
+    latency = 0.0
+    in_round_trip = False
+
+    get = _round_trip(LocMemCache.get)
+    get_many = _round_trip(LocMemCache.get_many)
+    set = _round_trip(LocMemCache.set)
+    add = _round_trip(LocMemCache.add)
+    incr = _round_trip(LocMemCache.incr)
+    delete = _round_trip(LocMemCache.delete)
+
+
+def measure(client, path: str, requests: int) -> dict:
+    from django.core.cache import cache
+
+    cache.clear()
+    RoundTripCountingCache.round_trips = 0
+    client.get(path)
+    miss_trips = RoundTripCountingCache.round_trips
+
+    latencies = []
+    RoundTripCountingCache.round_trips = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(path)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.status_code
+    return {
+        "miss trips": miss_trips,
+        "hit trips": RoundTripCountingCache.round_trips / requests,
+        "hit ms": statistics.mean(latencies) * 1000,
+    }
+
+
+def main():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--notes", type=int, default=50)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.5,
+        help="Simulated network latency of each cache round trip.",
+    )
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings, setup_test_environment
+
+    from api.models import Category, Note
+
+    setup_test_environment()
+    database_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    RoundTripCountingCache.latency = args.latency_ms / 1000
+    try:
+        with override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": f"{__name__}.RoundTripCountingCache",
+                    "LOCATION": "round-trips",
+                }
+            }
+        ):
+            user = get_user_model().objects.create_user("bench")
+            category = Category.objects.filter(owner=None).first()
+            Note.objects.bulk_create(
+                Note(
+                    title=f"Note {index}",
+                    content="Lorem ipsum. " * 20,
+                    category=category,
+                    user=user,
+                )
+                for index in range(args.notes)
+            )
+            client = Client()
+            client.force_login(user)
+
+            print(
+                f"{args.latency_ms} ms per round trip, "
+                f"{args.requests} cached requests per path"
+            )
+            print(
+                f"{'path':<18} {'miss trips':>10} {'hit trips':>10} "
+                f"{'hit ms':>8}"
+            )
+            for path in PATHS:
+                result = measure(client, path, args.requests)
+                print(
+                    f"{path:<18} {result['miss trips']:>10} "
+                    f"{result['hit trips']:>10.1f} {result['hit ms']:>8.2f}"
+                )
+    finally:
+        connection.creation.destroy_test_db(database_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
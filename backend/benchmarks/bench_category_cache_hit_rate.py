@@ -0,0 +1,113 @@
+"""Measure the hit rate of the categories cache while users write.
+
+Many users list their categories while some of them create and delete
+private categories, the way a busy deployment does. Requests go through
+the Django test client against a throwaway test database; the hit rate
+is read from the cache stats that GET /api/cache/stats/ reports.
+
+--global-invalidation also bumps the shared version on every private
+category change, which is what happened before versions were split per
+user, to compare both.
+
+Usage:
+    uv run python -m benchmarks.bench_category_cache_hit_rate --users 50
+"""
+
+import argparse
+import os
+import random
+
+
+def main():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument(
+        "--write-ratio",
+        type=float,
+        default=0.05,
+        help="Share of requests that change a private category.",
+    )
+    parser.add_argument("--global-invalidation", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.db.models.signals import post_delete, post_save
+    from django.test import Client
+    from django.test.utils import override_settings, setup_test_environment
+
+    from api.cache.cache_stats import get_cache_hit_rates, reset_cache_stats
+    from api.cache.category_cache import bump_shared_category_cache_version
+    from api.models import Category
+
+    setup_test_environment()
+    database_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    rng = random.Random(args.seed)
+
+    def bump_shared_version(instance, **kwargs):
+        if instance.owner_id is not None:
+            bump_shared_category_cache_version()
+
+    if args.global_invalidation:
+        post_save.connect(bump_shared_version, sender=Category)
+        post_delete.connect(bump_shared_version, sender=Category)
+    try:
+        with override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": (
+                        "django.core.cache.backends.locmem.LocMemCache"
+                    ),
+                    "LOCATION": "category-hit-rate",
+                }
+            }
+        ):
+            clients = []
+            for index in range(args.users):
+                user = get_user_model().objects.create_user(f"bench{index}")
+                client = Client()
+                client.force_login(user)
+                clients.append((user, client))
+
+            reset_cache_stats()
+            writes = 0
+            for index in range(args.requests):
+                user, client = rng.choice(clients)
+                if rng.random() < args.write_ratio:
+                    category = Category.objects.create(
+                        name=f"Private {index}",
+                        color="#112233",
+                        owner=user,
+                        is_default=False,
+                    )
+                    if rng.random() < 0.5:
+                        category.delete()
+                    writes += 1
+                    continue
+                response = client.get("/api/categories/")
+                assert response.status_code == 200, response.status_code
+
+            stats = get_cache_hit_rates()["categories"]
+            mode = "global" if args.global_invalidation else "per-user"
+            print(
+                f"{mode} invalidation: {args.users} users, "
+                f"{writes} private category writes"
+            )
+            print(
+                f"hits {stats['hits']}, misses {stats['misses']}, "
+                f"hit rate {stats['hit_rate']:.1%}"
+            )
+    finally:
+        connection.creation.destroy_test_db(database_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare stdlib and orjson serialization of a notes list payload.
+
+Usage:
+    uv run --extra fast-json python -m benchmarks.bench_json_serialization
+"""
+
+import argparse
+import json
+import timeit
+from datetime import UTC, datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api.http import fast_json
+
+
+def build_payload(count: int) -> dict:
+    now = datetime.now(UTC).isoformat()
+    return {
+        "notes": [
+            {
+                "id": index,
+                "title": f"Note {index}",
+                "content": "Lorem ipsum dolor sit amet. " * 20,
+                "created_at": now,
+                "edited_at": now,
+                "version": 1,
+                "category": {
+                    "id": index % 3 + 1,
+                    "name": "Random Thoughts",
+                    "color": "#EF9C66",
+                },
+                "user_id": 1,
+            }
+            for index in range(count)
+        ],
+        "next_cursor": None,
+    }
+
+
+def stdlib_dumps(payload: dict) -> bytes:
+    # What django.http.JsonResponse does.
+    return json.dumps(payload, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = build_payload(args.notes)
+    body = json.dumps(payload).encode("utf-8")
+    backend = fast_json.JSON_BACKEND
+    cases = {
+        "stdlib dumps": lambda: stdlib_dumps(payload),
+        f"fast_json dumps ({backend})": lambda: fast_json.dumps(payload),
+        "stdlib loads": lambda: json.loads(body.decode("utf-8")),
+        f"fast_json loads ({backend})": lambda: fast_json.loads(body),
+    }
+
+    print(f"{args.notes} notes, {len(body) / 1024:.0f} KiB body")
+    timings = {}
+    for name, case in cases.items():
+        timings[name] = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:<28} {timings[name] * 1000:8.2f} ms")
+
+    names = list(timings)
+    print(f"dumps speedup: {timings[names[0]] / timings[names[1]]:.1f}x")
+    print(f"loads speedup: {timings[names[2]] / timings[names[3]]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
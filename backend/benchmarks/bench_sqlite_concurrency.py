@@ -0,0 +1,164 @@
+"""Show that autosave writers no longer stall note readers on SQLite.
+
+Reader and writer threads run against a temporary database file twice:
+once with sqlite3's defaults (rollback journal, synchronous=FULL,
+deferred transactions) and once with settings.SQLITE_PRAGMAS and the
+configured transaction mode. Readers list a user's notes; writers
+read a note and save it back, like an autosave PATCH.
+
+Usage:
+    uv run python -m benchmarks.bench_sqlite_concurrency
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+USERS = 50
+NOTES_PER_USER = 200
+
+
+def create_database(path: Path) -> None:
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        """
+        CREATE TABLE note (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            edited_at REAL NOT NULL,
+            version INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE INDEX note_user_edited_idx ON note (user_id, edited_at DESC);
+        """
+    )
+    connection.executemany(
+        "INSERT INTO note (user_id, title, content, edited_at)"
+        " VALUES (?, ?, ?, ?)",
+        [
+            (user_id, f"Note {index}", "Lorem ipsum. " * 200, time.time())
+            for user_id in range(USERS)
+            for index in range(NOTES_PER_USER)
+        ],
+    )
+    connection.commit()
+    connection.close()
+
+
+def connect(path: Path, pragmas: dict) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, isolation_level=None)
+    for name, value in pragmas.items():
+        connection.execute(f"PRAGMA {name}={value}")
+    return connection
+
+
+def run(path: Path, pragmas: dict, transaction_mode: str, args) -> dict:
+    deadline = time.monotonic() + args.duration
+    read_latencies, writes, errors = [], [0], [0]
+    lock = threading.Lock()
+
+    def reader():
+        connection = connect(path, pragmas)
+        latencies = []
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.execute(
+                    "SELECT id, title, substr(content, 1, 200) FROM note"
+                    " WHERE user_id = ? ORDER BY edited_at DESC LIMIT 50",
+                    (random.randrange(USERS),),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                with lock:
+                    errors[0] += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+        with lock:
+            read_latencies.extend(latencies)
+
+    def writer():
+        connection = connect(path, pragmas)
+        while time.monotonic() < deadline:
+            note_id = random.randrange(1, USERS * NOTES_PER_USER + 1)
+            try:
+                connection.execute(f"BEGIN {transaction_mode}")
+                (version,) = connection.execute(
+                    "SELECT version FROM note WHERE id = ?", (note_id,)
+                ).fetchone()
+                connection.execute(
+                    "UPDATE note SET content = ?, edited_at = ?, version = ?"
+                    " WHERE id = ?",
+                    ("Autosaved. " * 200, time.time(), version + 1, note_id),
+                )
+                connection.execute("COMMIT")
+            except sqlite3.OperationalError:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                with lock:
+                    errors[0] += 1
+                continue
+            with lock:
+                writes[0] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    read_latencies.sort()
+    return {
+        "reads/s": len(read_latencies) / args.duration,
+        "writes/s": writes[0] / args.duration,
+        "read p50 ms": statistics.median(read_latencies) * 1000,
+        "read p99 ms": read_latencies[int(len(read_latencies) * 0.99)] * 1000,
+        "locked errors": errors[0],
+    }
+
+
+def main():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    configs = {
+        "defaults": ({}, "DEFERRED"),
+        "tuned": (
+            settings.SQLITE_PRAGMAS,
+            settings.DATABASES["default"]["OPTIONS"]["transaction_mode"],
+        ),
+    }
+    print(
+        f"{args.readers} readers, {args.writers} writers, "
+        f"{args.duration:.0f}s per configuration"
+    )
+    results = {}
+    for name, (pragmas, transaction_mode) in configs.items():
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "bench.sqlite3"
+            create_database(path)
+            results[name] = run(path, pragmas, transaction_mode, args)
+
+    print(f"{'':<14}" + "".join(f"{name:>12}" for name in results))
+    for metric in results["defaults"]:
+        print(
+            f"{metric:<14}"
+            + "".join(f"{result[metric]:12.1f}" for result in results.values())
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Compare GET /api/notes/ throughput under runserver, gunicorn and uvicorn.
+
+Each server is started with `manage.py serve` on a local port. A load
+test user with some notes is created through the API. Then keep-alive
+clients hammer the notes list for a fixed duration.
+
+Usage:
+    uv run --extra server python -m benchmarks.load_test_notes \\
+        --servers runserver gunicorn uvicorn --concurrency 32 --duration 10
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from http.cookiejar import CookieJar
+from pathlib import Path
+from urllib import request as urllib_request
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+NOTES_PATH = "/api/notes/"
+
+
+def start_server(server: str, port: int, workers: int) -> subprocess.Popen:
+    command = [
+        sys.executable,
+        "manage.py",
+        "serve",
+        f"--server={server}",
+        "--host=127.0.0.1",
+        f"--port={port}",
+    ]
+    if workers:
+        command.append(f"--workers={workers}")
+    process = subprocess.Popen(
+        command,
+        cwd=BASE_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # runserver's autoreloader forks a child; signal the whole group.
+        start_new_session=True,
+        env={**os.environ, "DEBUG": "False", "ALLOWED_HOSTS": "127.0.0.1"},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            connection.request("GET", "/api/health/")
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f"{server} did not start on port {port}")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    os.killpg(process.pid, signal.SIGTERM)
+    process.wait()
+
+
+def login(port: int, username: str, password: str, notes: int) -> str:
+    """Signs the user up (or in) and returns the Cookie header to send."""
+    base_url = f"http://127.0.0.1:{port}/api"
+    cookies = CookieJar()
+    opener = urllib_request.build_opener(
+        urllib_request.HTTPCookieProcessor(cookies)
+    )
+
+    def post(path, body, content_type):
+        csrf_token = next(
+            cookie.value for cookie in cookies if cookie.name == "csrftoken"
+        )
+        return opener.open(
+            urllib_request.Request(
+                f"{base_url}{path}",
+                data=body,
+                headers={
+                    "Content-Type": content_type,
+                    "X-CSRFToken": csrf_token,
+                },
+            )
+        )
+
+    opener.open(f"{base_url}/auth/csrf/")
+    form = (
+        f"username={username}&password={password}"
+        f"&password1={password}&password2={password}"
+    ).encode()
+    form_type = "application/x-www-form-urlencoded"
+    if notes:
+        post("/auth/signup/", form, form_type)
+        categories = json.load(opener.open(f"{base_url}/categories/"))
+        category_id = categories["categories"][0]["id"]
+        for start in range(0, notes, 500):
+            items = [
+                {
+                    "title": f"Note {index}",
+                    "content": "Lorem ipsum dolor sit amet. " * 20,
+                    "category_id": category_id,
+                }
+                for index in range(start, min(start + 500, notes))
+            ]
+            post(
+                "/notes/bulk/",
+                json.dumps({"create": items}).encode(),
+                "application/json",
+            )
+    else:
+        post("/auth/login/", form, form_type)
+    return "; ".join(f"{cookie.name}={cookie.value}" for cookie in cookies)
+
+
+def run_load(
+    port: int, cookie: str, concurrency: int, duration: float
+) -> dict:
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        nonlocal errors
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        local_latencies, local_errors = [], 0
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.request(
+                    "GET", NOTES_PATH, headers={"Cookie": cookie}
+                )
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port)
+                continue
+            local_latencies.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local_latencies)
+            errors += local_errors
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99)] if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--servers",
+        nargs="+",
+        default=["runserver", "gunicorn", "uvicorn"],
+    )
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--notes", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    username = f"loadtest-{uuid.uuid4().hex[:8]}"
+    password = uuid.uuid4().hex
+    notes = args.notes
+    print(
+        f"GET {NOTES_PATH} with {notes} notes, {args.concurrency} clients, "
+        f"{args.duration:.0f}s per server"
+    )
+    print(f"{'server':<10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} errors")
+    for offset, server in enumerate(args.servers):
+        port = args.port + offset
+        process = start_server(server, port, args.workers)
+        try:
+            cookie = login(port, username, password, notes)
+            notes = 0
+            result = run_load(port, cookie, args.concurrency, args.duration)
+        finally:
+            stop_server(process)
+        print(
+            f"{server:<10} {result['rps']:9.0f} {result['p50'] * 1000:8.1f} "
+            f"{result['p99'] * 1000:8.1f} {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()